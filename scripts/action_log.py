@@ -0,0 +1,176 @@
+"""
+Streaming reader for test automation action logs.
+
+Action logs are written by ActionLogger (test-automation) as a JSON array of
+ActionLogEntry objects. Long soak runs can also write newline-delimited JSON
+(one ActionLogEntry per line). Both formats are read lazily here so memory stays
+bounded regardless of how many actions a run produced:
+
+- NDJSON is read line by line
+- JSON arrays are parsed incrementally, one entry at a time, from fixed-size chunks
+
+A log may also carry a metadata record (an object without 'timestampMs') giving
+the device resolution the coordinates refer to, e.g.
+{"deviceWidth": 1344, "deviceHeight": 2992}. Metadata records are not actions.
+
+Entries are yielded in timestamp order. ActionLogger appends in order already;
+small inversions (e.g. from concurrent writers) are repaired with a bounded
+reorder buffer.
+"""
+
+import heapq
+import json
+import re
+
+READ_CHUNK_SIZE = 64 * 1024
+REORDER_WINDOW = 256
+METADATA_SCAN_ENTRIES = 16
+
+_WHITESPACE = re.compile(r'[\s,]*')
+
+
+def _detect_format(f):
+    """Return 'array' or 'ndjson' based on the first non-whitespace character."""
+    while True:
+        char = f.read(1)
+        if not char:
+            return 'ndjson'  # Empty file: no entries either way
+        if not char.isspace():
+            f.seek(0)
+            return 'array' if char == '[' else 'ndjson'
+
+
+def _iter_ndjson(f):
+    for line_number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"{e.msg} (line {line_number})", e.doc, e.pos) from None
+
+
+def _iter_json_array(f):
+    """Incrementally decode the elements of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buf = f.read(READ_CHUNK_SIZE).lstrip()
+    if not buf.startswith('['):
+        raise json.JSONDecodeError("Expected '['", buf, 0)
+    pos = 1
+    eof = False
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos >= len(buf):
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buf, pos)
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        if buf[pos] == ']':
+            return
+
+        try:
+            entry, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Entry spans the chunk boundary: keep the unread tail and read more
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield entry
+        pos = end
+
+
+def iter_raw_entries(action_log_path):
+    """Yield raw entries from an action log in file order (JSON array or NDJSON)."""
+    with open(action_log_path, 'r', encoding='utf-8') as f:
+        if _detect_format(f) == 'array':
+            yield from _iter_json_array(f)
+        else:
+            yield from _iter_ndjson(f)
+
+
+def _is_action(entry):
+    return isinstance(entry, dict) and ('timestampMs' in entry or 'deviceWidth' not in entry)
+
+
+def read_device_size(action_log_path):
+    """
+    Device resolution recorded in the log, if any.
+
+    Only the first few entries are read, so this is cheap on any size of log.
+
+    Returns:
+        (width, height) in device pixels, or None if the log does not say
+    """
+    entries = iter_raw_entries(action_log_path)
+    try:
+        for _, entry in zip(range(METADATA_SCAN_ENTRIES), entries):
+            if isinstance(entry, dict) and entry.get('deviceWidth') and entry.get('deviceHeight'):
+                return int(entry['deviceWidth']), int(entry['deviceHeight'])
+    finally:
+        entries.close()
+    return None
+
+
+def iter_actions(action_log_path, reorder_window=REORDER_WINDOW):
+    """
+    Yield action entries in timestamp order.
+
+    Non-object entries and metadata records are ignored. Each yielded dict gets an '_index' key with its
+    1-based position in the log, so callers can refer to "action 37" consistently.
+
+    Args:
+        action_log_path: Path to a JSON array or NDJSON action log
+        reorder_window: Number of entries buffered to repair out-of-order timestamps
+    """
+    heap = []
+    index = 0
+    for entry in iter_raw_entries(action_log_path):
+        if not _is_action(entry):
+            continue
+        index += 1
+        entry['_index'] = index
+        heapq.heappush(heap, (entry.get('timestampMs', 0), index, entry))
+        if len(heap) > reorder_window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def scan_action_log(action_log_path, duration_ms=None):
+    """
+    Validate an action log in a single streaming pass.
+
+    Parsing errors surface here, before any video work starts, rather than
+    part-way through encoding.
+
+    Args:
+        action_log_path: Path to a JSON array or NDJSON action log
+        duration_ms: Optional video duration; actions outside it are counted
+
+    Returns:
+        Dict with 'count', 'failures', 'out_of_range', 'first_ms' and 'last_ms'
+    """
+    summary = {'count': 0, 'failures': 0, 'out_of_range': 0, 'first_ms': None, 'last_ms': None}
+    for entry in iter_raw_entries(action_log_path):
+        if not _is_action(entry):
+            continue
+        timestamp_ms = entry.get('timestampMs', 0)
+        summary['count'] += 1
+        if entry.get('success') is False:
+            summary['failures'] += 1
+        if duration_ms is not None and not 0 <= timestamp_ms <= duration_ms:
+            summary['out_of_range'] += 1
+        if summary['first_ms'] is None or timestamp_ms < summary['first_ms']:
+            summary['first_ms'] = timestamp_ms
+        if summary['last_ms'] is None or timestamp_ms > summary['last_ms']:
+            summary['last_ms'] = timestamp_ms
+    return summary
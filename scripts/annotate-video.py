@@ -3,10 +3,16 @@
 Video annotation pipeline for test automation videos.
 
 This script adds frame-accurate annotations to test videos based on action logs
-generated by the test automation framework.
+generated by the test automation framework. Action logs may be a JSON array
+(ActionLogger.export) or newline-delimited JSON (one ActionLogEntry per line);
+either way the log is streamed, so multi-hour soak runs stay within bounded memory.
+
+Recordings split into several screenrecord chunks can be passed in order; they
+are joined without re-encoding and annotated as one continuous video.
 
 Usage:
-    python scripts/annotate-video.py <video_path> <action_log_path> <output_path>
+    python scripts/annotate-video.py <video_path> [<video_path> ...] <action_log_path> <output_path>
+        [--backend moviepy|pipe] [--device-size WxH] [--failures-only [--window SECONDS]]
 
 Example:
     python scripts/annotate-video.py \
@@ -15,125 +21,170 @@ Example:
         /tmp/test_results/video_annotated.mp4
 """
 
+import argparse
 import json
+import subprocess
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 try:
-    from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
-    from moviepy.video.fx.all import resize
+    from moviepy.editor import VideoFileClip
+    from action_log import iter_actions, read_device_size, scan_action_log
+    from video_overlays import TEXT_DURATION, OverlayScheduler
+    from video_pipe import FramePipeline
+    from video_timeline import TimelineIndex
+    from mp4_moov_repair import RepairError, find_reference_video, has_moov, repair_mp4
 except ImportError as e:
     print(f"❌ Error: Missing required dependency: {e}")
     print("   Install dependencies: pip install -r requirements.txt")
     sys.exit(1)
 
 
-def create_click_marker(x, y, video_w, video_h, duration=0.5):
-    """
-    Create a visual click marker (ripple effect) at the specified coordinates.
+def validate_inputs(video_paths, action_log_path):
+    """Exit with an error if any video chunk or the action log does not exist."""
+    for video_path in video_paths:
+        if not os.path.exists(video_path):
+            print(f"❌ Error: Video file not found: {video_path}")
+            sys.exit(1)
     
-    Args:
-        x: X coordinate (device coordinates)
-        y: Y coordinate (device coordinates)
-        video_w: Video width in pixels
-        video_h: Video height in pixels
-        duration: Duration of marker animation in seconds
-    
-    Returns:
-        CompositeVideoClip with ripple effect
-    """
-    # Scale coordinates (assuming video is device resolution)
-    # Adjust these scale factors based on your device resolution
-    # Default assumes 1080x1920 device, but video might be different
-    scale_x = video_w / 1080 if video_w > 0 else 1.0
-    scale_y = video_h / 1920 if video_h > 0 else 1.0
-    
-    marker_x = int(x * scale_x)
-    marker_y = int(y * scale_y)
-    
-    # Create ripple circles (simplified - MoviePy doesn't have Circle, so we'll use text)
-    # For a proper implementation, we'd need to create image-based markers
-    # For now, we'll create a simple text-based marker
-    from moviepy.editor import ImageClip
-    import numpy as np
-    
-    # Create a simple marker using a small image
-    # This is a simplified version - for better visuals, use pre-rendered marker images
-    marker_text = TextClip(
-        "●",
-        fontsize=40,
-        color='yellow',
-        bg_color='transparent'
-    ).set_position((marker_x - 20, marker_y - 20)).set_duration(duration)
-    
-    return marker_text
-
-
-def create_text_overlay(text, position='bottom', duration=2.0, fontsize=42):
+    if not os.path.exists(action_log_path):
+        print(f"❌ Error: Action log file not found: {action_log_path}")
+        sys.exit(1)
+
+
+def repair_if_needed(video_paths, reference_video=None):
     """
-    Create a text overlay with consistent styling.
+    Rebuild the moov atom of interrupted recordings before annotating them.
     
-    Args:
-        text: Text to display
-        position: Position on screen ('bottom', 'top', 'center')
-        duration: Duration in seconds
-        fontsize: Font size in pixels
+    screenrecord only writes the moov atom when it stops cleanly; without it
+    the video cannot be opened. Broken chunks are repaired without re-encoding
+    (see mp4_moov_repair.py) to <name>_repaired.mp4, using reference_video or a
+    healthy recording found next to them for the codec settings. A repaired
+    copy left by an earlier run is reused if it is newer than the broken chunk.
     
     Returns:
-        TextClip configured with styling
+        The video paths with repaired copies substituted
     """
-    # Calculate position
-    if position == 'bottom':
-        pos = ('center', 'bottom')
-        y_offset = 60
-    elif position == 'top':
-        pos = ('center', 'top')
-        y_offset = 60
-    else:
-        pos = ('center', 'center')
-        y_offset = 0
-    
-    txt_clip = TextClip(
-        text,
-        fontsize=fontsize,
-        color='white',
-        bg_color='black@0.9',
-        size=(None, None),  # Auto-size based on text
-        method='caption',
-        align='center',
-        font='Arial-Bold'  # Use system font, fallback to default if not available
-    )
+    repaired = []
+    for video_path in video_paths:
+        if has_moov(video_path):
+            repaired.append(video_path)
+            continue
+        
+        print(f"⚠️  Warning: {video_path} has no moov atom (recording was interrupted)")
+        output_path = Path(video_path).with_name(f"{Path(video_path).stem}_repaired.mp4")
+        if (output_path.exists() and output_path.stat().st_mtime >= os.path.getmtime(video_path)
+                and has_moov(output_path)):
+            print(f"   Using the earlier repair: {output_path}")
+            repaired.append(str(output_path))
+            continue
+        
+        reference = reference_video or find_reference_video(video_path)
+        if not reference:
+            print("❌ Error: No healthy recording found to repair it from.")
+            print("   Pass one made on the same device with --reference-video")
+            sys.exit(1)
+        
+        print(f"🔧 Rebuilding moov atom using reference: {reference}")
+        try:
+            summary = repair_mp4(video_path, reference, str(output_path))
+        except (RepairError, OSError) as e:
+            print(f"❌ Error repairing video: {e}")
+            print("   Try scripts/repair-video-moov-atom.sh, which re-encodes the video")
+            sys.exit(1)
+        print(f"   Recovered {summary['samples']} frames ({summary['duration']:.2f}s): {output_path}")
+        repaired.append(str(output_path))
+    return repaired
+
+
+def as_chunk_list(video_paths):
+    """Accept a single video path or an ordered list of chunk paths."""
+    if isinstance(video_paths, (str, Path)):
+        return [str(video_paths)]
+    return [str(path) for path in video_paths]
+
+
+def load_timeline(video_paths):
+    """Probe the video chunks and build their global timeline, exiting on failure."""
+    print(f"📹 Probing video: {', '.join(video_paths)}")
+    try:
+        timeline = TimelineIndex(video_paths)
+    except (subprocess.CalledProcessError, StopIteration, KeyError, ValueError) as e:
+        print(f"❌ Error loading video: {e}")
+        sys.exit(1)
     
-    # Position the text
-    if position == 'bottom':
-        txt_clip = txt_clip.set_position(('center', video.h - txt_clip.h - y_offset))
-    elif position == 'top':
-        txt_clip = txt_clip.set_position(('center', y_offset))
-    else:
-        txt_clip = txt_clip.set_position('center')
+    info = timeline.probe()
+    print(f"   Video FPS: {info['fps']}, Duration: {info['duration']:.2f}s, "
+          f"Size: {info['width']}x{info['height']}")
+    if len(video_paths) > 1:
+        for path, start, duration in zip(video_paths, timeline.starts, timeline.durations):
+            print(f"   Chunk {os.path.basename(path)}: {start:.2f}s-{start + duration:.2f}s")
+    return timeline
+
+
+def scan_log(action_log_path, duration):
+    """Validate the action log in one streaming pass and print a summary."""
+    print(f"📋 Scanning action log: {action_log_path}")
+    try:
+        summary = scan_action_log(action_log_path, duration_ms=duration * 1000.0)
+        print(f"   Found {summary['count']} actions ({summary['failures']} failed)")
+    except json.JSONDecodeError as e:
+        print(f"❌ Error parsing action log JSON: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error reading action log: {e}")
+        sys.exit(1)
     
-    return txt_clip.set_duration(duration)
+    if summary['out_of_range']:
+        print(f"⚠️  Warning: {summary['out_of_range']} action(s) have timestamps outside video duration. Skipping.")
+    return summary
 
 
-def annotate_video(video_path, action_log_path, output_path):
+def annotate_video(video_paths, action_log_path, output_path, device_size=None):
     """
     Annotate video with action log.
-    
+
+    The action log is streamed rather than loaded: overlays are drawn onto each
+    frame as it is encoded, and only the actions visible at that frame time are
+    held in memory. Both JSON array and newline-delimited JSON logs are accepted.
+
     Args:
-        video_path: Path to input video file
-        action_log_path: Path to JSON action log file
+        video_paths: Path to input video file, or ordered list of recording chunks
+        action_log_path: Path to JSON or NDJSON action log file
         output_path: Path to output annotated video file
+        device_size: (width, height) that action coordinates refer to. Defaults to
+            the size recorded in the log, then to the video's own resolution.
     """
-    # Validate inputs
-    if not os.path.exists(video_path):
-        print(f"❌ Error: Video file not found: {video_path}")
-        sys.exit(1)
+    video_paths = as_chunk_list(video_paths)
+    validate_inputs(video_paths, action_log_path)
     
-    if not os.path.exists(action_log_path):
-        print(f"❌ Error: Action log file not found: {action_log_path}")
-        sys.exit(1)
+    joined_path = None
+    if len(video_paths) > 1:
+        # MoviePy reads one file; join the chunks losslessly first
+        timeline = load_timeline(video_paths)
+        fd, joined_path = tempfile.mkstemp(
+            prefix='joined-', suffix='.mp4', dir=os.path.dirname(os.path.abspath(output_path))
+        )
+        os.close(fd)
+        try:
+            timeline.concat(joined_path)
+        except subprocess.CalledProcessError as e:
+            os.unlink(joined_path)
+            print(f"❌ Error joining video chunks: {e}")
+            sys.exit(1)
+    video_path = joined_path or video_paths[0]
     
+    try:
+        annotate_clip(video_path, action_log_path, output_path, device_size)
+    finally:
+        if joined_path:
+            os.unlink(joined_path)
+
+
+def annotate_clip(video_path, action_log_path, output_path, device_size=None):
+    """MoviePy rendering of a single video file (see annotate_video())."""
     print(f"📹 Loading video: {video_path}")
     try:
         video = VideoFileClip(video_path)
@@ -143,19 +194,9 @@ def annotate_video(video_path, action_log_path, output_path):
         print(f"❌ Error loading video: {e}")
         sys.exit(1)
     
-    print(f"📋 Loading action log: {action_log_path}")
-    try:
-        with open(action_log_path, 'r') as f:
-            actions = json.load(f)
-        print(f"   Found {len(actions)} actions")
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing action log JSON: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Error reading action log: {e}")
-        sys.exit(1)
+    summary = scan_log(action_log_path, video.duration)
     
-    if not actions:
+    if not summary['count']:
         print("⚠️  Warning: No actions found in log. Creating video without annotations.")
         video.write_videofile(
             output_path,
@@ -166,54 +207,24 @@ def annotate_video(video_path, action_log_path, output_path):
         )
         return
     
-    # Build annotation clips
-    clips = [video]
+    device_size = device_size or read_device_size(action_log_path) or (video.w, video.h)
+    print(f"   Device resolution: {device_size[0]}x{device_size[1]}")
     
-    for i, action in enumerate(actions):
-        timestamp_sec = action.get('timestampMs', 0) / 1000.0
-        
-        # Validate timestamp
-        if timestamp_sec < 0 or timestamp_sec > video.duration:
-            print(f"⚠️  Warning: Action {i+1} timestamp {timestamp_sec:.2f}s is outside video duration. Skipping.")
-            continue
-        
-        description = action.get('description', 'Unknown action')
-        print(f"   Action {i+1}/{len(actions)}: {description} at {timestamp_sec:.2f}s")
-        
-        # Create text overlay
-        txt_clip = create_text_overlay(
-            text=description,
-            position='bottom',
-            duration=2.0,
-            fontsize=42
-        ).set_start(timestamp_sec)
-        
-        clips.append(txt_clip)
-        
-        # Add visual indicator for click/swipe actions
-        if action.get('coordinates'):
-            coords = action['coordinates']
-            if isinstance(coords, list) and len(coords) >= 2:
-                x, y = coords[0], coords[1]
-                try:
-                    marker = create_click_marker(x, y, video.w, video.h)
-                    marker = marker.set_start(timestamp_sec).set_duration(0.5)
-                    clips.append(marker)
-                except Exception as e:
-                    print(f"⚠️  Warning: Could not create click marker: {e}")
-    
-    # Composite all clips
-    print("🎬 Compositing video with annotations...")
-    try:
-        final = CompositeVideoClip(clips)
-    except Exception as e:
-        print(f"❌ Error compositing video: {e}")
-        sys.exit(1)
+    # Overlays are materialized per frame from the streamed, time-ordered log
+    scheduler = OverlayScheduler(
+        lambda: iter_actions(action_log_path),
+        video.w,
+        video.h,
+        video.duration,
+        fps,
+        device_size=device_size
+    )
+    annotated = video.fl(scheduler.moviepy_filter)
     
     # Write output
     print(f"💾 Writing annotated video to: {output_path}")
     try:
-        final.write_videofile(
+        annotated.write_videofile(
             output_path,
             fps=fps,
             codec='libx264',
@@ -221,39 +232,279 @@ def annotate_video(video_path, action_log_path, output_path):
             audio_codec='aac',
             bitrate='4000k'  # Higher bitrate for better quality
         )
+        print(f"   Annotated {scheduler.shown} actions")
         print("✅ Video annotation complete!")
+    except json.JSONDecodeError as e:
+        print(f"❌ Error parsing action log JSON: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error writing video: {e}")
         sys.exit(1)
     finally:
         # Clean up
         video.close()
-        if 'final' in locals():
-            final.close()
+
+
+def annotate_video_pipe(video_paths, action_log_path, output_path, device_size=None):
+    """
+    Annotate video with action log using raw ffmpeg pipes instead of MoviePy.
+    
+    Frames are decoded into a small ring of preallocated buffers, annotated in
+    place and written straight to the encoder, with decode, overlay and encode
+    running concurrently (see video_pipe.FramePipeline). Output matches the
+    moviepy backend.
+    
+    Multiple chunks are decoded straight from the ffmpeg concat demuxer, so no
+    joined intermediate file is written.
+    
+    Args:
+        Same as annotate_video()
+    """
+    video_paths = as_chunk_list(video_paths)
+    validate_inputs(video_paths, action_log_path)
+    timeline = load_timeline(video_paths)
+    info = timeline.probe()
+    
+    summary = scan_log(action_log_path, info['duration'])
+    if not summary['count']:
+        print("⚠️  Warning: No actions found in log. Creating video without annotations.")
+    
+    device_size = device_size or read_device_size(action_log_path) or (info['width'], info['height'])
+    print(f"   Device resolution: {device_size[0]}x{device_size[1]}")
+    
+    scheduler = OverlayScheduler(
+        lambda: iter_actions(action_log_path),
+        info['width'],
+        info['height'],
+        info['duration'],
+        info['fps'],
+        device_size=device_size
+    )
+    pipeline = FramePipeline(info['width'], info['height'], info['fps'])
+    
+    print(f"💾 Writing annotated video to: {output_path}")
+    try:
+        with timeline.input_args() as input_args:
+            frames = pipeline.run(
+                input_args,
+                output_path,
+                scheduler.apply,
+                PIPE_OUTPUT_ARGS,
+                audio_input_args=input_args if info['has_audio'] else None
+            )
+        print(f"   Annotated {scheduler.shown} actions across {frames} frames")
+        print("✅ Video annotation complete!")
+    except Exception as e:
+        print(f"❌ Error writing video: {e}")
+        sys.exit(1)
+
+
+# Same encoding settings as the moviepy backend
+PIPE_OUTPUT_ARGS = [
+    '-c:v', 'libx264', '-preset', 'medium', '-b:v', '4000k',
+    '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+]
+
+# Failure clips: small enough to attach to a PR comment or chat message
+FAILURE_WINDOW = 6.0
+FAILURE_LEAD = 2 / 3  # Fraction of the window before the failure; the lead-up matters most
+FAILURE_MP4_ARGS = [
+    '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '26',
+    '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+]
+FAILURE_WEBP_ARGS = [
+    '-vf', 'fps=15,scale=360:-2', '-c:v', 'libwebp_anim',
+    '-quality', '60', '-loop', '0',
+]
+
+
+def failure_windows(action_log_path, duration, window=FAILURE_WINDOW):
+    """
+    Work out which parts of the video to cut around failed actions.
+    
+    Each failed action gets a window of `window` seconds, clipped to the video,
+    and overlapping windows are merged so no footage is encoded twice.
+    
+    Returns:
+        List of (start, end, failures) tuples in seconds, in time order
+    """
+    lead = window * FAILURE_LEAD
+    windows = []
+    for action in iter_actions(action_log_path):
+        if action.get('success') is not False:
+            continue
+        t = action.get('timestampMs', 0) / 1000.0
+        if t < 0 or t > duration:
+            continue
+        start = max(0.0, t - lead)
+        end = min(duration, start + window)
+        if windows and start <= windows[-1][1]:
+            previous_start, previous_end, failures = windows[-1]
+            windows[-1] = (previous_start, max(previous_end, end), failures + 1)
+        else:
+            windows.append((start, end, 1))
+    return windows
+
+
+def failure_clip_path(output_path, number, start):
+    """Output path for one failure clip, e.g. video_failures_01_83s.mp4."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_{number:02d}_{int(start)}s{output_path.suffix}")
+
+
+def annotate_failures(video_paths, action_log_path, output_path, device_size=None, window=FAILURE_WINDOW):
+    """
+    Annotate only the footage around failed actions.
+    
+    Every window is decoded with an ffmpeg input seek, so the rest of the
+    recording is never decoded, and written as its own clip next to
+    output_path. A .webp output path produces looping animated WebP previews
+    instead of MP4.
+    
+    Args:
+        video_paths: Path to input video file, or ordered list of recording chunks
+        action_log_path: Path to JSON or NDJSON action log file
+        output_path: Base path for the clips (numbered per window)
+        device_size: (width, height) that action coordinates refer to
+        window: Length in seconds of the clip around each failure
+    """
+    video_paths = as_chunk_list(video_paths)
+    validate_inputs(video_paths, action_log_path)
+    timeline = load_timeline(video_paths)
+    info = timeline.probe()
+    
+    summary = scan_log(action_log_path, info['duration'])
+    windows = failure_windows(action_log_path, info['duration'], window)
+    if not windows:
+        print("✅ No failed actions within the video. Nothing to cut.")
+        return
+    
+    webp = Path(output_path).suffix.lower() == '.webp'
+    device_size = device_size or read_device_size(action_log_path) or (info['width'], info['height'])
+    pipeline = FramePipeline(info['width'], info['height'], info['fps'])
+    print(f"✂️  Cutting {len(windows)} window(s) around {summary['failures']} failed action(s)")
+    
+    for number, (start, end, failures) in enumerate(windows, start=1):
+        clip_path = failure_clip_path(output_path, number, start)
+        # Actions from just before the window may still have a caption on screen
+        scheduler = OverlayScheduler(
+            lambda start=start: (
+                a for a in iter_actions(action_log_path)
+                if a.get('timestampMs', 0) / 1000.0 >= start - TEXT_DURATION
+            ),
+            info['width'],
+            info['height'],
+            info['duration'],
+            info['fps'],
+            device_size=device_size
+        )
+        try:
+            with timeline.input_args(['-ss', f'{start:.3f}', '-t', f'{end - start:.3f}']) as seek:
+                pipeline.run(
+                    seek,
+                    clip_path,
+                    scheduler.apply,
+                    FAILURE_WEBP_ARGS if webp else FAILURE_MP4_ARGS,
+                    time_offset=start,
+                    audio_input_args=None if webp or not info['has_audio'] else seek
+                )
+        except Exception as e:
+            print(f"❌ Error writing clip {clip_path}: {e}")
+            sys.exit(1)
+        location = ''
+        if len(video_paths) > 1:
+            chunk, offset = timeline.locate(start)
+            location = f", {os.path.basename(video_paths[chunk])} at {offset:.1f}s"
+        print(f"   {clip_path} ({start:.1f}s-{end:.1f}s{location}, {failures} failure(s))")
+    
+    print("✅ Failure clips complete!")
+
+
+# Rendering backends selectable with --backend (benchmarked by benchmark-annotate-video.py)
+BACKENDS = {
+    'moviepy': annotate_video,
+    'pipe': annotate_video_pipe,
+}
+DEFAULT_BACKEND = 'moviepy'
+
+
+def parse_device_size(value):
+    """Parse a WIDTHxHEIGHT argument such as 1344x2992."""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    return width, height
 
 
 def main():
     """Main entry point."""
-    if len(sys.argv) != 4:
-        print("Usage: python scripts/annotate-video.py <video_path> <action_log_path> <output_path>")
-        print("")
-        print("Example:")
-        print("  python scripts/annotate-video.py \\")
-        print("    /tmp/test_results/video.mp4 \\")
-        print("    /tmp/test_results/action_log.json \\")
-        print("    /tmp/test_results/video_annotated.mp4")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Annotate a test video with its action log',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example:
+  python scripts/annotate-video.py \\
+    /tmp/test_results/video.mp4 \\
+    /tmp/test_results/action_log.json \\
+    /tmp/test_results/video_annotated.mp4
+        """
+    )
+    parser.add_argument(
+        'video_paths',
+        nargs='+',
+        metavar='video_path',
+        help='Input video file, or several screenrecord chunks in recording order'
+    )
+    parser.add_argument('action_log_path', help='Action log (JSON array or NDJSON)')
+    parser.add_argument('output_path', help='Output annotated video file')
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Rendering backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--failures-only',
+        action='store_true',
+        help='Only cut and annotate clips around failed actions (uses ffmpeg pipes, ignores --backend). '
+             'Use a .webp output path for animated WebP previews'
+    )
+    parser.add_argument(
+        '--window',
+        type=float,
+        default=FAILURE_WINDOW,
+        help=f'Clip length in seconds around each failed action (default: {FAILURE_WINDOW:g})'
+    )
+    parser.add_argument(
+        '--reference-video',
+        help='Healthy recording from the same device, used to repair videos whose moov atom is '
+             'missing (default: the newest finalized .mp4 next to the broken one)'
+    )
+    parser.add_argument(
+        '--device-size',
+        type=parse_device_size,
+        help='Device resolution the action coordinates refer to, e.g. 1080x1920 '
+             '(default: from the action log, else the video resolution)'
+    )
+    
+    args = parser.parse_args()
     
-    video_path = sys.argv[1]
-    action_log_path = sys.argv[2]
-    output_path = sys.argv[3]
+    if args.window <= 0:
+        parser.error('--window must be greater than 0')
     
     # Create output directory if it doesn't exist
-    output_dir = os.path.dirname(output_path)
+    output_dir = os.path.dirname(args.output_path)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
     
-    annotate_video(video_path, action_log_path, output_path)
+    validate_inputs(args.video_paths, args.action_log_path)
+    video_paths = repair_if_needed(args.video_paths, args.reference_video)
+    
+    if args.failures_only:
+        annotate_failures(video_paths, args.action_log_path, args.output_path, args.device_size, args.window)
+    else:
+        BACKENDS[args.backend](video_paths, args.action_log_path, args.output_path, args.device_size)
 
 
 if __name__ == '__main__':
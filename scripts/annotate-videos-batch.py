@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Batch video annotation for test automation runs.
+
+Discovers recordings (a directory's video chunks and its action log) under a
+test results tree and annotates them with annotate-video.py across a pool of
+workers. Progress is recorded in a manifest so an interrupted run can be
+resumed: recordings whose inputs are unchanged (by content hash) and whose
+output still exists are skipped.
+
+Usage:
+    python scripts/annotate-videos-batch.py <results_dir> [--jobs N] [--manifest path] [--force]
+
+Example:
+    python scripts/annotate-videos-batch.py /tmp/persona_test_results --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+ANNOTATE_SCRIPT = Path(__file__).parent / 'annotate-video.py'
+ACTION_LOG_NAMES = ('action_log.json', 'action_log.ndjson', 'action_log.jsonl')
+ANNOTATED_SUFFIX = '_annotated'
+DERIVED_SUFFIXES = (ANNOTATED_SUFFIX, '_repaired')  # Written by annotate-video.py, not recordings
+MANIFEST_NAME = 'annotation-manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def recording_order(path):
+    """Sort key putting screenrecord chunks in recording order (chunk_2 before chunk_10)."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path.name)]
+
+
+def discover_pairs(results_dir):
+    """
+    Find recordings and their action logs under a results directory.
+
+    A recording is a directory containing an action log and at least one MP4
+    that is not itself an annotated output or a repaired copy of a chunk. The
+    action log covers the whole run, so all the directory's videos are chunks
+    of one recording: they are annotated together, in recording order, into
+    <first chunk>_annotated.mp4.
+
+    Returns:
+        List of (video_paths, action_log_path, output_path) tuples, sorted by path
+    """
+    pairs = []
+    for dirpath, dirnames, filenames in os.walk(results_dir):
+        dirnames.sort()
+        log_name = next((name for name in ACTION_LOG_NAMES if name in filenames), None)
+        if not log_name:
+            continue
+
+        videos = sorted(
+            (Path(dirpath) / name for name in filenames
+             if name.lower().endswith('.mp4') and not Path(name).stem.endswith(DERIVED_SUFFIXES)),
+            key=recording_order
+        )
+        if videos:
+            output = videos[0].with_name(f"{videos[0].stem}{ANNOTATED_SUFFIX}.mp4")
+            pairs.append((videos, Path(dirpath) / log_name, output))
+    return pairs
+
+
+def file_hash(path, cache):
+    """
+    SHA-256 of a file, reusing the cached digest when size and mtime are unchanged.
+
+    Args:
+        path: File to hash
+        cache: Manifest 'hashes' dict mapping path -> {size, mtime_ns, sha256}
+    """
+    stat = path.stat()
+    cached = cache.get(str(path))
+    if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+        return cached['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    cache[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+    return sha256
+
+
+class Manifest:
+    """Thread-safe job manifest persisted as JSON after every state change."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.data = {'jobs': {}, 'hashes': {}}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.data = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️  Warning: Could not read manifest ({e}). Starting fresh.")
+        self.data.setdefault('jobs', {})
+        self.data.setdefault('hashes', {})
+
+    def job(self, output_path):
+        return self.data['jobs'].get(str(output_path))
+
+    def update_job(self, output_path, **fields):
+        with self.lock:
+            job = self.data['jobs'].setdefault(str(output_path), {})
+            job.update(fields)
+            self._save()
+
+    def _save(self):
+        # Write to a temp file and rename so an interrupt never leaves a torn manifest
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def is_up_to_date(job, input_key, output_path):
+    """Check whether a job already completed for these exact inputs."""
+    return (
+        job is not None
+        and job.get('status') == 'done'
+        and job.get('input_key') == input_key
+        and output_path.exists()
+    )
+
+
+def run_annotation(video_paths, action_log_path, output_path):
+    """
+    Annotate one recording (its chunks in order) in a separate process.
+
+    Each job gets its own interpreter so MoviePy/ffmpeg memory is released as
+    soon as the video is written.
+
+    Returns:
+        (success, elapsed_seconds, error_tail)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(ANNOTATE_SCRIPT), *map(str, video_paths), str(action_log_path), str(output_path)],
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    error_tail = None
+    if result.returncode != 0:
+        lines = (result.stdout + result.stderr).strip().splitlines()
+        errors = [line for line in lines if line.startswith('❌')]
+        if errors:
+            error_tail = errors[-1].lstrip('❌ ')
+        else:
+            error_tail = lines[-1].strip() if lines else f"exit code {result.returncode}"
+    return result.returncode == 0, elapsed, error_tail
+
+
+def format_size(num_bytes):
+    """Human-readable byte count."""
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def print_summary(results, wall_time):
+    """Print the per-video timing table and aggregate throughput."""
+    print("")
+    print("=" * 78)
+    print(f"{'Video':<44} {'Status':<8} {'Size':>9} {'Time':>8} {'MB/s':>6}")
+    print("-" * 78)
+    for result in results:
+        name = str(result['video'])
+        if len(name) > 44:
+            name = '…' + name[-43:]
+        elapsed = result['elapsed']
+        rate = (result['size'] / 1024 / 1024 / elapsed) if elapsed else 0.0
+        time_text = f"{elapsed:.1f}s" if result['status'] != 'skipped' else '-'
+        rate_text = f"{rate:.1f}" if result['status'] == 'done' else '-'
+        print(f"{name:<44} {result['status']:<8} {format_size(result['size']):>9} {time_text:>8} {rate_text:>6}")
+    print("-" * 78)
+
+    done = [r for r in results if r['status'] == 'done']
+    skipped = sum(1 for r in results if r['status'] == 'skipped')
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    total_bytes = sum(r['size'] for r in done)
+    busy_time = sum(r['elapsed'] for r in done)
+
+    print(f"Annotated: {len(done)}  Skipped (unchanged): {skipped}  Failed: {failed}")
+    print(f"Wall time: {wall_time:.1f}s  Worker time: {busy_time:.1f}s")
+    if done and wall_time > 0:
+        print(f"Throughput: {len(done) / wall_time * 60:.1f} videos/min, "
+              f"{total_bytes / 1024 / 1024 / wall_time:.1f} MB/s of input")
+    print("=" * 78)
+
+
+def annotate_batch(results_dir, jobs, manifest_path=None, force=False):
+    """
+    Annotate every discovered recording under results_dir.
+
+    Args:
+        results_dir: Root of the test results tree
+        jobs: Maximum number of concurrent annotation processes
+        manifest_path: Manifest location (default: <results_dir>/annotation-manifest.json)
+        force: Re-annotate even when inputs are unchanged
+
+    Returns:
+        True if every job succeeded or was skipped
+    """
+    results_dir = Path(results_dir)
+    if not results_dir.is_dir():
+        print(f"❌ Error: Results directory not found: {results_dir}")
+        sys.exit(1)
+
+    manifest = Manifest(manifest_path or results_dir / MANIFEST_NAME)
+    pairs = discover_pairs(results_dir)
+    print(f"🔍 Found {len(pairs)} recording(s) with an action log under {results_dir}")
+    if not pairs:
+        return True
+
+    results = []
+    pending = []
+    for video_paths, action_log_path, output_path in pairs:
+        # Adding, removing or changing a chunk changes the key of the whole recording
+        input_key = ':'.join(file_hash(path, manifest.data['hashes']) for path in [*video_paths, action_log_path])
+        result = {
+            'video': video_paths[0] if len(video_paths) == 1 else f"{video_paths[0]} (+{len(video_paths) - 1})",
+            'size': sum(path.stat().st_size for path in video_paths),
+            'elapsed': 0.0,
+        }
+        results.append(result)
+
+        if not force and is_up_to_date(manifest.job(output_path), input_key, output_path):
+            result['status'] = 'skipped'
+            continue
+        pending.append((result, video_paths, action_log_path, output_path, input_key))
+
+    print(f"🎬 Annotating {len(pending)} recording(s) with {jobs} worker(s), "
+          f"{len(pairs) - len(pending)} unchanged")
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for result, video_paths, action_log_path, output_path, input_key in pending:
+            manifest.update_job(
+                output_path,
+                videos=[str(path) for path in video_paths],
+                action_log=str(action_log_path),
+                input_key=input_key,
+                status='running',
+                started_at=datetime.now().isoformat()
+            )
+            future = executor.submit(run_annotation, video_paths, action_log_path, output_path)
+            futures[future] = (result, output_path)
+
+        for future in as_completed(futures):
+            result, output_path = futures[future]
+            success, elapsed, error = future.result()
+            result['elapsed'] = elapsed
+            result['status'] = 'done' if success else 'failed'
+            manifest.update_job(
+                output_path,
+                status=result['status'],
+                elapsed_seconds=round(elapsed, 3),
+                finished_at=datetime.now().isoformat(),
+                error=error
+            )
+            icon = '✅' if success else '❌'
+            suffix = f" ({error})" if error else ''
+            print(f"   {icon} {result['video']} in {elapsed:.1f}s{suffix}")
+
+    print_summary(results, time.perf_counter() - wall_start)
+    return all(r['status'] != 'failed' for r in results)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Annotate every test video under a results tree (resumable)'
+    )
+    parser.add_argument('results_dir', help='Root directory containing test result folders')
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help='Maximum concurrent annotations (default: half the CPU count)'
+    )
+    parser.add_argument('--manifest', help=f'Manifest path (default: <results_dir>/{MANIFEST_NAME})')
+    parser.add_argument('--force', action='store_true', help='Re-annotate even if inputs are unchanged')
+
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    if not annotate_batch(args.results_dir, args.jobs, args.manifest, args.force):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
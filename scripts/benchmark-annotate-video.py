@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark the video annotation pipeline on synthetic inputs.
+
+Generates a synthetic test video (ffmpeg testsrc2) and a synthetic ActionLogEntry
+log, runs annotate-video.py once per rendering backend, and records encoded fps,
+wall time, peak RSS and output size to development-metrics/video-annotation/ so
+regressions can be tracked alongside the other development metrics.
+
+Usage:
+    python scripts/benchmark-annotate-video.py [--width 1080] [--height 1920] [--fps 30]
+        [--duration 30] [--actions 50] [--backends moviepy,...]
+
+Example:
+    python scripts/benchmark-annotate-video.py --duration 60 --actions 500
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+ANNOTATE_SCRIPT = SCRIPT_DIR / 'annotate-video.py'
+METRICS_DIR = PROJECT_ROOT / 'development-metrics' / 'video-annotation'
+
+SYNTHETIC_ACTIONS = (
+    ('Tap', 'Tapping on {target}', True),
+    ('TypeText', 'Typing into {target}: user@example.com', False),
+    ('Swipe', 'Swiping {direction}', True),
+    ('WaitFor', 'Waiting for element {target} to be visible', False),
+    ('Verify', 'Verifying screen is {target}', False),
+)
+SYNTHETIC_TARGETS = ('Sign Up button', 'Email address input field', 'Mood slider', 'Save button', 'Home')
+
+
+def available_backends():
+    """Backends registered in annotate-video.py."""
+    spec = importlib.util.spec_from_file_location('annotate_video', ANNOTATE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return list(module.BACKENDS)
+
+
+def generate_video(path, width, height, fps, duration):
+    """Encode a synthetic test-pattern video with ffmpeg."""
+    subprocess.run(
+        [
+            'ffmpeg', '-loglevel', 'error', '-y',
+            '-f', 'lavfi', '-i', f'testsrc2=size={width}x{height}:rate={fps}',
+            '-t', str(duration),
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+            str(path)
+        ],
+        check=True
+    )
+
+
+def generate_action_log(path, actions, width, height, duration, seed=0):
+    """
+    Write a synthetic ActionLogEntry log with evenly spread, slightly jittered actions.
+
+    About one in ten actions fails, matching the shape of real persona runs closely
+    enough for failure-focused modes to have something to work on.
+    """
+    rng = random.Random(seed)
+    spacing = duration * 1000.0 / max(1, actions)
+    entries = [{'deviceWidth': width, 'deviceHeight': height}]
+    for i in range(actions):
+        action, template, has_coordinates = SYNTHETIC_ACTIONS[i % len(SYNTHETIC_ACTIONS)]
+        success = rng.random() > 0.1
+        description = template.format(
+            target=rng.choice(SYNTHETIC_TARGETS),
+            direction=rng.choice(('up', 'down', 'left', 'right'))
+        )
+        entries.append({
+            'timestampMs': int(i * spacing + rng.uniform(0, spacing * 0.5)),
+            'action': action,
+            'description': description if success else f"Failed: {description}",
+            'target': None,
+            'screenshot': None,
+            'coordinates': [rng.randrange(width), rng.randrange(height)] if has_coordinates else None,
+            'success': success,
+            'error': None if success else 'Element not found'
+        })
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+
+
+def run_backend(backend, video_path, action_log_path, output_path):
+    """
+    Run annotate-video.py for one backend and measure it.
+
+    os.wait4 gives the resource usage of exactly this child, so peak RSS is not
+    polluted by earlier runs.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(ANNOTATE_SCRIPT), str(video_path), str(action_log_path),
+         str(output_path), '--backend', backend],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.perf_counter() - start
+
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    result = {
+        'backend': backend,
+        'success': process.returncode == 0,
+        'wallTimeSeconds': round(wall_time, 3),
+        'cpuTimeSeconds': round(usage.ru_utime + usage.ru_stime, 3),
+        'peakRssMb': round(peak_rss / 1024 / 1024, 1),
+        'outputSizeBytes': output_path.stat().st_size if output_path.exists() else 0,
+    }
+    if not result['success']:
+        lines = stderr.decode('utf-8', 'replace').strip().splitlines()
+        result['error'] = lines[-1] if lines else f"exit code {process.returncode}"
+    return result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark annotate-video.py on synthetic inputs')
+    parser.add_argument('--width', type=int, default=1080, help='Video width (default: 1080)')
+    parser.add_argument('--height', type=int, default=1920, help='Video height (default: 1920)')
+    parser.add_argument('--fps', type=int, default=30, help='Video frame rate (default: 30)')
+    parser.add_argument('--duration', type=float, default=30.0, help='Video duration in seconds (default: 30)')
+    parser.add_argument('--actions', type=int, default=50, help='Number of synthetic actions (default: 50)')
+    parser.add_argument('--backends', help='Comma-separated backends to run (default: all)')
+    parser.add_argument('--output-dir', default=str(METRICS_DIR), help='Where to write the metrics JSON')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated videos and logs')
+
+    args = parser.parse_args()
+
+    if not shutil.which('ffmpeg'):
+        print("❌ Error: ffmpeg not found. Install with: brew install ffmpeg")
+        sys.exit(1)
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    work_dir = Path(tempfile.mkdtemp(prefix='annotate-benchmark-'))
+    video_path = work_dir / 'synthetic.mp4'
+    action_log_path = work_dir / 'action_log.json'
+    frames = int(args.fps * args.duration)
+
+    print(f"🎞️  Generating {args.width}x{args.height} @ {args.fps}fps, {args.duration}s synthetic video...")
+    generate_video(video_path, args.width, args.height, args.fps, args.duration)
+    generate_action_log(action_log_path, args.actions, args.width, args.height, args.duration)
+    print(f"📋 Generated {args.actions} synthetic actions")
+
+    results = []
+    for backend in backends:
+        print(f"⏱️  Running backend: {backend}")
+        output_path = work_dir / f'annotated_{backend}.mp4'
+        result = run_backend(backend, video_path, action_log_path, output_path)
+        result['encodedFps'] = round(frames / result['wallTimeSeconds'], 2) if result['success'] else 0.0
+        results.append(result)
+        status = '✅' if result['success'] else '❌'
+        print(f"   {status} {result['wallTimeSeconds']:.2f}s, {result['encodedFps']:.1f} fps, "
+              f"peak RSS {result['peakRssMb']:.0f} MB, output {result['outputSizeBytes'] / 1024 / 1024:.1f} MB")
+
+    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    metrics = {
+        'timestamp': timestamp,
+        'video': {
+            'width': args.width,
+            'height': args.height,
+            'fps': args.fps,
+            'durationSeconds': args.duration,
+            'frames': frames,
+            'inputSizeBytes': video_path.stat().st_size,
+        },
+        'actions': args.actions,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'results': results,
+    }
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    metrics_path = output_dir / f'benchmark_{timestamp}.json'
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    print(f"💾 Metrics written to: {metrics_path}")
+
+    if args.keep:
+        print(f"   Inputs and outputs kept in: {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if not all(r['success'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
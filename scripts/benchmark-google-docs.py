@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Google Docs scripts against the local fake Drive/Docs API.
+
+Starts fake_google_api.py with the configured latency and quota, generates
+synthetic HTML documents, and runs google-docs-workflow.py and
+google-docs-api-upload.py against it in a throwaway HOME (so no real
+credentials or config are touched):
+
+- bulk: concurrent uploads at each --jobs level, paced to the quota
+- bulk-overdriven: client rate well above the quota, exercising retries
+- sync: one small edit, then `sync` (should cost one in-place update)
+- list: building the metadata index, then listing offline
+- api-upload: one large HTML file, multipart and resumable
+
+Wall time, peak RSS, request counts, throttled requests and retries are
+recorded to development-metrics/google-docs/.
+
+Usage:
+    python scripts/benchmark-google-docs.py [--documents 40] [--jobs 1,4,8] [--latency 0.1]
+        [--quota 20] [--large-mb 20]
+
+Example:
+    python scripts/benchmark-google-docs.py --documents 100 --jobs 1,2,4,8,16 --quota 30
+"""
+
+import argparse
+import copy
+import json
+import os
+import pickle
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from google.oauth2.credentials import Credentials
+    from fake_google_api import start_server
+    from google_docs_client import SCOPES
+except ImportError as e:
+    print(f"❌ Error: Missing required dependency: {e}")
+    print("Install with: pip3 install google-api-python-client google-auth-httplib2 google-auth-oauthlib requests")
+    sys.exit(1)
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+WORKFLOW_SCRIPT = SCRIPT_DIR / 'google-docs-workflow.py'
+API_UPLOAD_SCRIPT = SCRIPT_DIR / 'google-docs-api-upload.py'
+METRICS_DIR = PROJECT_ROOT / 'development-metrics' / 'google-docs'
+
+
+def generate_documents(directory, count, paragraphs=60):
+    """Write synthetic HTML documents with headings, paragraphs and lists."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        body = [f'<h1>Synthetic document {i}</h1>']
+        for j in range(paragraphs):
+            if j % 15 == 0:
+                body.append(f'<h2>Section {j // 15}</h2>')
+            if j % 10 == 9:
+                body.append(f'<ul><li>Item {j}a</li><li>Item {j}b</li></ul>')
+            body.append(f'<p>Paragraph {j} of document {i}: what changed, why, and what to check next.</p>')
+        path = directory / f'synthetic_doc_{i:03d}.html'
+        path.write_text('<html><body>' + ''.join(body) + '</body></html>', encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def generate_large_document(path, size_mb):
+    """Write an HTML file of about size_mb megabytes, like one with base64-embedded screenshots."""
+    chunk = '<p><img src="data:image/png;base64,' + 'iVBORw0KGgo' * 9000 + '"></p>\n'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<html><body><h1>Large document</h1>\n')
+        for _ in range(max(1, int(size_mb * 1024 * 1024 / len(chunk)))):
+            f.write(chunk)
+        f.write('</body></html>\n')
+
+
+def make_home(directory):
+    """A throwaway HOME holding a token the fake API accepts."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / '.google-docs-token.pickle', 'wb') as f:
+        pickle.dump(Credentials(token='benchmark', scopes=SCOPES), f)
+    return directory
+
+
+def run_script(command, home, api_root):
+    """Run a script against the fake API, measuring wall time and peak RSS of exactly that child."""
+    env = dict(os.environ, HOME=str(home), GOOGLE_DOCS_API_ROOT=api_root)
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *map(str, command)], env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = process.stdout.read().decode('utf-8', 'replace')
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.perf_counter() - start
+
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    result = {
+        'success': process.returncode == 0,
+        'wallTimeSeconds': round(wall_time, 3),
+        'peakRssMb': round(peak_rss / 1024 / 1024, 1),
+    }
+    if not result['success']:
+        lines = output.strip().splitlines()
+        result['error'] = lines[-1] if lines else f"exit code {process.returncode}"
+    return result, output
+
+
+def stats_delta(api, before):
+    """Requests seen by the fake API since the `before` snapshot."""
+    with api.lock:
+        after = copy.deepcopy(api.stats)
+    return {
+        'requests': after['requests'] - before['requests'],
+        'throttled': after['throttled'] - before['throttled'],
+        'bytesSent': after['bytesReceived'] - before['bytesReceived'],
+        'byEndpoint': {key: value - before['byEndpoint'].get(key, 0)
+                       for key, value in after['byEndpoint'].items() if value != before['byEndpoint'].get(key, 0)},
+    }
+
+
+def measure(api, command, home, label):
+    """Run one scenario and combine process and API measurements."""
+    with api.lock:
+        before = copy.deepcopy(api.stats)
+    result, output = run_script(command, home, api.base_url)
+    result.update(stats_delta(api, before))
+    result['scenario'] = label
+    retries = re.search(r'documents/s, (\d+) retries\)', output)
+    if retries:
+        result['retries'] = int(retries.group(1))
+    return result, output
+
+
+def report(result, documents=None):
+    """Print one result line."""
+    status = '✅' if result['success'] else '❌'
+    rate = f", {documents / result['wallTimeSeconds']:.1f} docs/s" if documents else ''
+    retries = f", {result['retries']} retries" if 'retries' in result else ''
+    print(f"   {status} {result['scenario']}: {result['wallTimeSeconds']:.2f}s{rate}, "
+          f"{result['requests']} requests ({result['throttled']} throttled{retries}), "
+          f"{result['bytesSent'] / 1024:.0f} KiB sent, peak RSS {result['peakRssMb']:.0f} MB")
+    if not result['success']:
+        print(f"      {result.get('error')}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the Google Docs scripts against a local fake API')
+    parser.add_argument('--documents', type=int, default=40, help='Synthetic documents to upload (default: 40)')
+    parser.add_argument('--jobs', default='1,4,8', help='Comma-separated worker counts for bulk (default: 1,4,8)')
+    parser.add_argument('--latency', type=float, default=0.1, help='Fake API latency in seconds (default: 0.1)')
+    parser.add_argument('--jitter', type=float, default=0.05, help='Extra random latency in seconds (default: 0.05)')
+    parser.add_argument('--quota', type=float, default=20.0, help='Fake API requests per second (default: 20)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 503')
+    parser.add_argument('--large-mb', type=float, default=20.0, help='Size of the large upload in MB (default: 20)')
+    parser.add_argument('--output-dir', default=str(METRICS_DIR), help='Where to write the metrics JSON')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated documents and HOME directories')
+
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix='google-docs-benchmark-'))
+    server = start_server(latency=args.latency, jitter=args.jitter, quota=args.quota, error_rate=args.error_rate,
+                          seed=0)
+    api = server.api
+    print(f"🌐 Fake Google API at {api.base_url} "
+          f"(latency {args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms, quota {args.quota:g} req/s)")
+
+    documents = generate_documents(work_dir / 'docs', args.documents)
+    print(f"📄 Generated {len(documents)} synthetic documents")
+    results = []
+
+    for jobs in [int(j) for j in args.jobs.split(',')]:
+        home = make_home(work_dir / f'home-bulk-{jobs}')
+        result, _ = measure(api, [WORKFLOW_SCRIPT, 'bulk', *documents, '--jobs', jobs, '--rate', args.quota],
+                            home, f'bulk --jobs {jobs}')
+        result['jobs'] = jobs
+        result['documentsPerSecond'] = round(len(documents) / result['wallTimeSeconds'], 2)
+        results.append(result)
+        report(result, len(documents))
+    sync_home = home
+
+    jobs = max(int(j) for j in args.jobs.split(','))
+    result, _ = measure(api, [WORKFLOW_SCRIPT, 'bulk', *documents, '--jobs', jobs, '--rate', args.quota * 4],
+                        make_home(work_dir / 'home-overdriven'), f'bulk-overdriven --jobs {jobs}')
+    result['jobs'] = jobs
+    result['documentsPerSecond'] = round(len(documents) / result['wallTimeSeconds'], 2)
+    results.append(result)
+    report(result, len(documents))
+
+    edited = documents[len(documents) // 2]
+    edited.write_text(edited.read_text(encoding='utf-8').replace('Paragraph 7 ', 'Paragraph seven ', 1),
+                      encoding='utf-8')
+    result, _ = measure(api, [WORKFLOW_SCRIPT, 'sync'], sync_home, 'sync after one edit')
+    results.append(result)
+    report(result)
+
+    result, _ = measure(api, [WORKFLOW_SCRIPT, 'list', '--rebuild'], sync_home, 'list --rebuild')
+    results.append(result)
+    report(result)
+    result, _ = measure(api, [WORKFLOW_SCRIPT, 'list', '--search', 'document 1'], sync_home, 'list (offline)')
+    results.append(result)
+    report(result)
+
+    large = work_dir / 'large_document.html'
+    generate_large_document(large, args.large_mb)
+    print(f"📦 Generated {large.stat().st_size / 1024 / 1024:.1f} MB document")
+    for mode in ('multipart', 'resumable'):
+        command = [API_UPLOAD_SCRIPT, 'upload', large, '--token', 'benchmark', f'--{mode}']
+        result, _ = measure(api, command, make_home(work_dir / f'home-{mode}'), f'api-upload {mode}')
+        results.append(result)
+        report(result)
+
+    server.shutdown()
+
+    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    metrics = {
+        'timestamp': timestamp,
+        'fakeApi': {
+            'latencySeconds': args.latency,
+            'jitterSeconds': args.jitter,
+            'quotaPerSecond': args.quota,
+            'errorRate': args.error_rate,
+        },
+        'documents': len(documents),
+        'largeDocumentBytes': large.stat().st_size,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'results': results,
+    }
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    metrics_path = output_dir / f'benchmark_{timestamp}.json'
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    print(f"💾 Metrics written to: {metrics_path}")
+
+    if args.keep:
+        print(f"   Inputs and HOME directories kept in: {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if not all(r['success'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Extract the frame at each action in a test video.
+
+For every action in the action log, ffmpeg is started with input seeking
+(-ss before -i): it jumps to the nearest keyframe before the action and decodes
+only the few frames up to the exact timestamp, instead of decoding the video
+from the start. The extractions run in parallel, one ffmpeg process per action,
+bounded by --jobs.
+
+Writes one thumbnail per action plus a contact sheet of all of them, so triage
+can start from "what did the screen look like at action 37?" without scrubbing.
+
+Usage:
+    python scripts/extract-action-keyframes.py <video_path> <action_log_path> <output_dir>
+        [--actions 37,40] [--width 270] [--columns 6] [--jobs N]
+
+Example:
+    python scripts/extract-action-keyframes.py \
+        /tmp/test_results/video.mp4 \
+        /tmp/test_results/action_log.json \
+        /tmp/test_results/keyframes
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageDraw
+    from action_log import iter_actions
+    from video_overlays import load_font
+except ImportError as e:
+    print(f"❌ Error: Missing required dependency: {e}")
+    print("   Install dependencies: pip install -r requirements.txt")
+    sys.exit(1)
+
+LABEL_HEIGHT = 44
+SHEET_PADDING = 8
+SHEET_BACKGROUND = (24, 24, 24)
+FAILURE_COLOR = (200, 90, 74)  # ERROR from the app colour scheme
+
+
+def thumbnail_path(output_dir, action):
+    return Path(output_dir) / f"action_{action['_index']:03d}_{action.get('timestampMs', 0)}ms.png"
+
+
+def extract_frame(video_path, timestamp_sec, output_path, width):
+    """
+    Extract a single scaled frame at timestamp_sec with a keyframe seek.
+
+    Returns:
+        True if the frame was written (False e.g. when the timestamp is past the end)
+    """
+    # ffmpeg exits 0 without writing anything past the end of the video, so a
+    # thumbnail left by an earlier run must not be mistaken for this one
+    output_path.unlink(missing_ok=True)
+    result = subprocess.run(
+        [
+            'ffmpeg', '-loglevel', 'error', '-y',
+            '-ss', f'{timestamp_sec:.3f}',
+            '-i', str(video_path),
+            '-frames:v', '1',
+            '-vf', f'scale={width}:-2',
+            str(output_path)
+        ],
+        capture_output=True
+    )
+    return result.returncode == 0 and output_path.exists()
+
+
+def build_contact_sheet(thumbnails, output_path, columns, width):
+    """
+    Lay out the extracted thumbnails in a labelled grid.
+
+    Args:
+        thumbnails: List of (action, thumbnail_path) in action order
+        output_path: Where to write the contact sheet PNG
+        columns: Thumbnails per row
+        width: Thumbnail width in pixels
+    """
+    with Image.open(thumbnails[0][1]) as first:
+        thumb_height = int(first.height * width / first.width)
+
+    rows = (len(thumbnails) + columns - 1) // columns
+    cell_w = width + SHEET_PADDING
+    cell_h = thumb_height + LABEL_HEIGHT + SHEET_PADDING
+    sheet = Image.new('RGB', (columns * cell_w + SHEET_PADDING, rows * cell_h + SHEET_PADDING), SHEET_BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    title_font = load_font(14)
+    text_font = load_font(11)
+
+    for i, (action, path) in enumerate(thumbnails):
+        x = SHEET_PADDING + (i % columns) * cell_w
+        y = SHEET_PADDING + (i // columns) * cell_h
+        with Image.open(path) as thumb:
+            sheet.paste(thumb.convert('RGB'), (x, y))
+
+        failed = action.get('success') is False
+        if failed:
+            draw.rectangle([x - 2, y - 2, x + width + 1, y + thumb_height + 1], outline=FAILURE_COLOR, width=3)
+
+        title = f"#{action['_index']}  {action.get('timestampMs', 0) / 1000.0:.2f}s"
+        if failed:
+            title += '  FAILED'
+        description = action.get('description', '')
+        while description and draw.textlength(description, font=text_font) > width:
+            description = description[:-2] + '…'
+        draw.text((x, y + thumb_height + 4), title, font=title_font,
+                  fill=FAILURE_COLOR if failed else (255, 255, 255))
+        draw.text((x, y + thumb_height + 24), description, font=text_font, fill=(200, 200, 200))
+
+    sheet.save(output_path)
+
+
+def extract_action_keyframes(video_path, action_log_path, output_dir, selected=None,
+                             width=270, columns=6, jobs=None):
+    """
+    Extract per-action thumbnails and a contact sheet.
+
+    Args:
+        video_path: Path to the test video
+        action_log_path: Path to the JSON or NDJSON action log
+        output_dir: Directory for thumbnails and contact_sheet.png
+        selected: Optional set of 1-based action indexes to extract
+        width: Thumbnail width in pixels
+        columns: Contact sheet columns
+        jobs: Maximum concurrent ffmpeg processes
+    """
+    if not os.path.exists(video_path):
+        print(f"❌ Error: Video file not found: {video_path}")
+        sys.exit(1)
+    if not os.path.exists(action_log_path):
+        print(f"❌ Error: Action log file not found: {action_log_path}")
+        sys.exit(1)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    actions = [a for a in iter_actions(action_log_path) if not selected or a['_index'] in selected]
+    if not actions:
+        print("⚠️  Warning: No matching actions found in log.")
+        return
+
+    print(f"🖼️  Extracting {len(actions)} keyframe(s) from {video_path}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        extracted = list(executor.map(
+            lambda action: extract_frame(
+                video_path,
+                max(0.0, action.get('timestampMs', 0) / 1000.0),
+                thumbnail_path(output_dir, action),
+                width
+            ),
+            actions
+        ))
+    elapsed = time.perf_counter() - start
+
+    thumbnails = [(a, thumbnail_path(output_dir, a)) for a, ok in zip(actions, extracted) if ok]
+    missing = len(actions) - len(thumbnails)
+    if missing:
+        print(f"⚠️  Warning: {missing} action(s) could not be extracted (timestamp outside video?)")
+    print(f"   Extracted {len(thumbnails)} frame(s) in {elapsed:.2f}s")
+
+    if thumbnails:
+        sheet_path = output_dir / 'contact_sheet.png'
+        build_contact_sheet(thumbnails, sheet_path, columns, width)
+        print(f"✅ Contact sheet: {sheet_path}")
+
+
+def parse_action_list(value):
+    """Parse a comma-separated list of action numbers and ranges, e.g. '3,7-9'."""
+    selected = set()
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                first, last = (int(p) for p in part.split('-', 1))
+                selected.update(range(first, last + 1))
+            else:
+                selected.add(int(part))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid action list '{value}'")
+    return selected
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Extract a frame per action and build a contact sheet')
+    parser.add_argument('video_path', help='Input video file')
+    parser.add_argument('action_log_path', help='Action log (JSON array or NDJSON)')
+    parser.add_argument('output_dir', help='Directory for thumbnails and contact sheet')
+    parser.add_argument('--actions', type=parse_action_list, help='Only these action numbers, e.g. 37 or 30-40')
+    parser.add_argument('--width', type=int, default=270, help='Thumbnail width in pixels (default: 270)')
+    parser.add_argument('--columns', type=int, default=6, help='Contact sheet columns (default: 6)')
+    parser.add_argument('--jobs', '-j', type=int, help='Concurrent ffmpeg processes (default: CPU count)')
+
+    args = parser.parse_args()
+    if args.columns < 1:
+        parser.error('--columns must be at least 1')
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    if not shutil.which('ffmpeg'):
+        print("❌ Error: ffmpeg not found. Install with: brew install ffmpeg")
+        sys.exit(1)
+
+    extract_action_keyframes(
+        args.video_path,
+        args.action_log_path,
+        args.output_dir,
+        selected=args.actions,
+        width=args.width,
+        columns=args.columns,
+        jobs=args.jobs
+    )
+
+
+if __name__ == '__main__':
+    main()
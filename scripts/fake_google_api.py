@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Google Drive v3 and Docs v1 APIs.
+
+Implements the subset of endpoints the google-docs-* scripts use, in memory,
+so they can be exercised and benchmarked without a Google account:
+
+- Drive: multipart and resumable upload (HTML is converted when the target is
+  a Google Doc), get, copy, delete, export (HTML or zip), list with paging and
+  simple queries, changes (start page token and list), and batch requests
+- Docs: documents.get and documents.batchUpdate (insertText,
+  deleteContentRange, paragraph style and bullet requests, requiredRevisionId)
+
+Latency, rate limits and server errors can be injected to test throughput and
+retry behaviour. Requests need an `Authorization` header but any token is
+accepted.
+
+Usage:
+    python scripts/fake_google_api.py [--port 8765] [--latency 0.05] [--quota 20] [--error-rate 0.01]
+
+Then point the scripts at it:
+    GOOGLE_DOCS_API_ROOT=http://127.0.0.1:8765/ python scripts/google-docs-workflow.py list --rebuild
+
+GET /_stats returns request, throttling and injected-error counts.
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from google_docs_update import html_to_paragraphs, utf16_len
+
+DOCUMENT_MIME_TYPE = 'application/vnd.google-apps.document'
+HEADING_TAGS = {f'HEADING_{level}': f'h{level}' for level in range(1, 7)}
+QUERY_CLAUSE = re.compile(r"^(mimeType|name)\s*(=|!=|contains)\s*'((?:[^'\\]|\\.)*)'$|^trashed\s*=\s*(true|false)$")
+
+
+def _code_units(text):
+    """text as a string of UTF-16 code units (one character each, surrogates unpaired), so it indexes like Docs."""
+    data = text.encode('utf-16-le')
+    return ''.join(chr(int.from_bytes(data[i:i + 2], 'little')) for i in range(0, len(data), 2))
+
+
+def _from_code_units(units):
+    return units.encode('utf-16-le', 'surrogatepass').decode('utf-16-le')
+
+
+class ApiError(Exception):
+    """An error response in the Google API JSON error format."""
+
+    def __init__(self, status, message, reason='invalid'):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+    def response(self):
+        body = {'error': {'code': self.status, 'message': str(self),
+                          'errors': [{'reason': self.reason, 'message': str(self)}]}}
+        return self.status, {'Content-Type': 'application/json'}, json.dumps(body).encode('utf-8')
+
+
+def _json(data, status=200, headers=None):
+    return status, dict({'Content-Type': 'application/json'}, **(headers or {})), json.dumps(data).encode('utf-8')
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _split_headers(part):
+    """Split a MIME part or embedded HTTP message into (header lines, body)."""
+    match = re.search(rb'\r?\n\r?\n', part)
+    if not match:
+        return part.decode('utf-8', 'replace').splitlines(), b''
+    return part[:match.start()].decode('utf-8', 'replace').splitlines(), part[match.end():]
+
+
+def _multipart_parts(content_type, body):
+    """Parts of a multipart body as (headers dict, content) pairs."""
+    boundary = re.search(r'boundary="?([^";]+)"?', content_type or '')
+    if not boundary:
+        raise ApiError(400, 'Missing multipart boundary')
+    delimiter = b'--' + boundary.group(1).encode('utf-8')
+    parts = []
+    for chunk in body.split(delimiter)[1:]:
+        if chunk.startswith(b'--'):
+            break
+        lines, content = _split_headers(chunk.lstrip(b'\r\n'))
+        headers = {}
+        for line in lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        parts.append((headers, re.sub(rb'\r?\n$', b'', content, count=1)))
+    return parts
+
+
+class FakeGoogleAPI:
+    """In-memory Drive and Docs state, with injectable latency, rate limiting and errors."""
+
+    def __init__(self, base_url='', latency=0.0, jitter=0.0, quota=None, burst=None,
+                 throttle_status=429, error_rate=0.0, seed=None):
+        self.base_url = base_url
+        self.latency = latency
+        self.jitter = jitter
+        self.quota = quota
+        self.burst = burst or (quota or 1)
+        self.throttle_status = throttle_status
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.files = {}
+        self.documents = {}  # file ID -> {'paragraphs': [[style, bullet, text]], 'revision': int}
+        self.changes = []  # file IDs, one per change
+        self.sessions = {}
+        self.tokens = float(self.burst)
+        self.tokens_updated = time.monotonic()
+        self.stats = {'requests': 0, 'throttled': 0, 'injectedErrors': 0, 'bytesReceived': 0, 'byEndpoint': {}}
+
+    # Fault injection
+
+    def admit(self, endpoint, size):
+        """Apply latency and rate-limit/error injection; raises ApiError to reject the request."""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.random.uniform(0, self.jitter))
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['bytesReceived'] += size
+            self.stats['byEndpoint'][endpoint] = self.stats['byEndpoint'].get(endpoint, 0) + 1
+            if self.quota:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.tokens_updated) * self.quota)
+                self.tokens_updated = now
+                if self.tokens < 1:
+                    self.stats['throttled'] += 1
+                    if self.throttle_status == 403:
+                        raise ApiError(403, 'User Rate Limit Exceeded', 'userRateLimitExceeded')
+                    raise ApiError(429, 'Too Many Requests', 'rateLimitExceeded')
+                self.tokens -= 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats['injectedErrors'] += 1
+                raise ApiError(503, 'Backend Error', 'backendError')
+
+    # Drive files
+
+    def _metadata(self, file):
+        metadata = {key: value for key, value in file.items() if key != 'content'}
+        if file['mimeType'] == DOCUMENT_MIME_TYPE:
+            metadata['webViewLink'] = f"https://docs.google.com/document/d/{file['id']}/edit"
+        return metadata
+
+    def _touch(self, file):
+        file['modifiedTime'] = _now()
+        file['version'] = str(int(file['version']) + 1)
+        self.changes.append(file['id'])
+
+    def _file(self, file_id):
+        file = self.files.get(file_id)
+        if file is None:
+            raise ApiError(404, f'File not found: {file_id}', 'notFound')
+        return file
+
+    def create_file(self, metadata, content, content_type='application/octet-stream'):
+        with self.lock:
+            now = _now()
+            file = {
+                'id': uuid.uuid4().hex[:20],
+                'name': metadata.get('name', 'Untitled'),
+                'mimeType': metadata.get('mimeType') or content_type.split(';')[0],
+                'trashed': False,
+                'createdTime': now,
+                'modifiedTime': now,
+                'version': '1',
+            }
+            if file['mimeType'] == DOCUMENT_MIME_TYPE:
+                paragraphs = [list(p) for p in html_to_paragraphs(content.decode('utf-8', 'replace'))]
+                self.documents[file['id']] = {'paragraphs': paragraphs or [['NORMAL_TEXT', False, '']],
+                                              'revision': 1}
+            else:
+                file['content'] = content
+            self.files[file['id']] = file
+            self.changes.append(file['id'])
+            return self._metadata(file)
+
+    def copy_file(self, file_id, metadata):
+        with self.lock:
+            source = self._file(file_id)
+            content = source.get('content') or self._render_html(file_id).encode('utf-8')
+        return self.create_file({'name': metadata.get('name', source['name']),
+                                 'mimeType': metadata.get('mimeType', source['mimeType'])}, content)
+
+    def delete_file(self, file_id):
+        with self.lock:
+            self._file(file_id)
+            del self.files[file_id]
+            self.documents.pop(file_id, None)
+            self.changes.append(file_id)
+
+    def get_file(self, file_id):
+        with self.lock:
+            return self._metadata(self._file(file_id))
+
+    def list_files(self, query, page_size, page_token):
+        filters = []
+        for clause in filter(None, (c.strip() for c in re.split(r'\s+and\s+', query or ''))):
+            match = QUERY_CLAUSE.match(clause)
+            if not match:
+                raise ApiError(400, f'Unsupported query clause: {clause}')
+            field, operator, value, trashed = match.groups()
+            if trashed:
+                filters.append(lambda f, t=trashed: f['trashed'] == (t == 'true'))
+            else:
+                value = value.replace("\\'", "'").replace('\\\\', '\\')
+                if operator == 'contains':
+                    filters.append(lambda f, k=field, v=value: v.lower() in f[k].lower())
+                elif operator == '=':
+                    filters.append(lambda f, k=field, v=value: f[k] == v)
+                else:
+                    filters.append(lambda f, k=field, v=value: f[k] != v)
+        with self.lock:
+            matches = [self._metadata(f) for f in self.files.values() if all(check(f) for check in filters)]
+        start = int(page_token or 0)
+        result = {'files': matches[start:start + page_size]}
+        if start + page_size < len(matches):
+            result['nextPageToken'] = str(start + page_size)
+        return result
+
+    def export_file(self, file_id, mime_type):
+        with self.lock:
+            file = self._file(file_id)
+            if file['mimeType'] != DOCUMENT_MIME_TYPE:
+                raise ApiError(403, 'Export only supports Docs Editors files', 'fileNotExportable')
+            html = self._render_html(file_id)
+        if mime_type == 'text/html':
+            return html.encode('utf-8')
+        if mime_type == 'application/zip':
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(f"{file['name']}.html", html)
+                archive.writestr('images/', '')
+            return buffer.getvalue()
+        raise ApiError(400, f'Unsupported export format: {mime_type}', 'badRequest')
+
+    def _render_html(self, file_id):
+        body = []
+        for style, bullet, text in self.documents[file_id]['paragraphs']:
+            tag = 'li' if bullet else HEADING_TAGS.get(style, 'p')
+            body.append(f'<{tag}>{escape(text)}</{tag}>')
+        return '<html><body>' + ''.join(body) + '</body></html>'
+
+    # Resumable uploads
+
+    def start_session(self, metadata, size, content_type):
+        session_id = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[session_id] = {'metadata': metadata, 'size': size, 'contentType': content_type,
+                                         'data': bytearray()}
+        return f"{self.base_url}upload/drive/v3/files?uploadType=resumable&upload_id={session_id}"
+
+    def upload_chunk(self, session_id, content_range, data):
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                raise ApiError(404, 'Upload session not found', 'notFound')
+            match = re.match(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)', content_range or '')
+            if not match:
+                raise ApiError(400, f'Invalid Content-Range: {content_range}')
+            if match.group(1) is not None:
+                start = int(match.group(1))
+                if start != len(session['data']):
+                    raise ApiError(400, f"Expected chunk at byte {len(session['data'])}, got {start}")
+                session['data'] += data
+            received = len(session['data'])
+            if received < session['size']:
+                return 308, {'Range': f'bytes=0-{received - 1}'} if received else {}, b''
+            del self.sessions[session_id]
+        return _json(self.create_file(session['metadata'], bytes(session['data']), session['contentType']))
+
+    # Changes feed
+
+    def start_page_token(self):
+        with self.lock:
+            return {'startPageToken': str(len(self.changes) + 1)}
+
+    def list_changes(self, page_token, page_size):
+        with self.lock:
+            start = int(page_token) - 1
+            file_ids = self.changes[start:start + page_size]
+            changes = []
+            for file_id in file_ids:
+                file = self.files.get(file_id)
+                change = {'fileId': file_id, 'removed': file is None}
+                if file is not None:
+                    change['file'] = self._metadata(file)
+                changes.append(change)
+            result = {'changes': changes}
+            if start + page_size < len(self.changes):
+                result['nextPageToken'] = str(start + page_size + 1)
+            else:
+                result['newStartPageToken'] = str(len(self.changes) + 1)
+            return result
+
+    # Docs
+
+    def get_document(self, doc_id):
+        with self.lock:
+            file = self._file(doc_id)
+            document = self.documents.get(doc_id)
+            if document is None:
+                raise ApiError(400, 'This operation is not supported for this document', 'badRequest')
+            content = [{'endIndex': 1, 'sectionBreak': {}}]
+            index = 1
+            for style, bullet, text in document['paragraphs']:
+                end = index + utf16_len(text) + 1
+                paragraph = {
+                    'elements': [{'startIndex': index, 'endIndex': end, 'textRun': {'content': text + '\n'}}],
+                    'paragraphStyle': {'namedStyleType': style},
+                }
+                if bullet:
+                    paragraph['bullet'] = {'listId': 'list'}
+                content.append({'startIndex': index, 'endIndex': end, 'paragraph': paragraph})
+                index = end
+            return {'documentId': doc_id, 'title': file['name'], 'revisionId': str(document['revision']),
+                    'body': {'content': content}}
+
+    def batch_update(self, doc_id, body):
+        with self.lock:
+            file = self._file(doc_id)
+            document = self.documents[doc_id]
+            required = body.get('writeControl', {}).get('requiredRevisionId')
+            if required is not None and required != str(document['revision']):
+                raise ApiError(400, 'The document was modified after the required revision', 'failedPrecondition')
+
+            # Flat model: the text (in UTF-16 code units, like Docs indices), plus the
+            # [style, bullet] of each paragraph's newline
+            text = _code_units(''.join(p[2] + '\n' for p in document['paragraphs']))
+            styles = [[p[0], p[1]] for p in document['paragraphs']]
+
+            def check_index(index):
+                position = index - 1
+                if 0 < position < len(text) and '\ud800' <= text[position - 1] <= '\udbff' \
+                        and '\udc00' <= text[position] <= '\udfff':
+                    raise ApiError(400, f'Index {index} splits a surrogate pair')
+
+            def check_range(start, end, allow_last=False):
+                limit = len(text) + (1 if allow_last else 0)
+                if not 1 <= start < end <= limit:
+                    raise ApiError(400, f'Invalid range {start}-{end} (document end is {len(text) + 1})')
+                check_index(start)
+                check_index(end)
+
+            def paragraph_at(index):
+                return text.count('\n', 0, index - 1)
+
+            for request in body.get('requests', []):
+                (kind, params), = request.items()
+                if kind == 'insertText':
+                    index = params['location']['index']
+                    if not 1 <= index <= len(text):
+                        raise ApiError(400, f'Invalid insertion index {index}')
+                    check_index(index)
+                    inserted = _code_units(params['text'])
+                    k = paragraph_at(index)
+                    styles[k:k] = [list(styles[k]) for _ in range(inserted.count('\n'))]
+                    text = text[:index - 1] + inserted + text[index - 1:]
+                elif kind == 'deleteContentRange':
+                    start, end = params['range']['startIndex'], params['range']['endIndex']
+                    check_range(start, end)
+                    k = paragraph_at(start)
+                    del styles[k:k + text.count('\n', start - 1, end - 1)]
+                    text = text[:start - 1] + text[end - 1:]
+                elif kind in ('updateParagraphStyle', 'createParagraphBullets', 'deleteParagraphBullets'):
+                    start, end = params['range']['startIndex'], params['range']['endIndex']
+                    check_range(start, end, allow_last=True)
+                    for k in range(paragraph_at(start), paragraph_at(end - 1) + 1):
+                        if kind == 'updateParagraphStyle':
+                            styles[k][0] = params['paragraphStyle'].get('namedStyleType', styles[k][0])
+                        else:
+                            styles[k][1] = kind == 'createParagraphBullets'
+                elif kind == 'updateTextStyle':
+                    check_range(params['range']['startIndex'], params['range']['endIndex'])
+                else:
+                    raise ApiError(400, f'Unsupported request: {kind}')
+
+            document['paragraphs'] = [[s[0], s[1], t] for s, t in zip(styles, _from_code_units(text).split('\n'))]
+            document['revision'] += 1
+            self._touch(file)
+            return {'documentId': doc_id, 'replies': [{} for _ in body.get('requests', [])],
+                    'writeControl': {'requiredRevisionId': str(document['revision'])}}
+
+    # Routing
+
+    def handle(self, method, url, headers, body):
+        """
+        Handle one API request.
+
+        Returns:
+            (status, headers, body) tuple
+        """
+        parts = urlsplit(url)
+        path = parts.path.rstrip('/')
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        segments = path.strip('/').split('/')
+        try:
+            if path == '/_stats':
+                with self.lock:
+                    return _json(json.loads(json.dumps(self.stats)))
+            if not headers.get('authorization'):
+                raise ApiError(401, 'Request is missing required authentication credential', 'authError')
+
+            if path == '/batch/drive/v3' and method == 'POST':
+                self.admit('batch', len(body))
+                return self._handle_batch(headers, body)
+
+            if path == '/upload/drive/v3/files':
+                self.admit(f"upload:{query.get('uploadType')}", len(body))
+                if method == 'PUT' and 'upload_id' in query:
+                    return self.upload_chunk(query['upload_id'], headers.get('content-range'), body)
+                if query.get('uploadType') == 'multipart':
+                    (meta_headers, metadata), (media_headers, content) = _multipart_parts(headers.get('content-type'), body)[:2]
+                    return _json(self.create_file(json.loads(metadata or b'{}'), content,
+                                                  media_headers.get('content-type', 'application/octet-stream')))
+                if query.get('uploadType') == 'resumable':
+                    size = int(headers.get('x-upload-content-length', 0))
+                    location = self.start_session(json.loads(body or b'{}'), size,
+                                                  headers.get('x-upload-content-type', 'application/octet-stream'))
+                    return 200, {'Location': location}, b''
+                raise ApiError(400, f"Unsupported uploadType: {query.get('uploadType')}")
+
+            if segments[:3] == ['drive', 'v3', 'changes']:
+                self.admit('changes', len(body))
+                if segments[3:] == ['startPageToken']:
+                    return _json(self.start_page_token())
+                return _json(self.list_changes(query['pageToken'], int(query.get('pageSize', 100))))
+
+            if segments[:3] == ['drive', 'v3', 'files']:
+                self.admit(f"files:{method}{':' + segments[4] if len(segments) > 4 else ''}", len(body))
+                if len(segments) == 3 and method == 'GET':
+                    return _json(self.list_files(query.get('q'), int(query.get('pageSize', 100)),
+                                                 query.get('pageToken')))
+                file_id = segments[3]
+                if len(segments) == 5 and segments[4] == 'copy' and method == 'POST':
+                    return _json(self.copy_file(file_id, json.loads(body or b'{}')))
+                if len(segments) == 5 and segments[4] == 'export' and method == 'GET':
+                    return 200, {'Content-Type': query.get('mimeType')}, self.export_file(file_id, query.get('mimeType'))
+                if method == 'GET':
+                    return _json(self.get_file(file_id))
+                if method == 'DELETE':
+                    self.delete_file(file_id)
+                    return 204, {}, b''
+
+            if segments[:2] == ['v1', 'documents'] and len(segments) == 3:
+                doc_id, _, action = segments[2].partition(':')
+                self.admit(f"documents:{action or 'get'}", len(body))
+                if method == 'GET' and not action:
+                    return _json(self.get_document(doc_id))
+                if method == 'POST' and action == 'batchUpdate':
+                    return _json(self.batch_update(doc_id, json.loads(body)))
+
+            raise ApiError(404, f'No such endpoint: {method} {path}', 'notFound')
+        except ApiError as e:
+            return e.response()
+
+    def _handle_batch(self, headers, body):
+        """Run each embedded request of a multipart/mixed batch and reply in kind."""
+        boundary = f'batch_{uuid.uuid4().hex}'
+        replies = []
+        for part_headers, content in _multipart_parts(headers.get('content-type'), body):
+            request_lines, request_body = _split_headers(content)
+            method, url = request_lines[0].split()[:2]
+            request_headers = {'authorization': headers.get('authorization')}
+            for line in request_lines[1:]:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    request_headers[name.strip().lower()] = value.strip()
+            status, _, reply = self.handle(method, url, request_headers, request_body)
+            content_id = part_headers.get('content-id', '').strip('<>')
+            replies.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} {"OK" if status < 400 else "Error"}\r\nContent-Type: application/json\r\n\r\n'
+                f'{reply.decode("utf-8")}\r\n'
+            )
+        payload = ''.join(replies) + f'--{boundary}--\r\n'
+        return 200, {'Content-Type': f'multipart/mixed; boundary={boundary}'}, payload.encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so connection reuse by the clients is measurable
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, reply_headers, reply = self.server.api.handle(self.command, self.path, headers, body)
+        self.send_response(status)
+        for name, value in reply_headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+def start_server(host='127.0.0.1', port=0, **options):
+    """
+    Start the fake API on a background thread.
+
+    Returns:
+        The HTTP server; its `api` attribute holds the FakeGoogleAPI state and
+        `api.base_url` the root URL to use as GOOGLE_DOCS_API_ROOT. Call
+        shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.api = FakeGoogleAPI(base_url=f'http://{host}:{server.server_port}/', **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Local fake Google Drive/Docs API for tests and benchmarks')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency, up to this many seconds')
+    parser.add_argument('--quota', type=float, help='Requests per second before throttling (default: unlimited)')
+    parser.add_argument('--burst', type=int, help='Requests allowed in a burst (default: one second of quota)')
+    parser.add_argument('--throttle-status', type=int, choices=(403, 429), default=429,
+                        help='Status for throttled requests: 429, or 403 userRateLimitExceeded (default: 429)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 503')
+    parser.add_argument('--seed', type=int, help='Random seed for jitter and error injection')
+
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, latency=args.latency, jitter=args.jitter, quota=args.quota,
+                          burst=args.burst, throttle_status=args.throttle_status, error_rate=args.error_rate,
+                          seed=args.seed)
+    print(f"✅ Fake Google API listening on {server.api.base_url}")
+    print(f"   export GOOGLE_DOCS_API_ROOT={server.api.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Copy files into and out of the Google Drive sync folder only when needed.
+
+Every byte written into the Drive folder makes Drive for Desktop upload the
+file again, so a copy is skipped when the destination already has the same
+contents. The check uses the hash and destination (mtime, size) recorded at
+the last copy where possible: files in the Drive folder may be cloud-only
+placeholders, and reading one just to hash it makes Drive download it.
+
+Copies go to a temporary file next to the destination, which then replaces
+it in one rename: Drive (and the watch command) never see a half-written
+file. The data is cloned (reflink) or copied inside the kernel
+(copy_file_range) where the filesystem supports it.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl: share the source's blocks (Btrfs, XFS, ...)
+HASH_CHUNK_SIZE = 1024 * 1024
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def content_hash(path):
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def file_stat(path):
+    """[mtime_ns, size] of a file (a list, so it compares equal after a JSON round trip), or None."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _copy_data(src, dst):
+    """Copy src's contents into the empty file dst, as cheaply as the filesystem allows."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass  # Not supported here, or across filesystems
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE):
+                    pass
+                return
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+    shutil.copyfile(src, dst)  # sendfile on Linux, fcopyfile on macOS
+
+
+def atomic_copy(src, dst):
+    """Copy src (with its timestamps) over dst through a temporary file and a single rename."""
+    dst = Path(dst)
+    fd, tmp_path = tempfile.mkstemp(dir=dst.parent, prefix=f'.{dst.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        _copy_data(src, tmp_path)
+        shutil.copystat(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def copy_if_changed(src, dst, synced_hash=None, synced_stat=None):
+    """
+    Copy src over dst unless dst already has the same contents.
+
+    Args:
+        synced_hash: content_hash() recorded at the last copy between these files
+        synced_stat: file_stat() of dst recorded at the same time
+
+    If dst is untouched since the recorded copy and src still has the recorded
+    hash, dst is not read at all. Otherwise dst is hashed only if its size
+    matches.
+
+    Returns:
+        (content_hash of src, whether dst was written)
+    """
+    src_hash = content_hash(src)
+    dst_stat = file_stat(dst)
+    if dst_stat is not None:
+        if synced_hash == src_hash and synced_stat == dst_stat:
+            return src_hash, False
+        if dst_stat[1] == os.stat(src).st_size and content_hash(dst) == src_hash:
+            return src_hash, False
+    atomic_copy(src, dst)
+    return src_hash, True
@@ -0,0 +1,158 @@
+"""
+Wait for changes to a fixed set of files.
+
+On Linux the kernel reports writes through inotify (called via ctypes, so no
+extra package is needed): nothing is read or scanned until a file is actually
+written. Elsewhere, including macOS, the files are polled with stat(); only the
+watched files are looked at, never whole folders, and nothing is read until
+their size or modification time changes.
+
+Example:
+    watcher = open_watcher([Path('a.html'), Path('b.html')])
+    for changed in debounced_changes(watcher):
+        print(changed)  # Set of paths written during one burst
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080  # Editors and Drive for Desktop save by renaming a temporary file
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+READ_SIZE = 64 * 1024
+
+POLL_INTERVAL = 0.5  # Seconds between stat() rounds when polling
+DEBOUNCE = 0.3  # Seconds without further writes that end a burst
+
+
+class InotifyWatcher:
+    """Watches the directories holding the files and reports writes to those files."""
+
+    def __init__(self, paths):
+        self.paths = {Path(p).absolute() for p in paths}
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._directories = {}
+        for directory in {p.parent for p in self.paths}:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory),
+                                              IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(errno, f'inotify_add_watch failed for {directory}')
+            self._directories[wd] = directory
+
+    def wait(self, timeout=None):
+        """
+        Block until some watched file is written, or until timeout seconds pass.
+
+        Returns:
+            Set of changed paths (empty on timeout)
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changed |= self.paths  # Events were lost: treat everything as changed
+                elif wd in self._directories and name:
+                    path = self._directories[wd] / os.fsdecode(name)
+                    if path in self.paths:
+                        changed.add(path)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Compares the size and modification time of the files every interval seconds."""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = {Path(p).absolute() for p in paths}
+        self.interval = interval
+        self._stats = {path: self._stat(path) for path in self.paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def wait(self, timeout=None):
+        """
+        Block until some watched file changes, or until timeout seconds pass.
+
+        Returns:
+            Set of changed paths (empty on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                stat = self._stat(path)
+                if stat != self._stats[path]:
+                    self._stats[path] = stat
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def open_watcher(paths, poll=False, interval=POLL_INTERVAL):
+    """An InotifyWatcher where the platform supports it, otherwise a PollingWatcher."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass  # No inotify in this libc, or out of watches
+    return PollingWatcher(paths, interval)
+
+
+def debounced_changes(watcher, debounce=DEBOUNCE):
+    """
+    Yield the set of paths changed in each burst of writes.
+
+    A burst ends once no watched file has been written for debounce seconds, so
+    a save that writes a file in several steps is reported once.
+    """
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
@@ -14,6 +14,9 @@ Usage:
     # Option 2: Upload with existing token
     python scripts/google-docs-api-upload.py upload file.html --token YOUR_TOKEN
     
+    # Large files (resumable; re-run the same command to continue an interrupted upload)
+    python scripts/google-docs-api-upload.py upload file.html --resumable
+    
     # Option 3: Use import URL (requires hosting file temporarily)
     python scripts/google-docs-api-upload.py upload-url file.html
 """
@@ -26,8 +29,129 @@ from pathlib import Path
 import webbrowser
 import urllib.parse
 
+from google_docs_client import DRIVE_ROOT, GOOGLE_DOCS_MIME_TYPE, get_session, print_call_timings
+import google_docs_store
+
 TOKEN_FILE = Path.home() / '.google-docs-access-token.txt'
 
+UPLOAD_URL = f"{DRIVE_ROOT}upload/drive/v3/files"
+READ_CHUNK_SIZE = 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 32 * 256 * 1024  # 8 MiB; must be a multiple of 256 KiB
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024  # Drive recommends resumable uploads above 5 MB
+
+
+class MultipartBody:
+    """
+    multipart/related request body (JSON metadata + file), streamed from disk.
+
+    The file is read in READ_CHUNK_SIZE chunks while the request is sent, so
+    memory use does not depend on its size. The length is known up front, so
+    the request is sent with a Content-Length rather than chunked encoding.
+    """
+    
+    def __init__(self, metadata, path, content_type,
+                 boundary='----WebKitFormBoundary7MA4YWxkTrZu0gW'):
+        self.path = Path(path)
+        self.content_type = f'multipart/related; boundary={boundary}'
+        self.head = (
+            f'--{boundary}\r\n'
+            f'Content-Type: application/json; charset=UTF-8\r\n\r\n'
+            f'{json.dumps(metadata)}\r\n'
+            f'--{boundary}\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        self.tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+    
+    def __len__(self):
+        return len(self.head) + self.path.stat().st_size + len(self.tail)
+    
+    def __iter__(self):
+        # A fresh generator per iteration, so a retried request resends the whole body
+        yield self.head
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield self.tail
+
+
+def uploaded_offset(session, session_uri, size):
+    """
+    Ask Drive how much of a resumable upload it has received.
+
+    Returns:
+        (offset, file resource) - the resource is set once the upload is complete;
+        (None, None) if the session has expired
+    """
+    response = session.put(session_uri, headers={'Content-Range': f'bytes */{size}'})
+    if response.status_code in (200, 201):
+        return size, response.json()
+    if response.status_code in (404, 410):
+        return None, None
+    if response.status_code != 308:
+        response.raise_for_status()
+    received = response.headers.get('Range')  # e.g. "bytes=0-1048575"; absent if nothing arrived
+    return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+
+
+def upload_resumable(session, html_path, metadata):
+    """
+    Upload a file with a resumable upload session, RESUMABLE_CHUNK_SIZE bytes per request.
+
+    The session URI is saved in the metadata store before any data is sent.
+    If the upload is interrupted, running it again for the same (unchanged)
+    file asks Drive for the last acknowledged byte and continues from there.
+
+    Returns:
+        The created file resource
+    """
+    stat = html_path.stat()
+    key = str(html_path.resolve())
+    store = google_docs_store.open_store()
+    saved = google_docs_store.get(store, 'upload_sessions', key)
+    
+    file_data = None
+    offset = None
+    if saved and saved['size'] == stat.st_size and saved['mtime'] == stat.st_mtime and saved['metadata'] == metadata:
+        offset, file_data = uploaded_offset(session, saved['session_uri'], stat.st_size)
+        if offset is not None:
+            session_uri = saved['session_uri']
+            print(f"Resuming upload at byte {offset:,} of {stat.st_size:,}")
+    
+    if offset is None:
+        response = session.post(f"{UPLOAD_URL}?uploadType=resumable&fields=id", json=metadata, headers={
+            'X-Upload-Content-Type': 'text/html',
+            'X-Upload-Content-Length': str(stat.st_size),
+        })
+        response.raise_for_status()
+        session_uri = response.headers['Location']
+        google_docs_store.put(store, 'upload_sessions', key, {
+            'session_uri': session_uri, 'size': stat.st_size, 'mtime': stat.st_mtime, 'metadata': metadata,
+        })
+        offset = 0
+    
+    with open(html_path, 'rb') as f:
+        while file_data is None:
+            f.seek(offset)
+            chunk = f.read(RESUMABLE_CHUNK_SIZE)
+            end = offset + len(chunk) - 1
+            response = session.put(session_uri, data=chunk, headers={
+                'Content-Range': f'bytes {offset}-{end}/{stat.st_size}' if chunk else f'bytes */{stat.st_size}',
+            })
+            if response.status_code in (200, 201):
+                file_data = response.json()
+            elif response.status_code == 308:
+                received = response.headers.get('Range')
+                offset = int(received.rsplit('-', 1)[1]) + 1 if received else 0
+                print(f"  {offset * 100 // stat.st_size}% uploaded")
+            else:
+                response.raise_for_status()
+    
+    google_docs_store.delete(store, 'upload_sessions', key)
+    return file_data
+
 
 def get_token_from_browser():
     """
@@ -58,94 +182,50 @@ def get_token_from_browser():
     print("="*60 + "\n")
 
 
-def upload_via_api(html_file_path, access_token, title=None):
-    """Upload HTML to Google Docs using Drive API."""
+def upload_via_api(html_file_path, access_token, title=None, session=None, resumable=None):
+    """
+    Upload HTML to Google Docs using Drive API (all calls share one pooled connection).
+
+    The file is streamed from disk rather than loaded into memory. Files above
+    RESUMABLE_THRESHOLD (or any file, with resumable=True) use a resumable
+    upload that survives interruptions.
+    """
     html_path = Path(html_file_path)
     if not html_path.exists():
         print(f"Error: HTML file not found: {html_path}")
         sys.exit(1)
     
     title = title or html_path.stem.replace('_', ' ').title()
+    if resumable is None:
+        resumable = html_path.stat().st_size > RESUMABLE_THRESHOLD
     
-    # Read HTML content
-    with open(html_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    
-    print(f"Uploading '{title}' to Google Drive...")
-    
-    # Step 1: Upload HTML file to Drive
-    upload_url = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart"
+    print(f"Uploading '{title}' to Google Docs...")
+    session = session or get_session(access_token)
     
+    # Upload as a Google Doc: Drive converts the HTML during the upload
     metadata = {
-        'name': f'{title}.html',
-        'mimeType': 'text/html'
-    }
-    
-    # Create multipart request
-    boundary = '----WebKitFormBoundary7MA4YWxkTrZu0gW'
-    body = (
-        f'--{boundary}\r\n'
-        f'Content-Disposition: form-data; name="metadata"\r\n'
-        f'Content-Type: application/json; charset=UTF-8\r\n\r\n'
-        f'{json.dumps(metadata)}\r\n'
-        f'--{boundary}\r\n'
-        f'Content-Disposition: form-data; name="file"; filename="{title}.html"\r\n'
-        f'Content-Type: text/html\r\n\r\n'
-        f'{html_content}\r\n'
-        f'--{boundary}--\r\n'
-    )
-    
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': f'multipart/related; boundary={boundary}',
-        'Content-Length': str(len(body.encode('utf-8')))
-    }
-    
-    try:
-        response = requests.post(upload_url, headers=headers, data=body.encode('utf-8'))
-        response.raise_for_status()
-        file_data = response.json()
-        file_id = file_data['id']
-        print(f"✓ File uploaded (ID: {file_id})")
-    except requests.exceptions.RequestException as e:
-        print(f"Error uploading file: {e}")
-        if hasattr(e.response, 'text'):
-            print(f"Response: {e.response.text}")
-        sys.exit(1)
-    
-    # Step 2: Convert to Google Docs format
-    print("Converting to Google Docs format...")
-    copy_url = f"https://www.googleapis.com/drive/v3/files/{file_id}/copy"
-    
-    copy_metadata = {
         'name': title,
-        'mimeType': 'application/vnd.google-apps.document'
-    }
-    
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
+        'mimeType': GOOGLE_DOCS_MIME_TYPE
     }
     
     try:
-        response = requests.post(copy_url, headers=headers, json=copy_metadata)
-        response.raise_for_status()
-        doc_data = response.json()
-        doc_id = doc_data['id']
+        if resumable:
+            doc_id = upload_resumable(session, html_path, metadata)['id']
+        else:
+            body = MultipartBody(metadata, html_path, 'text/html; charset=UTF-8')
+            response = session.post(f"{UPLOAD_URL}?uploadType=multipart&fields=id", data=body,
+                                    headers={'Content-Type': body.content_type})
+            response.raise_for_status()
+            doc_id = response.json()['id']
         print(f"✓ Google Doc created (ID: {doc_id})")
     except requests.exceptions.RequestException as e:
-        print(f"Error converting to Docs: {e}")
-        if hasattr(e.response, 'text'):
+        print(f"Error uploading file: {e}")
+        if e.response is not None:
             print(f"Response: {e.response.text}")
+        if resumable:
+            print("Run the same command again to resume the upload.")
         sys.exit(1)
     
-    # Step 3: Delete temporary HTML file
-    print("Cleaning up temporary file...")
-    delete_url = f"https://www.googleapis.com/drive/v3/files/{file_id}"
-    headers = {'Authorization': f'Bearer {access_token}'}
-    requests.delete(delete_url, headers=headers)
-    print("✓ Temporary file deleted")
-    
     # Return document URL
     doc_url = f"https://docs.google.com/document/d/{doc_id}/edit"
     
@@ -194,6 +274,11 @@ def main():
     upload_parser.add_argument('html_file', help='Path to HTML file')
     upload_parser.add_argument('--token', help='Access token (or use saved token)')
     upload_parser.add_argument('--title', help='Document title')
+    upload_parser.add_argument('--resumable', action='store_true', default=None,
+                               help='Use a resumable upload (default for files over 5 MB)')
+    upload_parser.add_argument('--multipart', action='store_false', dest='resumable',
+                               help='Use a single multipart request, whatever the file size')
+    upload_parser.add_argument('--timings', action='store_true', help='Print the duration of each API call')
     
     # Import URL command
     url_parser = subparsers.add_parser('upload-url', help='Get instructions for URL import')
@@ -221,7 +306,9 @@ def main():
             print(f"Or use --token YOUR_TOKEN")
             sys.exit(1)
         
-        upload_via_api(args.html_file, access_token, args.title)
+        upload_via_api(args.html_file, access_token, args.title, resumable=args.resumable)
+        if args.timings:
+            print_call_timings()
     
     elif args.command == 'upload-url':
         upload_via_import_url(args.html_file, args.title)
@@ -17,21 +17,24 @@ Usage:
     # List synced documents
     python scripts/google-docs-bidirectional-sync.py list
     
+    # Keep every uploaded document in sync both ways until Ctrl+C
+    python scripts/google-docs-bidirectional-sync.py watch
+    
     # Setup: Find and configure Google Drive folder
     python scripts/google-docs-bidirectional-sync.py setup
 """
 
 import sys
 import argparse
-import json
-import shutil
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import webbrowser
 
-# Configuration file
-CONFIG_FILE = Path.home() / '.google-docs-sync-config.json'
+from file_sync import atomic_copy, content_hash, copy_if_changed, file_stat
+from file_watcher import DEBOUNCE, POLL_INTERVAL, PollingWatcher, debounced_changes, open_watcher
+import google_docs_store
+
 SYNC_FOLDER_NAME = "AI Coding Docs"  # Folder name in Google Drive
 
 
@@ -85,7 +88,7 @@ def setup_google_drive():
         print(f"\n✓ Found Google Drive folder: {drive_folder}")
         use_this = input(f"\nUse this folder? (y/n): ").strip().lower()
         if use_this == 'y':
-            save_config({'drive_folder': str(drive_folder)})
+            google_docs_store.put(google_docs_store.open_store(), 'settings', 'drive_folder', str(drive_folder))
             print(f"✓ Configuration saved!")
             return drive_folder
     else:
@@ -99,7 +102,7 @@ def setup_google_drive():
     if path_input:
         drive_path = Path(path_input).expanduser()
         if drive_path.exists():
-            save_config({'drive_folder': str(drive_path)})
+            google_docs_store.put(google_docs_store.open_store(), 'settings', 'drive_folder', str(drive_path))
             print(f"✓ Configuration saved: {drive_path}")
             return drive_path
         else:
@@ -110,28 +113,15 @@ def setup_google_drive():
     return None
 
 
-def load_config():
-    """Load configuration from file."""
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    return {}
-
-
-def save_config(config):
-    """Save configuration to file."""
-    existing = load_config()
-    existing.update(config)
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(existing, f, indent=2)
+def save_document(store, title, fields):
+    """Merge fields into a document's metadata in one transaction, keeping fields written by others."""
+    google_docs_store.update(store, 'drive_sync', title, lambda doc_info: {**(doc_info or {}), **fields})
 
 
 def get_sync_folder(drive_path=None):
     """Get or create the sync folder in Google Drive."""
-    config = load_config()
-    
     if not drive_path:
-        drive_path = config.get('drive_folder')
+        drive_path = google_docs_store.get(google_docs_store.open_store(), 'settings', 'drive_folder')
         if drive_path:
             drive_path = Path(drive_path)
         else:
@@ -162,23 +152,32 @@ def upload_to_drive(html_file_path, drive_path=None, title=None):
     title = title or html_path.stem.replace('_', ' ').title()
     dest_file = sync_folder / f"{title}.html"
     
-    # Copy file
-    print(f"Copying to Google Drive: {dest_file.name}")
-    shutil.copy2(html_path, dest_file)
-    print(f"✓ File copied to: {dest_file}")
-    print(f"  (Syncing to Google Drive automatically...)")
+    store = google_docs_store.open_store()
+    doc_info = google_docs_store.get(store, 'drive_sync', title, {})
+    if doc_info.get('drive_file') != str(dest_file):
+        doc_info = {}
     
-    # Save metadata
-    config = load_config()
-    if 'documents' not in config:
-        config['documents'] = {}
+    # Copy file, unless Drive already has these contents (every write is re-uploaded)
+    file_hash, copied = copy_if_changed(html_path, dest_file, doc_info.get('content_hash'), doc_info.get('drive_stat'))
     
-    config['documents'][title] = {
-        'html_file': str(html_path),
+    # Save metadata
+    fields = {
+        'html_file': str(html_path.resolve()),
         'drive_file': str(dest_file),
-        'last_uploaded': datetime.now().isoformat()
+        'content_hash': file_hash,
+        'local_stat': file_stat(html_path),
+        'drive_stat': file_stat(dest_file),
     }
-    save_config(config)
+    if copied:
+        fields['last_uploaded'] = datetime.now().isoformat()
+    save_document(store, title, fields)
+    
+    if not copied:
+        print(f"✓ Unchanged, nothing copied: {dest_file}")
+        return dest_file
+    
+    print(f"✓ File copied to: {dest_file}")
+    print(f"  (Syncing to Google Drive automatically...)")
     
     # Instructions
     print("\n" + "="*60)
@@ -218,11 +217,13 @@ def download_from_drive(title, drive_path=None, output_path=None):
             print(f"  - {f.stem}")
         sys.exit(1)
     
+    store = google_docs_store.open_store()
+    doc_info = google_docs_store.get(store, 'drive_sync', title)
+    
     # Determine output path
     if not output_path:
-        config = load_config()
-        if 'documents' in config and title in config['documents']:
-            original_path = config['documents'][title].get('html_file')
+        if doc_info:
+            original_path = doc_info.get('html_file')
             if original_path and Path(original_path).parent.exists():
                 output_path = original_path
             else:
@@ -230,19 +231,29 @@ def download_from_drive(title, drive_path=None, output_path=None):
         else:
             output_path = f"downloaded_{title.replace(' ', '_')}.html"
     
-    output_path = Path(output_path)
+    output_path = Path(output_path).resolve()
     
-    # Copy file
-    print(f"Downloading from Google Drive: {html_file.name}")
-    shutil.copy2(html_file, output_path)
-    print(f"✓ File downloaded to: {output_path}")
+    # Copy file, unless the local file already has these contents
+    synced_hash = synced_stat = None
+    if doc_info and doc_info.get('html_file') == str(output_path):
+        synced_hash, synced_stat = doc_info.get('content_hash'), doc_info.get('local_stat')
+    file_hash, copied = copy_if_changed(html_file, output_path, synced_hash, synced_stat)
+    if copied:
+        print(f"✓ File downloaded to: {output_path}")
+    else:
+        print(f"✓ Unchanged, nothing copied: {output_path}")
     
     # Update metadata
-    config = load_config()
-    if 'documents' in config and title in config['documents']:
-        config['documents'][title]['last_downloaded'] = datetime.now().isoformat()
-        config['documents'][title]['html_file'] = str(output_path)
-        save_config(config)
+    if doc_info:
+        fields = {
+            'html_file': str(output_path),
+            'content_hash': file_hash,
+            'local_stat': file_stat(output_path),
+            'drive_stat': file_stat(html_file),
+        }
+        if copied:
+            fields['last_downloaded'] = datetime.now().isoformat()
+        save_document(store, title, fields)
     
     return output_path
 
@@ -261,10 +272,10 @@ def list_documents(drive_path=None):
     
     print(f"\nDocuments in sync folder ({len(html_files)}):\n")
     
-    config = load_config()
+    documents = google_docs_store.items(google_docs_store.open_store(), 'drive_sync')
     for html_file in sorted(html_files):
         title = html_file.stem
-        doc_info = config.get('documents', {}).get(title, {})
+        doc_info = documents.get(title, {})
         
         print(f"  {title}")
         print(f"    File: {html_file.name}")
@@ -278,6 +289,99 @@ def list_documents(drive_path=None):
     print(f"Google Drive: https://drive.google.com")
 
 
+def sync_document(title, doc_info):
+    """
+    Bring a local file and its Drive copy back in line after either changed.
+
+    The hash recorded at the last sync tells which side was edited: that side
+    is copied over the other. Files whose contents did not really change (a
+    touch, a save without edits, or the copy this function just made) are left
+    alone. If both sides were edited, neither is overwritten.
+
+    Returns:
+        Updated metadata for the document, or None if there is nothing to record
+    """
+    local_file, drive_file = Path(doc_info['html_file']), Path(doc_info['drive_file'])
+    synced_hash = doc_info.get('content_hash')
+    local_stat, drive_stat = file_stat(local_file), file_stat(drive_file)
+    if synced_hash and local_stat == doc_info.get('local_stat') and drive_stat == doc_info.get('drive_stat'):
+        return None  # Neither file touched since the last sync: nothing to read
+    local_hash, drive_hash = content_hash(local_file), content_hash(drive_file)
+
+    if local_hash is None or drive_hash is None:
+        missing = local_file if local_hash is None else drive_file
+        print(f"⚠️  Warning: {title}: {missing} is missing, not syncing")
+        return None
+    if local_hash == drive_hash:
+        updated = {**doc_info, 'content_hash': local_hash, 'local_stat': local_stat, 'drive_stat': drive_stat}
+        return updated if updated != doc_info else None
+
+    if synced_hash is None:
+        # Tracked before hashes were recorded: the newer file wins
+        local_newer = local_file.stat().st_mtime >= drive_file.stat().st_mtime
+    elif synced_hash == drive_hash:
+        local_newer = True
+    elif synced_hash == local_hash:
+        local_newer = False
+    else:
+        print(f"⚠️  Warning: {title}: changed both locally and in Drive, not syncing")
+        print(f"   Local: {local_file}")
+        print(f"   Drive: {drive_file}")
+        return None
+
+    now = datetime.now().isoformat()
+    if local_newer:
+        atomic_copy(local_file, drive_file)
+        print(f"✓ {title}: local → Drive")
+        doc_info = {**doc_info, 'content_hash': local_hash, 'last_uploaded': now}
+    else:
+        atomic_copy(drive_file, local_file)
+        print(f"✓ {title}: Drive → local")
+        doc_info = {**doc_info, 'content_hash': drive_hash, 'last_downloaded': now}
+    return {**doc_info, 'local_stat': file_stat(local_file), 'drive_stat': file_stat(drive_file)}
+
+
+def watch_documents(poll=False, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    """
+    Propagate edits between every uploaded document and its Drive copy until interrupted.
+
+    Only the files of documents tracked by `upload` are watched; restart the
+    watch after uploading a new document.
+    """
+    store = google_docs_store.open_store()
+    documents = google_docs_store.items(store, 'drive_sync')
+    if not documents:
+        print("No documents to watch. Upload one first:")
+        print("  python scripts/google-docs-bidirectional-sync.py upload file.html")
+        sys.exit(1)
+
+    titles = {}
+    for title, doc_info in documents.items():
+        for key in ('html_file', 'drive_file'):
+            titles[Path(doc_info[key]).absolute()] = title
+
+    def sync(changed_titles):
+        for title in sorted(changed_titles):
+            doc_info = sync_document(title, documents[title])
+            if doc_info:
+                documents[title] = doc_info
+                save_document(store, title, doc_info)
+
+    # Catch up on edits made while nothing was watching
+    sync(documents)
+
+    watcher = open_watcher(titles, poll=poll, interval=interval)
+    mode = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+    print(f"👀 Watching {len(documents)} document(s) ({mode}), Ctrl+C to stop")
+    try:
+        for changed in debounced_changes(watcher, debounce):
+            sync({titles[path] for path in changed})
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching")
+    finally:
+        watcher.close()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Bidirectional sync between local HTML and Google Docs via Google Drive',
@@ -300,6 +404,9 @@ Examples:
   # List all documents
   python scripts/google-docs-bidirectional-sync.py list
   
+  # Sync edits in either direction as they happen
+  python scripts/google-docs-bidirectional-sync.py watch
+  
   # Setup Google Drive folder
   python scripts/google-docs-bidirectional-sync.py setup
         """
@@ -326,6 +433,14 @@ Examples:
     list_parser = subparsers.add_parser('list', help='List documents in sync folder')
     list_parser.add_argument('--drive-path', help='Google Drive folder path (overrides config)')
     
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Sync edits in either direction as they happen')
+    watch_parser.add_argument('--poll', action='store_true', help='Poll for changes even where inotify is available')
+    watch_parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                              help=f'Seconds between polls (default: {POLL_INTERVAL})')
+    watch_parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                              help=f'Seconds of quiet that end a burst of writes (default: {DEBOUNCE})')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -343,6 +458,9 @@ Examples:
     
     elif args.command == 'list':
         list_documents(getattr(args, 'drive_path', None))
+    
+    elif args.command == 'watch':
+        watch_documents(args.poll, args.interval, args.debounce)
 
 
 if __name__ == '__main__':
@@ -3,7 +3,14 @@
 Google Docs Browser Automation Upload
 
 Uses browser automation to upload HTML to Google Docs via the web interface.
-No OAuth setup required - uses your existing browser session.
+No OAuth setup required - uses your Google login in the browser.
+
+The login is saved (as a Playwright storage state) after a successful run or
+with --login, and reused by later runs: --headless uploads without a window.
+All files share one browser and one context; each is imported in its own
+page, up to --jobs at once, so a batch takes about as long as its slowest
+import. Every step waits for the page event or element it needs rather than
+for a fixed time.
 
 Requirements:
     pip install playwright
@@ -11,114 +18,199 @@ Requirements:
 
 Usage:
     python scripts/google-docs-browser-upload.py [html_file] [--title "Title"]
+    python scripts/google-docs-browser-upload.py --login
+    python scripts/google-docs-browser-upload.py docs/learning/*.html --headless --jobs 8
 """
 
 import sys
+import os
+import json
+import re
+import asyncio
 import argparse
 import time
 from pathlib import Path
 
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 except ImportError:
     print("Error: Playwright not installed.")
     print("Install with: pip3 install playwright && playwright install chromium")
     sys.exit(1)
 
+DOCS_URL = "https://docs.google.com"
+LOGIN_HOST = "accounts.google.com"
+DOCUMENT_URL = re.compile(r'/document/d/([a-zA-Z0-9_-]+)')
+EDITOR = '[contenteditable="true"], [role="textbox"]'
+STORAGE_STATE = Path.home() / '.google-docs-browser-state.json'  # Login cookies: keep private
 
-def upload_via_browser(html_file_path, title=None):
-    """Upload HTML file to Google Docs using browser automation."""
-    html_path = Path(html_file_path)
-    if not html_path.exists():
-        print(f"Error: HTML file not found: {html_path}")
-        sys.exit(1)
-    
-    abs_path = html_path.resolve()
-    title = title or html_path.stem.replace('_', ' ').title()
-    
-    print(f"Uploading '{title}' to Google Docs...")
-    print("This will open a browser window. Please ensure you're logged into Google.")
-    print()
-    
-    with sync_playwright() as p:
-        # Launch browser (visible so user can see what's happening)
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        
+DEFAULT_JOBS = 4  # Pages importing at once
+MENU_TIMEOUT = 5  # Seconds to wait for a menu item before falling back to the keyboard
+IMPORT_TIMEOUT = 60  # Seconds to wait for Google Docs to convert a file
+
+
+class LoginRequired(Exception):
+    """The saved login is missing or has expired."""
+
+
+async def save_login(context):
+    """Write the context's storage state (cookies) where only the user can read it."""
+    state = await context.storage_state()
+    fd = os.open(STORAGE_STATE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+
+
+async def new_context(browser):
+    """One context for every page, logged in from the saved storage state when there is one."""
+    if STORAGE_STATE.exists():
+        return await browser.new_context(storage_state=str(STORAGE_STATE))
+    return await browser.new_context()
+
+
+async def wait_for_login(context):
+    """If Google asks for a login, wait (without a time limit) for the user to log in."""
+    page = await context.new_page()
+    try:
+        await page.goto(DOCS_URL, wait_until="domcontentloaded")
+        if LOGIN_HOST in page.url:
+            print("Log in to Google in the browser window...")
+            # Docs redirects back to its home page once logged in
+            await page.wait_for_url(lambda url: url.startswith(DOCS_URL), timeout=0)
+    finally:
+        await page.close()
+
+
+async def open_import_dialog(page):
+    """Open File > Import; each step waits for its element, with keyboard fallbacks."""
+    file_menu = page.locator("button:has-text('File')").or_(
+        page.locator("[aria-label*='File'], [aria-label*='file']")
+    ).first
+    try:
+        await file_menu.click(timeout=MENU_TIMEOUT * 1000)
+    except PlaywrightTimeout:
+        await page.keyboard.press("Alt+F")
+
+    import_option = page.locator("text=Import").or_(page.locator("text=Upload")).first
+    try:
+        await import_option.click(timeout=MENU_TIMEOUT * 1000)
+    except PlaywrightTimeout:
+        await page.keyboard.press("ArrowDown")
+        await page.keyboard.press("Enter")
+
+
+async def import_file(context, html_path, timeout):
+    """
+    Import one HTML file in a new page of the shared context.
+
+    Returns:
+        (page, document ID)
+    """
+    page = await context.new_page()
+    await page.goto(DOCS_URL, wait_until="domcontentloaded")
+    if LOGIN_HOST in page.url:
+        await page.close()
+        raise LoginRequired()
+
+    await open_import_dialog(page)
+
+    # The upload dialog is either in the page or in the file picker's frame;
+    # set_input_files waits for whichever appears first
+    file_input = page.locator('input[type="file"]').or_(
+        page.frame_locator('iframe[src*="picker"]').locator('input[type="file"]')
+    ).first
+    await file_input.set_input_files(str(html_path), timeout=timeout * 1000)
+
+    # The converted document opens in this page
+    await page.wait_for_url(DOCUMENT_URL, timeout=timeout * 1000)
+    await page.locator(EDITOR).first.wait_for(timeout=timeout * 1000)
+    return page, DOCUMENT_URL.search(page.url).group(1)
+
+
+async def upload_one(context, semaphore, html_path, title, timeout, keep_open):
+    """Upload one file, reporting its outcome. Returns the document ID, or None on failure."""
+    async with semaphore:
+        start = time.monotonic()
+        page = None
         try:
-            # Navigate to Google Docs
-            print("Opening Google Docs...")
-            page.goto("https://docs.google.com", wait_until="networkidle")
-            time.sleep(2)  # Give page time to load
-            
-            # Click File menu
-            print("Clicking File menu...")
-            try:
-                # Try to find the File menu button
-                file_button = page.locator("button:has-text('File')").first
-                if not file_button.is_visible(timeout=5000):
-                    # Alternative: look for menu button
-                    file_button = page.locator("[aria-label*='File'], [aria-label*='file']").first
-                file_button.click(timeout=10000)
-            except PlaywrightTimeout:
-                print("Could not find File menu. Trying alternative approach...")
-                # Try keyboard shortcut
-                page.keyboard.press("Alt+F")
-                time.sleep(1)
-            
-            # Wait for menu to appear and click Import
-            print("Clicking Import...")
-            time.sleep(1)
-            try:
-                import_option = page.locator("text=Import, text=Upload").first
-                import_option.click(timeout=5000)
-            except PlaywrightTimeout:
-                # Try keyboard navigation
-                page.keyboard.press("ArrowDown")
-                page.keyboard.press("Enter")
-                time.sleep(1)
-            
-            # Wait for upload dialog
-            print("Waiting for upload dialog...")
-            time.sleep(2)
-            
-            # Set file input
-            print(f"Selecting file: {abs_path}")
-            file_input = page.locator('input[type="file"]').first
-            file_input.set_input_files(str(abs_path))
-            
-            print("File selected. Waiting for upload to complete...")
-            
-            # Wait for document to load (look for editor or document title)
-            try:
-                # Wait for the document editor to appear
-                page.wait_for_selector('[contenteditable="true"], [role="textbox"]', timeout=30000)
-                print("✓ Document uploaded and converted!")
-            except PlaywrightTimeout:
-                print("Upload may have completed, but couldn't detect document editor.")
-            
-            # Get the document URL
-            current_url = page.url
-            if 'document/d/' in current_url:
-                doc_id = current_url.split('document/d/')[1].split('/')[0]
-                doc_url = f"https://docs.google.com/document/d/{doc_id}/edit"
-                print(f"\n✓ Document created!")
-                print(f"  URL: {doc_url}")
-                print(f"  ID: {doc_id}")
-                print(f"\nYou can now edit the document in Google Docs.")
-                print("Press Enter to close the browser, or close it manually.")
-                input()
-            else:
-                print(f"\nDocument URL: {current_url}")
-                print("Please check the browser window for the document.")
-            
+            page, doc_id = await import_file(context, html_path, timeout)
+        except LoginRequired:
+            print(f"Error: {html_path.name}: not logged in to Google")
+            return None
+        except PlaywrightTimeout:
+            print(f"Error: {html_path.name}: Google Docs did not open the imported document "
+                  f"within {timeout}s")
+            return None
         except Exception as e:
-            print(f"\nError during upload: {e}")
-            print("Please check the browser window and try manual upload if needed.")
-            input("Press Enter to close...")
+            print(f"Error: {html_path.name}: {e}")
+            return None
         finally:
-            browser.close()
+            if page is not None and not keep_open:
+                await page.close()
+
+        print(f"✓ {title} ({time.monotonic() - start:.1f}s)")
+        print(f"  URL: https://docs.google.com/document/d/{doc_id}/edit")
+        print(f"  ID: {doc_id}")
+        return doc_id
+
+
+async def upload_via_browser(html_paths, titles, headless=False, jobs=DEFAULT_JOBS, timeout=IMPORT_TIMEOUT):
+    """
+    Upload HTML files to Google Docs using browser automation.
+
+    With a window (the default) the documents stay open for editing and the
+    browser stays open until it is closed.
+
+    Returns:
+        Number of files that failed
+    """
+    if headless and not STORAGE_STATE.exists():
+        print("Error: No saved Google login for headless uploads.")
+        print("Log in once with: python scripts/google-docs-browser-upload.py --login")
+        return len(html_paths)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await new_context(browser)
+        semaphore = asyncio.Semaphore(jobs)
+        try:
+            if not headless:
+                await wait_for_login(context)
+            start = time.monotonic()
+            results = await asyncio.gather(*(
+                upload_one(context, semaphore, path, title, timeout, keep_open=not headless)
+                for path, title in zip(html_paths, titles)
+            ))
+            failed = results.count(None)
+            if len(html_paths) > 1:
+                print(f"\n{len(html_paths) - failed} of {len(html_paths)} uploaded "
+                      f"in {time.monotonic() - start:.1f}s")
+
+            if failed < len(html_paths):
+                await save_login(context)  # Refreshed cookies for the next run
+            elif headless:
+                print("The saved login may have expired. Log in again with --login.")
+
+            if not headless:
+                print("\nClose the browser window when you are done.")
+                await context.wait_for_event("close", timeout=0)
+            return failed
+        finally:
+            if browser.is_connected():
+                await browser.close()
+
+
+async def login():
+    """Open a browser for the user to log in to Google, then save the login."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=False)
+        context = await new_context(browser)
+        try:
+            await wait_for_login(context)
+            await save_login(context)
+            print(f"✓ Login saved to {STORAGE_STATE}")
+        finally:
+            await browser.close()
 
 
 def main():
@@ -126,20 +218,66 @@ def main():
         description='Upload HTML to Google Docs via browser automation (no OAuth required)'
     )
     parser.add_argument(
-        'html_file',
-        nargs='?',
-        default='docs/learning/A_WEEK_WITH_AI_CODING.html',
-        help='Path to HTML file'
+        'html_files',
+        nargs='*',
+        default=['docs/learning/A_WEEK_WITH_AI_CODING.html'],
+        help='Paths to HTML files'
     )
     parser.add_argument(
         '--title',
-        help='Title for the document (default: derived from filename)'
+        help='Title for the document (default: derived from filename; single file only)'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Upload without a browser window, using the saved login'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Files imported at once, each in its own page (default: {DEFAULT_JOBS})'
     )
-    
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=IMPORT_TIMEOUT,
+        help=f'Seconds to wait for each import (default: {IMPORT_TIMEOUT})'
+    )
+    parser.add_argument(
+        '--login',
+        action='store_true',
+        help=f'Log in to Google in a browser window and save the login to {STORAGE_STATE}'
+    )
+
     args = parser.parse_args()
-    upload_via_browser(args.html_file, args.title)
+
+    if args.login:
+        asyncio.run(login())
+        return
+
+    if args.title and len(args.html_files) > 1:
+        parser.error('--title can only be used with a single file')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    html_paths = []
+    for html_file in args.html_files:
+        html_path = Path(html_file)
+        if not html_path.exists():
+            print(f"Error: HTML file not found: {html_path}")
+            sys.exit(1)
+        html_paths.append(html_path.resolve())
+    titles = [args.title or path.stem.replace('_', ' ').title() for path in html_paths]
+
+    print(f"Uploading {len(html_paths)} file(s) to Google Docs...")
+    if not args.headless:
+        print("This will open a browser window. Log in to Google there if asked.")
+    print()
+
+    failed = asyncio.run(upload_via_browser(html_paths, titles, args.headless, args.jobs, args.timeout))
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == '__main__':
     main()
-
@@ -13,7 +13,8 @@ import sys
 import argparse
 import subprocess
 from pathlib import Path
-import shutil
+
+from file_sync import copy_if_changed
 
 # Common Google Drive locations
 DRIVE_PATHS = [
@@ -95,9 +96,11 @@ def sync_to_drive(html_file_path, drive_path=None, title=None):
     
     dest_file = docs_folder / f"{title}.html"
     
-    # Copy file
-    print(f"Copying to Google Drive: {dest_file}")
-    shutil.copy2(html_path, dest_file)
+    # Copy file, unless Drive already has these contents (every write is re-uploaded)
+    _, copied = copy_if_changed(html_path, dest_file)
+    if not copied:
+        print(f"✓ Unchanged, nothing copied: {dest_file}")
+        return dest_file
     print(f"✓ File copied to Google Drive")
     print(f"  Local: {dest_file}")
     print(f"  (Will sync to Google Drive automatically)")
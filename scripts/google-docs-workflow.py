@@ -9,209 +9,318 @@ Usage:
     # Upload HTML to Google Docs (creates or updates)
     python scripts/google-docs-workflow.py upload [html_file] [--title "Title"] [--doc-id "existing_doc_id"]
     
-    # Download Google Doc back to HTML
-    python scripts/google-docs-workflow.py download [doc_id] [--output html_file]
+    # Download Google Docs back to HTML (unchanged docs are skipped)
+    python scripts/google-docs-workflow.py download [doc_id ...] [--output html_file] [--zip] [--force]
     
-    # List your Google Docs
-    python scripts/google-docs-workflow.py list [--search "query"]
+    # List your Google Docs (answered from a local index; --refresh applies changes from Drive)
+    python scripts/google-docs-workflow.py list [--search "query"] [--refresh | --rebuild]
     
     # Get document info
-    python scripts/google-docs-workflow.py info [doc_id]
+    python scripts/google-docs-workflow.py info [doc_id] [--refresh | --rebuild]
+    
+    # Upload every tracked document whose HTML changed since its last upload
+    python scripts/google-docs-workflow.py sync [--dry-run] [--force] [--jobs N]
+    
+    # Upload many HTML files concurrently
+    python scripts/google-docs-workflow.py bulk file1.html file2.html ... [--jobs N] [--rate R]
+    
+    # Delete temporary .html files left in Drive by interrupted older uploads
+    python scripts/google-docs-workflow.py cleanup [--dry-run]
+
+Commands that only read local state (list and info answered from the index,
+sync --dry-run) never import the Google client libraries; modules only some
+commands need are imported by those commands.
 """
 
 import os
 import sys
 import argparse
-import json
+import hashlib
+import threading
+import time
 from pathlib import Path
 
-try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
-    import io
-    import pickle
-except ImportError:
-    print("Error: Required packages not installed.")
-    print("Install with: pip3 install google-api-python-client google-auth-httplib2 google-auth-oauthlib --user")
-    sys.exit(1)
-
-# Scopes required for Google Drive and Docs API
-SCOPES = [
-    'https://www.googleapis.com/auth/drive.file',
-    'https://www.googleapis.com/auth/documents.readonly'
-]
-
-# Storage locations
-TOKEN_FILE = Path.home() / '.google-docs-token.pickle'
-CREDENTIALS_FILE = Path.home() / '.google-docs-credentials.json'
-WORKFLOW_CONFIG = Path.home() / '.google-docs-workflow.json'
-
-
-def get_credentials():
-    """Get valid user credentials from storage or OAuth flow."""
-    creds = None
-    
-    # Load existing token if available
-    if TOKEN_FILE.exists():
-        with open(TOKEN_FILE, 'rb') as token:
-            creds = pickle.load(token)
-    
-    # If there are no (valid) credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not CREDENTIALS_FILE.exists():
-                print("\n" + "="*60)
-                print("Google OAuth Credentials Setup Required")
-                print("="*60)
-                print("\nStep 1: Go to https://console.cloud.google.com/")
-                print("Step 2: Create a new project (or select existing)")
-                print("Step 3: Enable APIs:")
-                print("   - Go to 'APIs & Services' → 'Library'")
-                print("   - Search for and enable 'Google Drive API'")
-                print("   - Search for and enable 'Google Docs API'")
-                print("Step 4: Create OAuth 2.0 credentials:")
-                print("   - Go to 'APIs & Services' → 'Credentials'")
-                print("   - Click '+ CREATE CREDENTIALS' → 'OAuth client ID'")
-                print("   - Application type: 'Desktop app'")
-                print("   - Name: 'Google Docs Workflow' (or any name)")
-                print("   - Click 'CREATE'")
-                print("Step 5: Download credentials:")
-                print("   - Click the download icon (⬇) next to your OAuth client")
-                print(f"   - Save the JSON file as: {CREDENTIALS_FILE}")
-                print("\nOnce you've saved the credentials file, run this script again.")
-                print("="*60 + "\n")
-                sys.exit(1)
-            
-            print("\nOpening browser for Google authentication...")
-            print("Please sign in and grant permissions.\n")
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(CREDENTIALS_FILE), SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        # Save credentials for next run
-        with open(TOKEN_FILE, 'wb') as token:
-            pickle.dump(creds, token)
-        print("✓ Credentials saved for future use\n")
-    
-    return creds
+from google_docs_client import (DRIVE_HOST, build_service, delete_files, get_credentials, import_html, print_call_timings,
+                                set_rate_limit, thread_retries)
+import google_docs_index
+import google_docs_store
 
+# Export formats: zip keeps images as separate files instead of inlining them
+EXPORT_FORMATS = {
+    'html': 'text/html',
+    'zip': 'application/zip',
+}
 
-def load_workflow_config():
-    """Load workflow configuration (document IDs, etc.)"""
-    if WORKFLOW_CONFIG.exists():
-        with open(WORKFLOW_CONFIG, 'r') as f:
-            return json.load(f)
-    return {}
+DEFAULT_JOBS = 4
 
+_thread = threading.local()
 
-def save_workflow_config(config):
-    """Save workflow configuration"""
-    with open(WORKFLOW_CONFIG, 'w') as f:
-        json.dump(config, f, indent=2)
 
+def content_hash(html_path):
+    """SHA-256 of an HTML file, recorded in the metadata store to skip unchanged uploads."""
+    with open(html_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
-def upload_to_google_docs(service, html_content, title, doc_id=None):
-    """Upload HTML to Google Docs, creating new or updating existing."""
-    if doc_id:
-        # Update existing document
-        print(f"Updating existing document: {doc_id}")
-        # For updates, we need to use Docs API to replace content
-        # For now, we'll create a new version and delete the old one
-        # (Google Docs API doesn't support direct HTML import for updates)
-        print("Note: Google Docs API doesn't support direct HTML updates.")
-        print("Creating new version...")
-        doc_id = None  # Fall through to create new
-    
-    # Create new document
-    html_file = io.BytesIO(html_content.encode('utf-8'))
-    media = MediaIoBaseUpload(
-        html_file,
-        mimetype='text/html',
-        resumable=True
-    )
-    
-    file_metadata = {
-        'name': f'{title}.html',
-        'mimeType': 'text/html'
+
+def connect():
+    """Authenticate and build the Drive and Docs services."""
+    print("Authenticating with Google...")
+    creds = get_credentials()
+    # Discovery documents are cached locally and the connection is kept alive
+    return build_service('drive', 'v3', creds), build_service('docs', 'v1', creds)
+
+
+def thread_services(creds):
+    """Drive and Docs services of the current worker thread (each has its own connection)."""
+    if getattr(_thread, 'services', None) is None:
+        _thread.services = (build_service('drive', 'v3', creds), build_service('docs', 'v1', creds))
+    return _thread.services
+
+
+def remote_modified_time(service, doc_id):
+    """Last modification time of a document in Drive."""
+    return service.files().get(fileId=doc_id, fields='modifiedTime').execute().get('modifiedTime')
+
+
+def publish_document(drive_service, docs_service, title, html_path, doc_id=None, log=print):
+    """
+    Upload one HTML file (in place if doc_id is given).
+
+    Returns:
+        Metadata store entry for the document
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    
+    doc_id, modified_time = upload_to_google_docs(drive_service, html_content, title, doc_id, docs_service, log)
+    return {
+        'doc_id': doc_id,
+        'html_file': str(html_path),
+        'url': f"https://docs.google.com/document/d/{doc_id}/edit",
+        'content_hash': content_hash(html_path),  # Of the bytes on disk, as pending_upload() compares
+        'modified_time': modified_time or remote_modified_time(drive_service, doc_id),
     }
+
+
+def pending_upload(documents, title, html_path, force=False):
+    """
+    The upload needed to publish html_path as title, or None if it is unchanged.
+
+    documents holds the tracked documents by title (google_docs_store.items(store, 'workflow')).
+
+    Returns:
+        (title, html_path, doc_id, recorded modified_time) tuple
+    """
+    tracked = documents.get(title, {})
+    if not force and tracked.get('content_hash') == content_hash(html_path):
+        return None
+    return title, Path(html_path), tracked.get('doc_id'), tracked.get('modified_time')
+
+
+def upload_documents(store, uploads, jobs=DEFAULT_JOBS, force=False):
+    """
+    Run uploads concurrently, recording each in the metadata store as it finishes.
+
+    Each worker thread has its own connection; all of them share the per-host
+    token buckets in google_docs_client, so adding workers raises throughput
+    until the API quota is the limit instead of triggering quota errors.
+    Rate-limit and server errors are retried with jittered backoff.
+
+    A tracked document that was edited in Google Docs since its last upload
+    (its modifiedTime moved) is skipped unless force is set.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     
-    print(f"Uploading '{title}' to Google Drive...")
-    file = service.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields='id'
-    ).execute()
+    creds = get_credentials()
     
-    temp_file_id = file.get('id')
-    print(f"✓ Temporary file uploaded (ID: {temp_file_id})")
+    def upload(title, html_path, doc_id, recorded_modified_time):
+        start = time.perf_counter()
+        retries = thread_retries()
+        try:
+            drive_service, docs_service = thread_services(creds)
+            if (doc_id and recorded_modified_time and not force
+                    and remote_modified_time(drive_service, doc_id) != recorded_modified_time):
+                status, entry = 'edited in Google Docs, skipped (download it first or use --force)', None
+            else:
+                entry = publish_document(drive_service, docs_service, title, html_path, doc_id,
+                                         log=lambda *args, **kwargs: None)
+                status = 'updated' if doc_id else 'created'
+        except Exception as e:
+            status, entry = f'failed: {e}', None
+        return title, entry, status, time.perf_counter() - start, thread_retries() - retries
+    
+    print(f"Uploading {len(uploads)} document(s) with {jobs} worker(s)...\n")
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(upload, *item) for item in uploads]
+        for future in as_completed(futures):
+            title, entry, status, seconds, retries = future.result()
+            results.append((title, entry, status, seconds, retries))
+            if entry:
+                google_docs_store.put(store, 'workflow', title, entry)  # Kept even if a later upload fails
+            mark = '✓' if entry else '❌'
+            print(f"  {mark} {title}: {status} in {seconds:.2f}s ({retries} retries)")
+    elapsed = time.perf_counter() - start
+    
+    uploaded = [r for r in results if r[1]]
+    print(f"\n{len(uploaded)}/{len(uploads)} uploaded in {elapsed:.1f}s "
+          f"({len(uploaded) / elapsed:.2f} documents/s, {sum(r[4] for r in results)} retries)")
+    if uploaded:
+        latencies = sorted(r[3] for r in uploaded)
+        print(f"Per-document latency: median {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s")
+    return len(uploaded) == len(uploads)
+
+
+def sync_documents(store, force=False, dry_run=False, jobs=DEFAULT_JOBS):
+    """
+    Upload every tracked document whose HTML changed since its last upload.
+
+    Changes are detected from the content hashes in the metadata store, so
+    nothing touches the network unless at least one document changed.
+    """
+    documents = google_docs_store.items(store, 'workflow')
+    uploads = []
+    for title, entry in documents.items():
+        html_path = Path(entry['html_file'])
+        if not html_path.exists():
+            print(f"⚠️  Warning: HTML file not found for '{title}': {html_path}")
+            continue
+        upload = pending_upload(documents, title, html_path, force)
+        if upload is None:
+            print(f"  Up to date: {title}")
+            continue
+        uploads.append(upload)
+    
+    if not uploads:
+        print(f"\n✓ All {len(documents)} tracked document(s) up to date, nothing uploaded")
+        return True
+    if dry_run:
+        print(f"\nWould upload {len(uploads)} document(s):")
+        for title, html_path, _, _ in uploads:
+            print(f"  {title} ({html_path})")
+        return True
+    
+    print()
+    return upload_documents(store, uploads, jobs, force)
+
+
+def upload_to_google_docs(service, html_content, title, doc_id=None, docs_service=None, log=print):
+    """
+    Upload HTML to Google Docs, creating new or updating existing.
+
+    Returns:
+        (doc_id, modifiedTime) tuple; modifiedTime is None after an update
+    """
+    if doc_id:
+        # Update existing document in place (same ID and URL)
+        log(f"Updating existing document: {doc_id}")
+        from google_docs_update import update_document
+        changes = update_document(docs_service, doc_id, html_content)
+        if changes:
+            log(f"✓ Document updated ({changes} changes in one batch)")
+        else:
+            log("✓ Document already up to date")
+        return doc_id, None
     
-    # Convert to Google Docs format
-    print("Converting to Google Docs format...")
-    doc_file = service.files().copy(
-        fileId=temp_file_id,
-        body={
-            'name': title,
-            'mimeType': 'application/vnd.google-apps.document'
-        }
-    ).execute()
+    # Create new document (converted during the upload, one request)
+    log(f"Uploading '{title}' to Google Docs...")
+    doc_file = import_html(service, html_content, title)
+    log(f"✓ Google Doc created (ID: {doc_file['id']})")
     
-    new_doc_id = doc_file.get('id')
-    print(f"✓ Google Doc created (ID: {new_doc_id})")
+    return doc_file['id'], doc_file.get('modifiedTime')
+
+
+def cleanup_temporary_files(service, dry_run=False):
+    """
+    Delete temporary .html files left in Drive by older versions of the upload scripts.
+
+    These used to upload HTML, copy it to a Google Doc and delete the HTML, so a
+    run interrupted between the steps left the .html file behind.
+    """
+    query = "mimeType='text/html' and name contains '.html' and trashed=false"
+    files, page_token = [], None
+    while True:
+        results = service.files().list(q=query, fields="nextPageToken, files(id, name)",
+                                       pageSize=100, pageToken=page_token).execute()
+        files += results.get('files', [])
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
     
-    # Delete temporary HTML file
-    service.files().delete(fileId=temp_file_id).execute()
-    print("✓ Temporary file deleted")
+    if not files:
+        print("✓ No temporary files found")
+        return
+    for file in files:
+        print(f"  {file['name']} ({file['id']})")
+    if dry_run:
+        print(f"\nWould delete {len(files)} temporary file(s)")
+        return
     
-    return new_doc_id
+    failed = delete_files(service, [file['id'] for file in files])
+    for file_id, error in failed.items():
+        print(f"❌ Could not delete {file_id}: {error}")
+    print(f"\n✓ Deleted {len(files) - len(failed)} temporary file(s)")
 
 
-def download_from_google_docs(service, doc_id, output_path):
-    """Download Google Doc as HTML."""
-    print(f"Downloading document {doc_id}...")
+def download_from_google_docs(service, store, doc_id, output_path, export_format='html', force=False):
+    """
+    Download a Google Doc as HTML (or a zip of HTML plus image files).
+
+    One metadata call decides whether anything changed: if the document's
+    modifiedTime and version match the last download to the same path, the
+    export is skipped. Otherwise the export is streamed to a temporary file
+    next to output_path and renamed over it, so readers never see a partial file.
+
+    Returns:
+        True if the document was downloaded, False if the local copy was current
+    """
+    output_path = Path(output_path)
+    key = f"{doc_id}:{export_format}"
+    remote = service.files().get(fileId=doc_id, fields='modifiedTime, version').execute()
+    local = google_docs_store.get(store, 'downloads', key, {})
+    if (not force and output_path.exists() and local.get('output') == str(output_path.resolve())
+            and local.get('modified_time') == remote.get('modifiedTime')
+            and local.get('version') == remote.get('version')):
+        print(f"  Up to date: {output_path} (not modified since {remote.get('modifiedTime')})")
+        return False
+    
+    import tempfile
+    from googleapiclient.http import MediaIoBaseDownload  # Available once connect() has succeeded
     
-    # Export as HTML
+    print(f"Downloading document {doc_id}...")
     request = service.files().export_media(
         fileId=doc_id,
-        mimeType='text/html'
+        mimeType=EXPORT_FORMATS[export_format]
     )
     
-    fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request)
-    done = False
-    while done is False:
-        status, done = downloader.next_chunk()
-        if status:
-            print(f"  Download progress: {int(status.progress() * 100)}%")
-    
-    fh.seek(0)
-    html_content = fh.read().decode('utf-8')
-    
-    # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, prefix=f'.{output_path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            downloader = MediaIoBaseDownload(fh, request)
+            done = False
+            while done is False:
+                status, done = downloader.next_chunk()
+                if status:
+                    print(f"  Download progress: {int(status.progress() * 100)}%")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    google_docs_store.put(store, 'downloads', key, {
+        'output': str(output_path.resolve()),
+        'modified_time': remote.get('modifiedTime'),
+        'version': remote.get('version'),
+    })
     print(f"✓ Document downloaded to: {output_path}")
-    return html_content
+    return True
 
 
-def list_documents(service, search_query=None):
-    """List Google Docs."""
-    query = "mimeType='application/vnd.google-apps.document'"
-    if search_query:
-        query += f" and name contains '{search_query}'"
-    
-    results = service.files().list(
-        q=query,
-        pageSize=20,
-        fields="files(id, name, modifiedTime)"
-    ).execute()
-    
-    files = results.get('files', [])
+def list_documents(conn, search_query=None):
+    """List Google Docs from the local metadata index."""
+    files = google_docs_index.search(conn, search_query)
     
     if not files:
         print("No documents found.")
@@ -221,7 +330,7 @@ def list_documents(service, search_query=None):
     for file in files:
         doc_id = file['id']
         name = file['name']
-        modified = file.get('modifiedTime', 'Unknown')
+        modified = file['modified_time'] or 'Unknown'
         url = f"https://docs.google.com/document/d/{doc_id}/edit"
         print(f"  {name}")
         print(f"    ID: {doc_id}")
@@ -229,22 +338,26 @@ def list_documents(service, search_query=None):
         print(f"    URL: {url}\n")
 
 
-def get_document_info(service, doc_id):
-    """Get information about a document."""
-    try:
-        file = service.files().get(
-            fileId=doc_id,
-            fields="id, name, createdTime, modifiedTime, webViewLink"
-        ).execute()
-        
-        print(f"\nDocument: {file['name']}")
-        print(f"  ID: {file['id']}")
-        print(f"  Created: {file.get('createdTime', 'Unknown')}")
-        print(f"  Modified: {file.get('modifiedTime', 'Unknown')}")
-        print(f"  URL: {file.get('webViewLink', 'N/A')}\n")
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+def get_document_info(conn, doc_id, service=None):
+    """Get information about a document (from the index, or from Drive if a service is given)."""
+    if service is not None:
+        try:
+            file = service.files().get(
+                fileId=doc_id,
+                fields=google_docs_index.FILE_FIELDS
+            ).execute()
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        with conn:
+            google_docs_index.upsert(conn, file)
+    
+    file = google_docs_index.get(conn, doc_id)
+    print(f"\nDocument: {file['name']}")
+    print(f"  ID: {file['id']}")
+    print(f"  Created: {file['created_time'] or 'Unknown'}")
+    print(f"  Modified: {file['modified_time'] or 'Unknown'}")
+    print(f"  URL: {file['web_view_link'] or 'N/A'}\n")
 
 
 def main():
@@ -262,14 +375,26 @@ Examples:
   # Download Google Doc to HTML
   python scripts/google-docs-workflow.py download DOCUMENT_ID --output file.html
   
+  # Download as a zip with images as separate files
+  python scripts/google-docs-workflow.py download DOCUMENT_ID --zip
+  
   # List your Google Docs
   python scripts/google-docs-workflow.py list
   
   # Search for documents
   python scripts/google-docs-workflow.py list --search "AI Coding"
   
+  # Pick up changes made in Drive since the last refresh, then list
+  python scripts/google-docs-workflow.py list --refresh
+  
   # Get document info
   python scripts/google-docs-workflow.py info DOCUMENT_ID
+  
+  # Upload every tracked document that changed locally
+  python scripts/google-docs-workflow.py sync
+  
+  # Upload a directory of HTML files, 8 at a time
+  python scripts/google-docs-workflow.py bulk docs/learning/*.html --jobs 8
         """
     )
     
@@ -279,58 +404,93 @@ Examples:
     upload_parser = subparsers.add_parser('upload', help='Upload HTML to Google Docs')
     upload_parser.add_argument('html_file', help='Path to HTML file')
     upload_parser.add_argument('--title', help='Title for the Google Doc')
-    upload_parser.add_argument('--doc-id', help='Document ID to update (creates new if not provided)')
+    upload_parser.add_argument('--doc-id', help='Document ID to update in place '
+                               '(default: the document tracked for this title, else create new)')
+    upload_parser.add_argument('--force', action='store_true',
+                               help='Upload even if unchanged or edited in Google Docs')
     
     # Download command
-    download_parser = subparsers.add_parser('download', help='Download Google Doc as HTML')
-    download_parser.add_argument('doc_id', help='Google Doc ID')
-    download_parser.add_argument('--output', help='Output HTML file path')
+    download_parser = subparsers.add_parser('download', help='Download Google Docs as HTML (skips unchanged docs)')
+    download_parser.add_argument('doc_ids', nargs='+', metavar='doc_id', help='Google Doc ID(s)')
+    download_parser.add_argument('--output', help='Output file path (single document only)')
+    download_parser.add_argument('--zip', action='store_true',
+                                 help='Export a zip of the HTML with images as separate files')
+    download_parser.add_argument('--force', action='store_true', help='Download even if unchanged')
     
     # List command
-    list_parser = subparsers.add_parser('list', help='List your Google Docs')
+    list_parser = subparsers.add_parser('list', help='List your Google Docs (from the local index)')
     list_parser.add_argument('--search', help='Search query to filter documents')
     
     # Info command
-    info_parser = subparsers.add_parser('info', help='Get document information')
+    info_parser = subparsers.add_parser('info', help='Get document information (from the local index)')
     info_parser.add_argument('doc_id', help='Google Doc ID')
     
+    for index_parser in (list_parser, info_parser):
+        index_parser.add_argument('--refresh', action='store_true',
+                                  help='Apply changes made in Drive to the local index first')
+        index_parser.add_argument('--rebuild', action='store_true',
+                                  help='Rebuild the local index from a full listing first')
+    
+    # Sync command
+    sync_parser = subparsers.add_parser('sync', help='Upload every tracked document whose HTML changed')
+    sync_parser.add_argument('--dry-run', action='store_true', help='Only list the documents that would be uploaded')
+    sync_parser.add_argument('--force', action='store_true',
+                             help='Upload all tracked documents, even if unchanged or edited in Google Docs')
+    
+    # Cleanup command
+    cleanup_parser = subparsers.add_parser('cleanup', help='Delete temporary .html files left in Drive by older uploads')
+    cleanup_parser.add_argument('--dry-run', action='store_true', help='Only list the files that would be deleted')
+    
+    # Bulk upload command
+    bulk_parser = subparsers.add_parser('bulk', help='Upload many HTML files concurrently')
+    bulk_parser.add_argument('html_files', nargs='+', help='HTML files (titles are derived from the file names)')
+    bulk_parser.add_argument('--force', action='store_true',
+                             help='Upload even if unchanged or edited in Google Docs')
+    
+    for concurrent_parser in (sync_parser, bulk_parser):
+        concurrent_parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                                       help=f'Concurrent uploads (default: {DEFAULT_JOBS})')
+        concurrent_parser.add_argument('--rate', type=float,
+                                       help='Drive API requests per second across all workers (default: 3)')
+    
+    parser.add_argument('--timings', action='store_true', help='Print the duration of each API call')
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
-    # Authenticate
-    print("Authenticating with Google...")
-    creds = get_credentials()
-    
-    # Build services
-    drive_service = build('drive', 'v3', credentials=creds)
-    
     # Execute command
+    ok = True
     if args.command == 'upload':
         html_path = Path(args.html_file)
         if not html_path.exists():
             print(f"Error: HTML file not found: {html_path}")
             sys.exit(1)
         
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
         title = args.title or html_path.stem.replace('_', ' ').title()
-        doc_id = args.doc_id
+        store = google_docs_store.open_store()
+        tracked = google_docs_store.get(store, 'workflow', title, {})
+        doc_id = args.doc_id or tracked.get('doc_id')
         
-        doc_id = upload_to_google_docs(drive_service, html_content, title, doc_id)
-        doc_url = f"https://docs.google.com/document/d/{doc_id}/edit"
+        if (not args.force and doc_id == tracked.get('doc_id')
+                and tracked.get('content_hash') == content_hash(html_path)):
+            print(f"✓ '{title}' is unchanged since its last upload, nothing to do")
+            print(f"URL: {tracked['url']}")
+            return
         
-        # Save to workflow config
-        config = load_workflow_config()
-        config[title] = {
-            'doc_id': doc_id,
-            'html_file': str(html_path),
-            'url': doc_url
-        }
-        save_workflow_config(config)
+        drive_service, docs_service = connect()
+        # As upload_documents() does: never silently revert edits made in Google Docs
+        if (not args.force and doc_id and doc_id == tracked.get('doc_id') and tracked.get('modified_time')
+                and remote_modified_time(drive_service, doc_id) != tracked['modified_time']):
+            print(f"❌ '{title}' was edited in Google Docs since its last upload, not updating it")
+            print(f"   Download it first, or use --force to overwrite the edits: {tracked['url']}")
+            sys.exit(1)
+        entry = publish_document(drive_service, docs_service, title, html_path, doc_id)
+        google_docs_store.put(store, 'workflow', title, entry)
+        doc_id = entry['doc_id']
+        doc_url = entry['url']
         
         print("\n" + "="*60)
         print("SUCCESS!")
@@ -338,20 +498,69 @@ Examples:
         print(f"\nDocument: {title}")
         print(f"ID: {doc_id}")
         print(f"URL: {doc_url}")
-        print(f"\nSaved to workflow config. Use this ID for future updates:")
-        print(f"  python scripts/google-docs-workflow.py upload {html_path} --doc-id {doc_id}")
+        print(f"\nSaved to the metadata store. Future uploads of this title update it in place,")
+        print(f"or publish every tracked document that changed with:")
+        print(f"  python scripts/google-docs-workflow.py sync")
         print("="*60 + "\n")
     
+    elif args.command in ('sync', 'bulk'):
+        if args.rate:
+            set_rate_limit(DRIVE_HOST, args.rate)
+        store = google_docs_store.open_store()
+        if args.command == 'sync':
+            ok = sync_documents(store, force=args.force, dry_run=args.dry_run, jobs=args.jobs)
+        else:
+            missing = [f for f in args.html_files if not Path(f).exists()]
+            if missing:
+                print(f"Error: HTML file not found: {missing[0]}")
+                sys.exit(1)
+            documents = google_docs_store.items(store, 'workflow')
+            uploads = []
+            for html_file in args.html_files:
+                title = Path(html_file).stem.replace('_', ' ').title()
+                upload = pending_upload(documents, title, html_file, args.force)
+                if upload is None:
+                    print(f"  Up to date: {title}")
+                else:
+                    uploads.append(upload)
+            ok = upload_documents(store, uploads, args.jobs, args.force) if uploads else True
+    
     elif args.command == 'download':
-        output_path = args.output or f"downloaded_{args.doc_id}.html"
-        download_from_google_docs(drive_service, args.doc_id, output_path)
-        print(f"\n✓ You can now edit this file and re-upload it.")
+        if args.output and len(args.doc_ids) > 1:
+            parser.error('--output can only be used with a single document')
+        export_format = 'zip' if args.zip else 'html'
+        drive_service, _ = connect()
+        store = google_docs_store.open_store()
+        downloaded = 0
+        for doc_id in args.doc_ids:
+            output_path = args.output or f"downloaded_{doc_id}.{export_format}"
+            downloaded += download_from_google_docs(drive_service, store, doc_id, output_path, export_format, args.force)
+        if downloaded:
+            print(f"\n✓ You can now edit the downloaded file(s) and re-upload them.")
+    
+    elif args.command in ('list', 'info'):
+        conn = google_docs_index.open_index()
+        drive_service = None
+        if args.refresh or args.rebuild or not google_docs_index.is_built(conn):
+            drive_service, _ = connect()
+            google_docs_index.refresh(conn, drive_service, full=args.rebuild)
+        
+        if args.command == 'list':
+            list_documents(conn, args.search)
+        elif google_docs_index.get(conn, args.doc_id) is not None:
+            get_document_info(conn, args.doc_id)
+        else:
+            # Not indexed (e.g. not created by these scripts): ask Drive
+            get_document_info(conn, args.doc_id, drive_service or connect()[0])
     
-    elif args.command == 'list':
-        list_documents(drive_service, args.search)
+    elif args.command == 'cleanup':
+        drive_service, _ = connect()
+        cleanup_temporary_files(drive_service, args.dry_run)
     
-    elif args.command == 'info':
-        get_document_info(drive_service, args.doc_id)
+    if args.timings:
+        print_call_timings()
+    if not ok:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Google Docs tools - one entry point
+
+Each command runs the google-docs-* (or conversion) script that implements
+it. Only that script is loaded, from its cached bytecode, and the scripts
+import what a command needs when it runs: commands that only read local state
+(list, info, status, convert, docx) start in a few tens of milliseconds and
+never load the Google client libraries.
+
+Usage:
+    python scripts/google-docs.py <command> [options]
+    python scripts/google-docs.py <command> --help
+
+Examples:
+    python scripts/google-docs.py status
+    python scripts/google-docs.py upload docs/learning/A_WEEK_WITH_AI_CODING.html
+    python scripts/google-docs.py list --search "week"
+    python scripts/google-docs.py drive watch
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# command: (script, arguments passed before the user's, summary)
+COMMANDS = {
+    'upload': ('google-docs-workflow.py', ['upload'], 'Upload HTML as a Google Doc (in place if already tracked)'),
+    'download': ('google-docs-workflow.py', ['download'], 'Download Google Docs as HTML (only if they changed)'),
+    'list': ('google-docs-workflow.py', ['list'], 'List documents from the local index'),
+    'info': ('google-docs-workflow.py', ['info'], 'Show a document from the local index'),
+    'status': ('google-docs-workflow.py', ['sync', '--dry-run'],
+               'Show which tracked documents changed since their last upload'),
+    'sync': ('google-docs-workflow.py', ['sync'], 'Upload every tracked document that changed'),
+    'bulk': ('google-docs-workflow.py', ['bulk'], 'Upload many HTML files concurrently'),
+    'cleanup': ('google-docs-workflow.py', ['cleanup'], 'Delete temporary files left in Drive by older uploads'),
+    'drive': ('google-docs-bidirectional-sync.py', [],
+              'Sync through the Google Drive folder (setup, upload, download, list, watch)'),
+    'api-upload': ('google-docs-api-upload.py', ['upload'], 'Upload with an access token (resumable for large files)'),
+    'browser-upload': ('google-docs-browser-upload.py', [], 'Upload through the Google Docs web interface'),
+    'publish': ('publish-docs.py', [], 'Render markdown to HTML, DOCX and diagrams and copy to Drive (only what changed)'),
+    'convert': ('md-to-html.py', [], 'Convert markdown to HTML: <input.md> <output.html> <title>'),
+    'docx': ('convert-to-docx.py', [], 'Convert markdown or HTML to DOCX: <input> <output.docx>'),
+}
+LOCAL_COMMANDS = {'list', 'info', 'status', 'convert', 'docx'}  # No network unless asked (e.g. list --refresh)
+# Options a script takes before its subcommand; given anywhere, they are moved there
+TOP_LEVEL_OPTIONS = {
+    'google-docs-workflow.py': {'--timings'},
+}
+
+
+def print_usage():
+    """Print the available commands."""
+    print(__doc__.split('\n\n', 1)[0].strip())
+    print("\nUsage: python scripts/google-docs.py <command> [options]\n\nCommands:")
+    for command, (_, _, summary) in COMMANDS.items():
+        marker = ' (offline)' if command in LOCAL_COMMANDS else ''
+        print(f"  {command:15s} {summary}{marker}")
+    print("\nRun 'python scripts/google-docs.py <command> --help' for a command's options.")
+
+
+def run_script(script, argv):
+    """Run a script as __main__ with the given arguments, reusing its cached bytecode."""
+    import importlib.util
+
+    path = SCRIPT_DIR / script
+    sys.argv = [str(path), *argv]
+    spec = importlib.util.spec_from_file_location('__main__', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help', 'help'):
+        print_usage()
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+    if command not in COMMANDS:
+        print(f"❌ Error: Unknown command: {command}\n")
+        print_usage()
+        sys.exit(2)
+
+    script, prefix, _ = COMMANDS[command]
+    top_level = TOP_LEVEL_OPTIONS.get(script, set())
+    run_script(script, [a for a in args if a in top_level] + prefix + [a for a in args if a not in top_level])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,414 @@
+"""
+Shared Google Drive / Docs API client for the google-docs-* scripts.
+
+Keeps start-up and per-call overhead down:
+
+- OAuth credentials are loaded (or obtained) in one place
+- API discovery documents are cached under ~/.cache/google-docs-scripts, so
+  building a service never needs a network round trip
+- every service shares one authorized keep-alive HTTP connection per process
+- every API call is timed; print_call_timings() shows where the time went
+- calls are paced by a token bucket per API host, sized to the Drive and
+  Docs per-user quotas, and retried with jittered exponential backoff on
+  rate-limit (403/429) and server (5xx) errors
+- each thread gets its own connection (httplib2 is not thread-safe), so
+  services can be used from a thread pool
+
+Google client libraries are imported lazily, so scripts that only need the
+requests-based session (google-docs-api-upload.py) do not pay for them.
+"""
+
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Scopes required for Google Drive and Docs API
+SCOPES = [
+    'https://www.googleapis.com/auth/drive.file',
+    'https://www.googleapis.com/auth/documents'
+]
+
+# Storage locations
+TOKEN_FILE = Path.home() / '.google-docs-token.pickle'
+CREDENTIALS_FILE = Path.home() / '.google-docs-credentials.json'
+CACHE_DIR = Path.home() / '.cache' / 'google-docs-scripts'
+
+GOOGLE_DOCS_MIME_TYPE = 'application/vnd.google-apps.document'
+BATCH_LIMIT = 100  # Calls per Drive batch request
+
+# Point every script at another server, e.g. the local fake_google_api.py:
+#   GOOGLE_DOCS_API_ROOT=http://127.0.0.1:8765/
+API_ROOT = os.environ.get('GOOGLE_DOCS_API_ROOT')
+DRIVE_ROOT = API_ROOT or 'https://www.googleapis.com/'
+DOCS_ROOT = API_ROOT or 'https://docs.googleapis.com/'
+
+DISCOVERY_URL = 'https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest'
+DISCOVERY_MAX_AGE = 7 * 24 * 3600  # Discovery documents change rarely
+HTTP_TIMEOUT = 60
+
+# Sustained requests per second and burst size per API host. Drive allows a few
+# writes per second per user; Docs allows 60 write requests per minute per user.
+# (With GOOGLE_DOCS_API_ROOT both APIs share one host and the Drive limit applies.)
+DRIVE_HOST = DRIVE_ROOT.split('://', 1)[-1].split('/', 1)[0]
+DOCS_HOST = DOCS_ROOT.split('://', 1)[-1].split('/', 1)[0]
+RATE_LIMITS = {
+    DOCS_HOST: (1.0, 5),
+    DRIVE_HOST: (3.0, 10),
+}
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0  # Seconds; doubles per attempt before jitter
+BACKOFF_CAP = 32.0
+RATE_LIMIT_REASONS = (b'rateLimitExceeded', b'userRateLimitExceeded')
+# A server error may come after the request took effect: only these are resent after one
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+INSTALL_HINT = "pip3 install google-api-python-client google-auth-httplib2 google-auth-oauthlib --user"
+
+# (method, url, status, seconds) for every API call made in this process
+CALL_TIMINGS = []
+
+_local = threading.local()
+_buckets = {}
+_buckets_lock = threading.Lock()
+_discovery_lock = threading.Lock()
+
+
+def record_call(method, url, status, seconds):
+    """Record the timing of one API call."""
+    CALL_TIMINGS.append((method, url.split('?')[0], status, seconds))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        # Tokens are reserved under the lock, so waiting threads are served in order
+        if wait:
+            time.sleep(wait)
+
+
+def set_rate_limit(host, rate, burst=None):
+    """Override the request rate (per second) for an API host."""
+    RATE_LIMITS[host] = (rate, burst or RATE_LIMITS.get(host, (rate, 1))[1])
+    with _buckets_lock:
+        _buckets.pop(host, None)
+
+
+def rate_limit(url):
+    """Wait for the token bucket of the URL's host, if it has one."""
+    host = url.split('://', 1)[-1].split('/', 1)[0]
+    if host not in RATE_LIMITS:
+        return
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*RATE_LIMITS[host])
+        bucket = _buckets[host]
+    bucket.acquire()
+
+
+def is_retryable(status, content=b''):
+    """Rate-limit and server errors are worth retrying; other errors are not."""
+    if status == 429 or status >= 500:
+        return True
+    return status == 403 and any(reason in (content or b'') for reason in RATE_LIMIT_REASONS)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt (0-based): full-jitter exponential backoff."""
+    if retry_after and str(retry_after).isdigit():
+        return float(retry_after)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def thread_retries():
+    """Number of retries made by the current thread so far."""
+    return getattr(_local, 'retries', 0)
+
+
+def print_call_timings():
+    """Print a per-call timing table for this process."""
+    if not CALL_TIMINGS:
+        return
+    print(f"\nAPI calls ({len(CALL_TIMINGS)}):")
+    for method, url, status, seconds in CALL_TIMINGS:
+        path = '/' + url.split('://', 1)[-1].split('/', 1)[-1]
+        print(f"  {seconds * 1000:7.1f} ms  {status}  {method:6s} {path}")
+    print(f"  {sum(t[3] for t in CALL_TIMINGS) * 1000:7.1f} ms  total")
+
+
+def print_setup_instructions():
+    """Explain how to create the OAuth client credentials file."""
+    print("\n" + "="*60)
+    print("Google OAuth Credentials Setup Required")
+    print("="*60)
+    print("\nStep 1: Go to https://console.cloud.google.com/")
+    print("Step 2: Create a new project (or select existing)")
+    print("Step 3: Enable APIs:")
+    print("   - Go to 'APIs & Services' → 'Library'")
+    print("   - Search for and enable 'Google Drive API'")
+    print("   - Search for and enable 'Google Docs API'")
+    print("Step 4: Create OAuth 2.0 credentials:")
+    print("   - Go to 'APIs & Services' → 'Credentials'")
+    print("   - Click '+ CREATE CREDENTIALS' → 'OAuth client ID'")
+    print("   - Application type: 'Desktop app'")
+    print("   - Name: 'Google Docs Workflow' (or any name)")
+    print("   - Click 'CREATE'")
+    print("Step 5: Download credentials:")
+    print("   - Click the download icon (⬇) next to your OAuth client")
+    print(f"   - Save the JSON file as: {CREDENTIALS_FILE}")
+    print("\nAlternatively, use the web interface:")
+    print("  1. Open Google Docs: https://docs.google.com")
+    print("  2. File → Import → Upload")
+    print("  3. Select your HTML file")
+    print("\nOnce you've saved the credentials file, run this script again.")
+    print("="*60 + "\n")
+
+
+def get_credentials(scopes=SCOPES):
+    """Get valid user credentials from storage or OAuth flow."""
+    import pickle
+
+    try:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+    except ImportError:
+        print("Error: Required packages not installed.")
+        print(f"Install with: {INSTALL_HINT}")
+        sys.exit(1)
+
+    creds = None
+
+    # Load existing token if available
+    if TOKEN_FILE.exists():
+        with open(TOKEN_FILE, 'rb') as token:
+            creds = pickle.load(token)
+
+    # A token granted for fewer scopes cannot be used; ask again
+    if creds and not set(scopes).issubset(set(creds.scopes or scopes)):
+        creds = None
+
+    # If there are no (valid) credentials available, let the user log in
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            if not CREDENTIALS_FILE.exists():
+                print_setup_instructions()
+                sys.exit(1)
+
+            print("\nOpening browser for Google authentication...")
+            print("Please sign in and grant permissions.\n")
+            flow = InstalledAppFlow.from_client_secrets_file(
+                str(CREDENTIALS_FILE), scopes)
+            creds = flow.run_local_server(port=0)
+
+        # Save credentials for next run
+        with open(TOKEN_FILE, 'wb') as token:
+            pickle.dump(creds, token)
+        print("✓ Credentials saved for future use\n")
+
+    return creds
+
+
+class TimedHttp:
+    """
+    Wraps an authorized httplib2 client: paces, retries and times every request.
+    """
+
+    def __init__(self, http):
+        self.http = http
+
+    def request(self, uri, method='GET', *args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            rate_limit(uri)
+            start = time.perf_counter()
+            response, content = self.http.request(uri, method, *args, **kwargs)
+            record_call(method, uri, response.status, time.perf_counter() - start)
+            if attempt == MAX_RETRIES or not is_retryable(response.status, content):
+                return response, content
+            _local.retries = thread_retries() + 1
+            time.sleep(backoff_delay(attempt, response.get('retry-after')))
+
+    def __getattr__(self, name):
+        # credentials, timeout, etc. are read by googleapiclient (e.g. for batch requests)
+        return getattr(self.http, name)
+
+
+def get_http(credentials):
+    """
+    The authorized HTTP client of the current thread.
+
+    httplib2 keeps the TLS connection to each host open between requests, so
+    every service and call built on this client reuses the same connections.
+    """
+    if getattr(_local, 'http', None) is None:
+        import google_auth_httplib2
+        import httplib2
+
+        _local.http = TimedHttp(google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT)))
+    return _local.http
+
+
+def load_discovery_document(api, version, http):
+    """
+    Discovery document for an API, from the local cache when fresh.
+
+    Falls back to the copy bundled with google-api-python-client, then to the
+    network, and refreshes the cache from whichever was used.
+    """
+    cache_file = CACHE_DIR / f'{api}.{version}.json'
+    # Worker threads building their services at once share one cold-cache load
+    with _discovery_lock:
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < DISCOVERY_MAX_AGE:
+            return cache_file.read_text(encoding='utf-8')
+
+        document = None
+        try:
+            from googleapiclient.discovery_cache import get_static_doc
+            document = get_static_doc(api, version)
+        except ImportError:
+            pass
+        if document is None:
+            response, content = http.request(DISCOVERY_URL.format(api=api, version=version))
+            if response.status != 200:
+                raise RuntimeError(f"Could not fetch {api} {version} discovery document (HTTP {response.status})")
+            document = content.decode('utf-8')
+
+        json.loads(document)  # Never cache something unusable
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # A temporary file of its own, so concurrent processes never replace the cache with a partial write
+        import tempfile
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=cache_file.name, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(document)
+        os.replace(tmp_path, cache_file)
+        return document
+
+
+def build_service(api, version, credentials):
+    """
+    Build an API service object without a discovery round trip.
+
+    Example:
+        drive = build_service('drive', 'v3', get_credentials())
+    """
+    try:
+        from googleapiclient.discovery import build_from_document
+    except ImportError:
+        print("Error: Required packages not installed.")
+        print(f"Install with: {INSTALL_HINT}")
+        sys.exit(1)
+
+    http = get_http(credentials)
+    document = load_discovery_document(api, version, http)
+    if API_ROOT:
+        document = json.loads(document)
+        document['rootUrl'] = API_ROOT
+        document['baseUrl'] = API_ROOT + document['servicePath']
+    return build_from_document(document, http=http)
+
+
+def get_session(access_token=None):
+    """
+    A pooled requests session for raw REST calls, timed like the API client.
+
+    Connections are kept alive between calls; pass access_token to send it as
+    a Bearer token on every request. Requests are paced by the same token
+    buckets and retried like TimedHttp requests (every attempt waits for the
+    bucket), except that a POST is not resent after a server error, which could
+    mean it already created a file. Rejected requests (429, 403 rate limit) are
+    resent whatever the method. urllib3 only retries failed connections.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Status codes are handled below, so urllib3 must not retry on them (nor on Retry-After)
+    retry = Retry(total=MAX_RETRIES, backoff_factor=BACKOFF_BASE, respect_retry_after_header=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if access_token:
+        session.headers['Authorization'] = f'Bearer {access_token}'
+    session.hooks['response'].append(
+        lambda response, *args, **kwargs: record_call(
+            response.request.method, response.url, response.status_code, response.elapsed.total_seconds()
+        )
+    )
+    send = session.request
+
+    def paced_request(method, url, *args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            rate_limit(url)
+            response = send(method, url, *args, **kwargs)
+            status = response.status_code
+            if (attempt == MAX_RETRIES
+                    or not is_retryable(status, response.content if status == 403 else b'')
+                    or (status >= 500 and method.upper() not in IDEMPOTENT_METHODS)):
+                return response
+            _local.retries = thread_retries() + 1
+            time.sleep(backoff_delay(attempt, response.headers.get('Retry-After')))
+
+    session.request = paced_request
+    return session
+
+
+def import_html(drive_service, html_content, title, fields='id, modifiedTime'):
+    """
+    Create a Google Doc from HTML in a single request.
+
+    The file metadata asks for the Google Docs type, so Drive converts the HTML
+    while it is uploaded: no temporary .html file to copy and delete.
+
+    Returns:
+        The created file resource (with the requested fields)
+    """
+    from googleapiclient.http import MediaIoBaseUpload
+
+    media = MediaIoBaseUpload(io.BytesIO(html_content.encode('utf-8')), mimetype='text/html', resumable=False)
+    return drive_service.files().create(
+        body={'name': title, 'mimeType': GOOGLE_DOCS_MIME_TYPE},
+        media_body=media,
+        fields=fields
+    ).execute()
+
+
+def delete_files(drive_service, file_ids):
+    """
+    Delete Drive files using batch requests (up to 100 deletions per round trip).
+
+    Returns:
+        Dict of file ID to error for the deletions that failed
+    """
+    failed = {}
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            failed[request_id] = exception
+
+    file_ids = list(file_ids)
+    for i in range(0, len(file_ids), BATCH_LIMIT):
+        batch = drive_service.new_batch_http_request(callback=on_response)
+        for file_id in file_ids[i:i + BATCH_LIMIT]:
+            batch.add(drive_service.files().delete(fileId=file_id), request_id=file_id)
+        batch.execute()
+    return failed
@@ -0,0 +1,155 @@
+"""
+Local SQLite index of Google Docs metadata.
+
+The index is filled once by paging through every document in Drive, then
+kept current with the Drive changes feed: each refresh asks only for what
+changed since the page token saved by the previous one (usually a single
+small request). `list`, `--search` and `info` in google-docs-workflow.py are
+answered from the index, offline and in milliseconds, however many
+documents there are.
+
+The index is kept in the shared metadata store (google_docs_store.py).
+"""
+
+from google_docs_store import open_store, transaction
+
+DOCUMENT_MIME_TYPE = 'application/vnd.google-apps.document'
+FILE_FIELDS = 'id, name, mimeType, trashed, createdTime, modifiedTime, webViewLink'
+PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_time TEXT,
+    modified_time TEXT,
+    web_view_link TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_modified ON documents (modified_time);
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def open_index(path=None):
+    """Open (creating if needed) the metadata index."""
+    conn = open_store(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _state(conn, key):
+    row = conn.execute("SELECT value FROM index_state WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else None
+
+
+def _set_state(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO index_state (key, value) VALUES (?, ?)", (key, value))
+
+
+def upsert(conn, file):
+    """Insert or update one Drive file resource."""
+    conn.execute(
+        "INSERT OR REPLACE INTO documents (id, name, created_time, modified_time, web_view_link) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (file['id'], file['name'], file.get('createdTime'), file.get('modifiedTime'), file.get('webViewLink'))
+    )
+
+
+def full_refresh(conn, service):
+    """
+    Rebuild the index from a complete listing of the user's documents.
+
+    The changes page token is taken before listing, so edits made while the
+    listing runs are picked up by the next incremental refresh.
+
+    Returns:
+        Number of documents indexed
+    """
+    start_token = service.changes().getStartPageToken().execute()['startPageToken']
+    files, page_token = [], None
+    while True:
+        results = service.files().list(
+            q=f"mimeType='{DOCUMENT_MIME_TYPE}' and trashed=false",
+            pageSize=PAGE_SIZE,
+            pageToken=page_token,
+            fields=f"nextPageToken, files({FILE_FIELDS})"
+        ).execute()
+        files += results.get('files', [])
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+
+    with transaction(conn):
+        conn.execute("DELETE FROM documents")
+        for file in files:
+            upsert(conn, file)
+        _set_state(conn, 'page_token', start_token)
+    return len(files)
+
+
+def incremental_refresh(conn, service):
+    """
+    Apply the changes made in Drive since the last refresh.
+
+    Returns:
+        Number of changes applied
+    """
+    page_token = _state(conn, 'page_token')
+    applied = 0
+    while True:
+        results = service.changes().list(
+            pageToken=page_token,
+            pageSize=PAGE_SIZE,
+            fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))"
+        ).execute()
+        # Each page is applied together with the token that follows it, so an
+        # interrupted refresh resumes where it stopped
+        with transaction(conn):
+            for change in results.get('changes', []):
+                file = change.get('file')
+                if change.get('removed') or not file or file.get('trashed'):
+                    conn.execute("DELETE FROM documents WHERE id = ?", (change['fileId'],))
+                elif file.get('mimeType') == DOCUMENT_MIME_TYPE:
+                    upsert(conn, file)
+                else:
+                    continue
+                applied += 1
+            page_token = results.get('nextPageToken')
+            _set_state(conn, 'page_token', page_token or results['newStartPageToken'])
+        if not page_token:
+            return applied
+
+
+def refresh(conn, service, full=False):
+    """Bring the index up to date, building it first if it has never been filled."""
+    if full or _state(conn, 'page_token') is None:
+        count = full_refresh(conn, service)
+        print(f"✓ Indexed {count} document(s)")
+    else:
+        count = incremental_refresh(conn, service)
+        print(f"✓ Index refreshed ({count} change(s))")
+
+
+def is_built(conn):
+    """Whether the index has been filled at least once."""
+    return _state(conn, 'page_token') is not None
+
+
+def search(conn, query=None):
+    """Indexed documents whose name contains query (case-insensitive), newest first."""
+    if query:
+        pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = conn.execute(
+            "SELECT * FROM documents WHERE name LIKE ? ESCAPE '\\' ORDER BY modified_time DESC", (pattern,)
+        )
+    else:
+        rows = conn.execute("SELECT * FROM documents ORDER BY modified_time DESC")
+    return rows.fetchall()
+
+
+def get(conn, doc_id):
+    """Indexed metadata of one document, or None."""
+    return conn.execute("SELECT * FROM documents WHERE id = ?", (doc_id,)).fetchone()
@@ -0,0 +1,146 @@
+"""
+Metadata store shared by all the Google Docs scripts.
+
+One SQLite database (WAL mode) holds what used to be four JSON files, each
+read, modified and rewritten whole by every command: two invocations running
+at once (or the workers of a parallel batch) silently lost each other's
+entries, and each change rewrote every tracked document. Here each entry is a
+row, every change is its own transaction, and writers wait for each other
+(up to BUSY_TIMEOUT) instead of overwriting each other. Readers never block.
+
+Entries are JSON values stored by (namespace, key):
+
+- `workflow`: google-docs-workflow.py uploads, by title
+- `downloads`: google-docs-workflow.py downloads, by "doc_id:format"
+- `upload_sessions`: google-docs-api-upload.py resumable sessions, by file path
+- `drive_sync`: google-docs-bidirectional-sync.py documents, by title
+- `settings`: google-docs-bidirectional-sync.py settings (drive_folder)
+- `build`, `build_cache`: task_graph.py runs (publish-docs.py), by task name and by key
+
+The metadata index of google_docs_index.py lives in the same database. The
+old JSON files are imported the first time the store is opened and renamed
+to *.migrated.
+
+Example:
+    conn = open_store()
+    put(conn, 'workflow', title, entry)
+    update(conn, 'drive_sync', title, lambda doc: {**(doc or {}), 'last_uploaded': now})
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+STORE_DB = Path.home() / '.google-docs.sqlite3'
+BUSY_TIMEOUT = 30  # Seconds a writer waits for another one to commit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+"""
+
+# Legacy JSON file -> function turning its contents into (namespace, key, value) rows
+LEGACY_FILES = {
+    Path.home() / '.google-docs-workflow.json': lambda data: [('workflow', k, v) for k, v in data.items()],
+    Path.home() / '.google-docs-downloads.json': lambda data: [('downloads', k, v) for k, v in data.items()],
+    Path.home() / '.google-docs-upload-sessions.json':
+        lambda data: [('upload_sessions', k, v) for k, v in data.items()],
+    Path.home() / '.google-docs-sync-config.json':
+        lambda data: ([('drive_sync', k, v) for k, v in data.get('documents', {}).items()]
+                      + [('settings', k, v) for k, v in data.items() if k != 'documents']),
+}
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Run a block as one write transaction.
+
+    The write lock is taken up front (BEGIN IMMEDIATE), so a read-modify-write
+    inside the block cannot interleave with another process's.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _migrate_legacy_files(conn):
+    """Import the JSON files the scripts used before this store. Entries already in the store win."""
+    for path, to_rows in LEGACY_FILES.items():
+        try:
+            with open(path, 'r') as f:
+                rows = to_rows(json.load(f))
+        except FileNotFoundError:
+            continue
+        except (ValueError, AttributeError):
+            print(f"⚠️  Warning: Could not import {path}, leaving it in place")
+            continue
+        with transaction(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO entries (namespace, key, value) VALUES (?, ?, ?)",
+                [(namespace, key, json.dumps(value)) for namespace, key, value in rows]
+            )
+        try:
+            path.rename(path.with_name(path.name + '.migrated'))
+            print(f"✓ Imported {path} into {STORE_DB}")
+        except FileNotFoundError:
+            pass  # Another process imported it at the same time
+
+
+def open_store(path=None):
+    """Open (creating and migrating if needed) the metadata store."""
+    conn = sqlite3.connect(str(path or STORE_DB), timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Survives process crashes; a power loss can only drop the last commits
+    conn.executescript(SCHEMA)
+    if path is None:
+        _migrate_legacy_files(conn)
+    return conn
+
+
+def get(conn, namespace, key, default=None):
+    """One entry, or default."""
+    row = conn.execute("SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+    return json.loads(row['value']) if row else default
+
+
+def items(conn, namespace):
+    """All entries of a namespace, as a dict by key."""
+    rows = conn.execute("SELECT key, value FROM entries WHERE namespace = ? ORDER BY key", (namespace,))
+    return {row['key']: json.loads(row['value']) for row in rows}
+
+
+def put(conn, namespace, key, value):
+    """Insert or replace one entry (a single atomic statement)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)",
+        (namespace, key, json.dumps(value))
+    )
+
+
+def delete(conn, namespace, key):
+    """Remove one entry, if present."""
+    conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+
+def update(conn, namespace, key, change):
+    """
+    Replace an entry with change(current entry or None), atomically.
+
+    Returns:
+        The new value
+    """
+    with transaction(conn):
+        value = change(get(conn, namespace, key))
+        put(conn, namespace, key, value)
+    return value
@@ -0,0 +1,232 @@
+"""
+In-place Google Docs updates from HTML.
+
+Google Docs has no "replace this document with HTML" call, so updating used to
+mean importing a whole new document. Instead, this compares the document's
+current paragraphs with the paragraphs of the new HTML and sends a single
+documents.batchUpdate that touches only the paragraphs that changed. The
+document ID, URL, comments and sharing settings are preserved.
+
+Paragraphs are compared by text (with runs of whitespace collapsed, so the
+indented lines of <pre> blocks match what Docs returns), heading level and
+whether they are list items; changed ones are inserted with their HTML text. Inline formatting (bold, links, ...) of changed paragraphs is reset to
+plain text; unchanged paragraphs are left exactly as they are. Tables, images
+and other non-paragraph elements in the document are never modified, and
+tables in the HTML are ignored to match: changes inside a table need a full
+re-import.
+
+Document indices count UTF-16 code units, as the Docs API does: an emoji is
+two of them.
+"""
+
+import difflib
+from html.parser import HTMLParser
+
+BLOCK_TAGS = {
+    'p', 'div', 'li', 'pre', 'blockquote', 'section', 'article', 'header', 'footer',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'br', 'hr',
+}
+HEADING_STYLES = {f'h{level}': f'HEADING_{level}' for level in range(1, 7)}
+SKIPPED_TAGS = {'head', 'script', 'style', 'title', 'table'}  # Tables are not paragraphs in Docs either
+BULLET_PRESET = 'BULLET_DISC_CIRCLE_SQUARE'
+RESET_TEXT_FIELDS = 'bold,italic,underline,strikethrough,link,baselineOffset'
+
+
+class _ParagraphParser(HTMLParser):
+    """Collects (style, is_list_item, text) for each block of an HTML document."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self._text = []
+        self._style = 'NORMAL_TEXT'
+        self._list_item = False
+        self._skip_depth = 0
+        self._pre_depth = 0
+
+    def _flush(self):
+        text = ''.join(self._text)
+        text = text.strip('\n') if self._pre_depth else ' '.join(text.split())
+        if text:
+            for line in text.split('\n'):
+                self.paragraphs.append((self._style, self._list_item, line))
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            if tag == 'table':
+                self._flush()  # A table ends the paragraph before it
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag in HEADING_STYLES:
+                self._style = HEADING_STYLES[tag]
+            elif tag == 'li':
+                self._list_item = True
+            elif tag == 'pre':
+                self._pre_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag in HEADING_STYLES:
+                self._style = 'NORMAL_TEXT'
+            elif tag == 'li':
+                self._list_item = False
+            elif tag == 'pre':
+                self._pre_depth = max(0, self._pre_depth - 1)
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def html_to_paragraphs(html_content):
+    """
+    Split an HTML document into paragraphs.
+
+    Returns:
+        List of (namedStyleType, is_list_item, text) tuples in document order
+    """
+    parser = _ParagraphParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser.paragraphs
+
+
+def document_paragraphs(document):
+    """
+    Top-level paragraphs of a Docs API document resource.
+
+    Returns:
+        List of dicts with 'key' ((namedStyleType, is_list_item, text), comparable
+        with comparison_key() of html_to_paragraphs()), 'start' and 'end' (document indices)
+    """
+    paragraphs = []
+    for element in document.get('body', {}).get('content', []):
+        paragraph = element.get('paragraph')
+        if paragraph is None:
+            continue
+        text = ''.join(e.get('textRun', {}).get('content', '') for e in paragraph.get('elements', []))
+        style = paragraph.get('paragraphStyle', {}).get('namedStyleType', 'NORMAL_TEXT')
+        paragraphs.append({
+            'key': comparison_key((style, 'bullet' in paragraph, text)),
+            'start': element['startIndex'],
+            'end': element['endIndex'],
+        })
+    return paragraphs
+
+
+def comparison_key(paragraph):
+    """A (namedStyleType, is_list_item, text) paragraph with its whitespace collapsed, for comparing."""
+    style, is_list_item, text = paragraph
+    return style, is_list_item, ' '.join(text.split())
+
+
+def utf16_len(text):
+    """Length of text in UTF-16 code units, the unit of Docs API indices."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _style_requests(paragraphs, start):
+    """Requests giving freshly inserted paragraphs their style, starting at index start."""
+    requests = []
+    for style, is_list_item, text in paragraphs:
+        end = start + utf16_len(text) + 1
+        paragraph_range = {'startIndex': start, 'endIndex': end}
+        requests.append({'updateParagraphStyle': {
+            'range': paragraph_range, 'paragraphStyle': {'namedStyleType': style}, 'fields': 'namedStyleType',
+        }})
+        if text:
+            requests.append({'updateTextStyle': {
+                'range': {'startIndex': start, 'endIndex': end - 1}, 'textStyle': {}, 'fields': RESET_TEXT_FIELDS,
+            }})
+        if is_list_item:
+            requests.append({'createParagraphBullets': {'range': paragraph_range, 'bulletPreset': BULLET_PRESET}})
+        else:
+            requests.append({'deleteParagraphBullets': {'range': paragraph_range}})
+        start = end
+    return requests
+
+
+def diff_requests(old, new):
+    """
+    batchUpdate requests turning the old paragraphs into the new ones.
+
+    Args:
+        old: document_paragraphs() of the current document
+        new: html_to_paragraphs() of the new content
+
+    Changed blocks are applied from the end of the document backwards, so the
+    indices of the blocks before them stay valid throughout the batch.
+    """
+    if not old:
+        return []
+    opcodes = difflib.SequenceMatcher(None, [p['key'] for p in old], [comparison_key(p) for p in new],
+                                      autojunk=False).get_opcodes()
+    body_end = old[-1]['end']
+
+    # The final newline of the body can never be deleted: a block that removes the
+    # last paragraphs without replacing them is widened to rewrite the paragraph before it.
+    if opcodes[-1][0] == 'delete' and opcodes[-1][2] == len(old) and len(opcodes) > 1:
+        _, i1, i2, j1, j2 = opcodes.pop()
+        tag, k1, k2, l1, l2 = opcodes.pop()
+        if tag == 'equal' and k2 - k1 > 1:
+            opcodes.append(('equal', k1, k2 - 1, l1, l2 - 1))
+            k1, l1 = k2 - 1, l2 - 1
+        opcodes.append(('replace', k1, i2, l1, l2))
+
+    requests = []
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == 'equal':
+            continue
+        replaced = new[j1:j2]
+
+        if i1 == len(old):
+            # Append after the last paragraph, before the body's final newline
+            insert_at = body_end - 1
+            requests.append({'insertText': {
+                'location': {'index': insert_at}, 'text': ''.join('\n' + p[2] for p in replaced),
+            }})
+            requests += _style_requests(replaced, insert_at + 1)
+            continue
+
+        for paragraph in reversed(old[i1:i2]):
+            end = paragraph['end'] - 1 if paragraph['end'] == body_end else paragraph['end']
+            if end > paragraph['start']:
+                requests.append({'deleteContentRange': {'range': {'startIndex': paragraph['start'], 'endIndex': end}}})
+
+        if replaced:
+            insert_at = old[i1]['start']
+            text = '\n'.join(p[2] for p in replaced)
+            if i2 < len(old):
+                text += '\n'  # Otherwise the kept final newline ends the last paragraph
+            requests.append({'insertText': {'location': {'index': insert_at}, 'text': text}})
+            requests += _style_requests(replaced, insert_at)
+    return requests
+
+
+def update_document(docs_service, doc_id, html_content):
+    """
+    Update a Google Doc in place to match HTML content.
+
+    Fetches the document once and sends at most one batchUpdate, guarded by the
+    fetched revision so concurrent edits made in Docs are never overwritten.
+
+    Returns:
+        Number of batchUpdate requests sent (0 if the document was already up to date)
+    """
+    document = docs_service.documents().get(documentId=doc_id).execute()
+    requests = diff_requests(document_paragraphs(document), html_to_paragraphs(html_content))
+    if requests:
+        docs_service.documents().batchUpdate(documentId=doc_id, body={
+            'requests': requests,
+            'writeControl': {'requiredRevisionId': document['revisionId']},
+        }).execute()
+    return len(requests)
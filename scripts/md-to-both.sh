@@ -1,25 +1,15 @@
 #!/bin/bash
 # Convert Markdown to both DOCX and HTML, sync to CloudFiles
 # Maintains parallel formats for different sharing needs
+#
+# Runs scripts/publish-docs.py: both formats (and the timeline diagram) are
+# rendered in one process, and only what changed since the last run is redone.
+# Extra options are passed on (e.g. --dry-run, --upload).
 
 set -e
 
-INPUT_FILE="${1:-docs/learning/A_WEEK_WITH_AI_CODING.md}"
+python3 "$(dirname "$0")/publish-docs.py" "$@"
 
-echo "Converting to both formats..."
-echo ""
-
-# Generate DOCX
-./scripts/md-to-google-doc.sh "$INPUT_FILE"
-
-echo ""
-
-# Generate HTML
-./scripts/md-to-html.sh "$INPUT_FILE"
-
-echo ""
-echo "✓ Both formats created in CloudFiles"
 echo ""
 echo "DOCX: For editing in Google Docs"
 echo "HTML: For sharing/viewing in browser"
-
@@ -14,9 +14,12 @@ to other users. Such functionality would be intrusive and is explicitly prohibit
 import sys
 import re
 import os
+import json
 import base64
 from pathlib import Path
 
+from timeline_diagram import BAR_MARGIN, DEFAULT_HEIGHT, derive_events, section_id
+
 def convert_image_to_base64(image_path, md_file_dir):
     """
     Convert image to base64 data URI.
@@ -59,6 +62,9 @@ def markdown_to_html(md_file, html_file, title):
     with open(md_file, 'r', encoding='utf-8') as f:
         md_content = f.read()
     
+    # Same section positions as the timeline diagram (generate-timeline-diagram.py)
+    section_positions = json.dumps({e['sectionId']: e['position'] for e in derive_events(md_content)})
+    
     html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -67,21 +73,12 @@ def markdown_to_html(md_file, html_file, title):
     <title>{title}</title>
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/water.css@2/out/water.css">
     <script>
-        // Section to timeline position mapping (non-linear, based on document position)
-        var sectionToPosition = {{
-            'the-learning-timeline': 0.0,  // Top - Introduction
-            'the-branch-problem': 0.15,  // Early
-            'parallel-work-and-worktrees': 0.35,  // Mid-early
-            'coordination': 0.50,  // Mid
-            'rules-that-actually-work': 0.65,  // Mid-late
-            'does-it-actually-work': 0.85,  // Late
-            'what-i-learned': 0.90,  // Late
-            'final-thoughts': 1.0  // Bottom
-        }};
+        // Section to timeline position mapping (derived from the ## headings' offsets)
+        var sectionToPosition = {section_positions};
         
         // Timeline dimensions in diagram
-        var timelineStart = 80; // Top padding in diagram
-        var timelineEnd = 1120; // Bottom padding (height - 80)
+        var timelineStart = {BAR_MARGIN}; // Top padding in diagram
+        var timelineEnd = {DEFAULT_HEIGHT - BAR_MARGIN}; // Bottom padding (height - {BAR_MARGIN})
         var timelineLength = timelineEnd - timelineStart;
         
         // Timeline sidebar is hidden for now
@@ -199,6 +196,14 @@ def markdown_to_html(md_file, html_file, title):
             alt_text = image_match.group(1)
             image_path = image_match.group(2)
             
+            # Timeline diagram is hidden for now, whether or not it has been drawn yet
+            # (publish-docs.py draws it while this runs)
+            if 'diagram' in image_path.lower() or 'timeline' in image_path.lower():
+                if in_list:
+                    html += '</ul>\n'
+                    in_list = False
+                continue
+            
             # Convert image to base64
             base64_data = convert_image_to_base64(image_path, md_file_dir)
             
@@ -211,9 +216,6 @@ def markdown_to_html(md_file, html_file, title):
                     # Skip screenshot here - we'll insert it in sidebar later
                     # Don't set screenshot_inserted = True here, we'll do it when we actually insert
                     continue
-                elif 'diagram' in image_path.lower() or 'timeline' in image_path.lower():
-                    # Timeline diagram is hidden for now
-                    continue
                 else:
                     img_class = 'diagram'  # default
                     html += f'<img src="{base64_data}" alt="{alt_text}" class="{img_class}" />\n'
@@ -266,8 +268,7 @@ def markdown_to_html(md_file, html_file, title):
                 html += '</ul>\n'
                 in_list = False
             # Add ID to h2 for section tracking
-            section_id = stripped[3:].lower().replace(' ', '-').replace(':', '').replace('?', '')
-            html += f'<h2 id="{section_id}">{stripped[3:]}</h2>\n'
+            html += f'<h2 id="{section_id(stripped[3:])}">{stripped[3:]}</h2>\n'
         elif stripped.startswith('### '):
             if in_list:
                 html += '</ul>\n'
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Rebuild the moov atom of an interrupted screenrecord MP4 without re-encoding.
+
+When screenrecord is killed before it finalizes, the file ends with an mdat box
+full of H.264 samples but no moov box describing them, so nothing can play it.
+The samples themselves are intact: each is a run of AVCC length-prefixed NAL
+units. This module
+
+1. memory-maps the broken file and walks the NAL length prefixes through mdat
+   (reading only a few header bytes per NAL) to recover sample offsets, sizes
+   and keyframes (IDR slices),
+2. takes the codec configuration (avcC), timescales and frame duration from the
+   moov of a healthy recording made with the same device and settings,
+3. writes ftyp + a rebuilt moov + the original sample data, copied unchanged.
+
+Cost is one sequential copy of the sample data, against a full decode and
+encode for the ffmpeg fallback in repair-video-moov-atom.sh.
+
+Limitations:
+- Video-only files (screenrecord's default). Interleaved audio stops the scan.
+- Timing uses the reference's typical frame duration. screenrecord records
+  variable frame rate (fewer frames while the screen is static), so the repaired
+  timeline can run faster than wall-clock time during idle stretches.
+- Composition offsets (ctts) are dropped, which is only correct for streams
+  without B-frames, as produced by Android's hardware encoders.
+
+Usage:
+    python scripts/mp4_moov_repair.py <broken_video> <reference_video> [output_video]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from collections import Counter, namedtuple
+from pathlib import Path
+
+Box = namedtuple('Box', 'type start end header')
+
+# Boxes copied from the reference into the rebuilt video track
+MINF_KEEP = (b'vmhd', b'dinf')
+NAL_IDR = 5
+NAL_SLICE_TYPES = (1, 5)
+NAL_AU_START_TYPES = (6, 7, 8, 9)  # SEI, SPS, PPS, access unit delimiter
+MAX_SAMPLES_PER_CHUNK = 30
+COPY_BLOCK = 8 * 1024 * 1024
+CO64_THRESHOLD = 2 ** 32
+
+
+class RepairError(Exception):
+    """The file cannot be repaired with the given reference."""
+
+
+def iter_boxes(data, start, end):
+    """
+    Yield the boxes between start and end of a bytes-like object.
+
+    A size of 0 (box runs to end of file) or one that overruns the data, as left
+    behind by an interrupted writer, is clamped to end.
+    """
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                break
+            size = struct.unpack_from('>Q', data, pos + 8)[0]
+            header = 16
+        if size == 0 or pos + size > end:
+            size = end - pos
+        if size < header:
+            break
+        yield Box(box_type, pos, pos + size, header)
+        pos += size
+
+
+def find_box(data, parent, path):
+    """Follow a path of box types (e.g. [b'mdia', b'minf']) down from parent."""
+    box = parent
+    for box_type in path:
+        box = next((b for b in iter_boxes(data, box.start + box.header, box.end) if b.type == box_type), None)
+        if box is None:
+            return None
+    return box
+
+
+def top_level_types(path):
+    """Types of the top-level boxes of a file, read from the box headers only."""
+    types = []
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        pos = 0
+        while pos + 8 <= file_size:
+            f.seek(pos)
+            header = f.read(16)
+            size, box_type = struct.unpack_from('>I4s', header)
+            if size == 1 and len(header) == 16:
+                size = struct.unpack_from('>Q', header, 8)[0]
+            types.append(box_type)
+            if size == 0 or size < 8:
+                break
+            pos += size
+    return types
+
+
+def has_moov(path):
+    """True if the file has a top-level moov box (i.e. it was finalized)."""
+    return b'moov' in top_level_types(path)
+
+
+def _box(box_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def _full_box(box_type, payload, version=0, flags=0):
+    return _box(box_type, struct.pack('>I', (version << 24) | flags) + payload)
+
+
+def _with_duration(data, box, duration, field_offsets):
+    """
+    Copy a full box, replacing its duration field.
+
+    Args:
+        field_offsets: (v0_offset, v1_offset) of the duration relative to the
+            start of the box payload (after the version/flags word)
+    """
+    raw = bytearray(data[box.start:box.end])
+    version = raw[box.header]
+    offset = box.header + 4 + field_offsets[version == 1]
+    if version == 1:
+        struct.pack_into('>Q', raw, offset, duration)
+    else:
+        struct.pack_into('>I', raw, offset, min(duration, 0xFFFFFFFF))
+    return bytes(raw)
+
+
+def _timescale(data, box):
+    """Timescale field of an mvhd or mdhd box."""
+    version = data[box.start + box.header]
+    return struct.unpack_from('>I', data, box.start + box.header + (20 if version == 1 else 12))[0]
+
+
+class ReferenceTrack:
+    """Codec configuration and timing taken from a healthy recording's video track."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        moov = next((b for b in iter_boxes(data, 0, len(data)) if b.type == b'moov'), None)
+        if moov is None:
+            raise RepairError(f"reference video has no moov atom: {path}")
+
+        trak = None
+        for box in iter_boxes(data, moov.start + moov.header, moov.end):
+            hdlr = find_box(data, box, [b'mdia', b'hdlr']) if box.type == b'trak' else None
+            if hdlr and data[hdlr.start + hdlr.header + 8:hdlr.start + hdlr.header + 12] == b'vide':
+                trak = box
+                break
+        if trak is None:
+            raise RepairError(f"reference video has no video track: {path}")
+
+        self.data = data
+        self.ftyp = next((data[b.start:b.end] for b in iter_boxes(data, 0, len(data)) if b.type == b'ftyp'), None)
+        self.mvhd = find_box(data, moov, [b'mvhd'])
+        self.tkhd = find_box(data, trak, [b'tkhd'])
+        self.mdhd = find_box(data, trak, [b'mdia', b'mdhd'])
+        self.hdlr = find_box(data, trak, [b'mdia', b'hdlr'])
+        minf = find_box(data, trak, [b'mdia', b'minf'])
+        self.minf_children = [b for b in iter_boxes(data, minf.start + minf.header, minf.end) if b.type in MINF_KEEP]
+        stbl = find_box(data, minf, [b'stbl'])
+        self.stsd = find_box(data, stbl, [b'stsd'])
+
+        self.movie_timescale = _timescale(data, self.mvhd)
+        self.media_timescale = _timescale(data, self.mdhd)
+        self.sample_delta = self._typical_delta(find_box(data, stbl, [b'stts']))
+        self.length_size = self._nal_length_size()
+
+    def _typical_delta(self, stts):
+        """Most common sample duration in the reference's stts table."""
+        payload = stts.start + stts.header + 4
+        count = struct.unpack_from('>I', self.data, payload)[0]
+        deltas = Counter()
+        for i in range(count):
+            sample_count, delta = struct.unpack_from('>II', self.data, payload + 4 + 8 * i)
+            deltas[delta] += sample_count
+        if not deltas:
+            raise RepairError("reference video has an empty stts table")
+        return deltas.most_common(1)[0][0]
+
+    def _nal_length_size(self):
+        """NAL length prefix size from the avcC box of the first sample entry."""
+        entry = next(iter_boxes(self.data, self.stsd.start + self.stsd.header + 8, self.stsd.end), None)
+        if entry is None or entry.type not in (b'avc1', b'avc3'):
+            raise RepairError(f"reference video is not H.264 ({entry.type if entry else 'no sample entry'})")
+        # VisualSampleEntry has 78 bytes of fixed fields before its child boxes
+        avcc = next((b for b in iter_boxes(self.data, entry.start + entry.header + 78, entry.end)
+                     if b.type == b'avcC'), None)
+        if avcc is None:
+            raise RepairError("reference video has no avcC box")
+        return (self.data[avcc.start + avcc.header + 4] & 0x03) + 1
+
+    def raw(self, box):
+        return self.data[box.start:box.end]
+
+
+def scan_samples(data, start, end, length_size):
+    """
+    Recover H.264 samples from AVCC length-prefixed NAL units.
+
+    A new sample starts at the first slice of a picture (first_mb_in_slice == 0)
+    or at a SEI/SPS/PPS/AUD unit following a slice. Scanning stops at the first
+    implausible length prefix, which marks where the interrupted write was cut off.
+
+    Returns:
+        (offsets, sizes, sync_samples, end_of_data); sync_samples are 1-based
+    """
+    offsets, sizes, sync = [], [], []
+    sample_start = None
+    sample_has_slice = False
+    sample_is_idr = False
+    pos = start
+
+    def close(pos):
+        offsets.append(sample_start)
+        sizes.append(pos - sample_start)
+        if sample_is_idr:
+            sync.append(len(offsets))
+
+    while pos + length_size + 1 <= end:
+        nal_size = int.from_bytes(data[pos:pos + length_size], 'big')
+        header = data[pos + length_size]
+        nal_type = header & 0x1F
+        if nal_size == 0 or header & 0x80 or not 1 <= nal_type <= 23 or pos + length_size + nal_size > end:
+            break
+
+        is_slice = nal_type in NAL_SLICE_TYPES
+        # first_mb_in_slice is ue(v); a leading 1 bit encodes 0
+        starts_picture = is_slice and nal_size > 1 and data[pos + length_size + 1] & 0x80
+        if sample_start is not None and sample_has_slice and (
+                starts_picture or nal_type in NAL_AU_START_TYPES):
+            close(pos)
+            sample_start = None
+
+        if sample_start is None:
+            sample_start, sample_has_slice, sample_is_idr = pos, False, False
+        sample_has_slice = sample_has_slice or is_slice
+        sample_is_idr = sample_is_idr or nal_type == NAL_IDR
+        pos += length_size + nal_size
+
+    if sample_start is not None and sample_has_slice:
+        close(pos)
+        return offsets, sizes, sync, pos
+    return offsets, sizes, sync, sample_start if sample_start is not None else pos
+
+
+def _chunks(offsets, sizes):
+    """Group contiguous samples into chunks; returns (chunk_offsets, samples_per_chunk)."""
+    chunk_offsets, per_chunk = [], []
+    expected = None  # Where the next sample starts if it continues the current chunk
+    for offset, size in zip(offsets, sizes):
+        if per_chunk and per_chunk[-1] < MAX_SAMPLES_PER_CHUNK and offset == expected:
+            per_chunk[-1] += 1
+        else:
+            chunk_offsets.append(offset)
+            per_chunk.append(1)
+        expected = offset + size
+    return chunk_offsets, per_chunk
+
+
+def build_moov(reference, chunk_offsets, per_chunk, sizes, sync):
+    """Assemble a moov box describing the recovered samples."""
+    media_duration = len(sizes) * reference.sample_delta
+    movie_duration = media_duration * reference.movie_timescale // reference.media_timescale
+
+    stsc_entries = []
+    for index, count in enumerate(per_chunk, start=1):
+        if not stsc_entries or stsc_entries[-1][1] != count:
+            stsc_entries.append((index, count, 1))
+
+    if chunk_offsets and chunk_offsets[-1] >= CO64_THRESHOLD:
+        chunk_box = _full_box(b'co64', struct.pack(f'>I{len(chunk_offsets)}Q', len(chunk_offsets), *chunk_offsets))
+    else:
+        chunk_box = _full_box(b'stco', struct.pack(f'>I{len(chunk_offsets)}I', len(chunk_offsets), *chunk_offsets))
+
+    tables = [
+        reference.raw(reference.stsd),
+        _full_box(b'stts', struct.pack('>III', 1, len(sizes), reference.sample_delta)),
+    ]
+    if len(sync) < len(sizes):
+        tables.append(_full_box(b'stss', struct.pack(f'>I{len(sync)}I', len(sync), *sync)))
+    tables += [
+        _full_box(b'stsc', struct.pack('>I', len(stsc_entries)) + b''.join(struct.pack('>III', *e) for e in stsc_entries)),
+        _full_box(b'stsz', struct.pack(f'>II{len(sizes)}I', 0, len(sizes), *sizes)),
+        chunk_box,
+    ]
+
+    data = reference.data
+    minf = _box(b'minf', b''.join(reference.raw(b) for b in reference.minf_children) + _box(b'stbl', b''.join(tables)))
+    mdia = _box(b'mdia', _with_duration(data, reference.mdhd, media_duration, (12, 20))
+                + reference.raw(reference.hdlr) + minf)
+    trak = _box(b'trak', _with_duration(data, reference.tkhd, movie_duration, (16, 24)) + mdia)
+    return _box(b'moov', _with_duration(data, reference.mvhd, movie_duration, (12, 20)) + trak)
+
+
+def repair_mp4(broken_path, reference_path, output_path):
+    """
+    Write a playable copy of an interrupted recording.
+
+    Args:
+        broken_path: MP4 whose moov atom is missing
+        reference_path: Healthy recording from the same device and settings
+        output_path: Where to write the repaired video (moov first, for QuickTime)
+
+    Returns:
+        Dict with 'samples', 'keyframes', 'duration' (seconds) and 'discardedBytes'
+
+    Raises:
+        RepairError: If no samples can be recovered
+    """
+    reference = ReferenceTrack(reference_path)
+
+    with open(broken_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        boxes = list(iter_boxes(mm, 0, len(mm)))
+        mdat = next((b for b in boxes if b.type == b'mdat'), None)
+        if mdat is None:
+            raise RepairError(f"no mdat box in {broken_path}")
+        ftyp = next((mm[b.start:b.end] for b in boxes if b.type == b'ftyp'), reference.ftyp)
+
+        offsets, sizes, sync, data_end = scan_samples(mm, mdat.start + mdat.header, mdat.end, reference.length_size)
+        if not sizes:
+            raise RepairError("no H.264 samples found in mdat (does the reference match this recording?)")
+        if not sync or sync[0] != 1:
+            raise RepairError("recording does not start with a keyframe")
+
+        data_start = offsets[0]
+        chunk_offsets, per_chunk = _chunks(offsets, sizes)
+        mdat_size = data_end - data_start + 16
+        mdat_header = struct.pack('>I4sQ', 1, b'mdat', mdat_size)
+
+        # moov precedes mdat, so chunk offsets depend on the moov's own size
+        shift = 0
+        while True:
+            moov = build_moov(reference, [o + shift for o in chunk_offsets], per_chunk, sizes, sync)
+            new_shift = len(ftyp) + len(moov) + len(mdat_header) - data_start
+            if new_shift == shift:
+                break
+            shift = new_shift
+
+        with open(output_path, 'wb') as out:
+            out.write(ftyp)
+            out.write(moov)
+            out.write(mdat_header)
+            view = memoryview(mm)
+            try:
+                for pos in range(data_start, data_end, COPY_BLOCK):
+                    out.write(view[pos:min(pos + COPY_BLOCK, data_end)])
+            finally:
+                view.release()
+
+        return {
+            'samples': len(sizes),
+            'keyframes': len(sync),
+            'duration': len(sizes) * reference.sample_delta / reference.media_timescale,
+            'discardedBytes': mdat.end - data_end,
+        }
+
+
+def find_reference_video(broken_path):
+    """
+    Pick a healthy recording next to broken_path to use as the reference.
+
+    Prefers the most recently modified finalized MP4 in the same directory,
+    skipping outputs of this toolchain (annotated, repaired or joined videos),
+    which are re-encoded and no longer match the device's encoder settings.
+    """
+    broken_path = Path(broken_path).resolve()
+    candidates = []
+    for path in broken_path.parent.glob('*.mp4'):
+        if path.resolve() == broken_path:
+            continue
+        if any(tag in path.stem for tag in ('_annotated', '_repaired', '_converted', 'joined-')):
+            continue
+        try:
+            if has_moov(path):
+                candidates.append(path)
+        except OSError:
+            continue
+    candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    return candidates[0] if candidates else None
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 3:
+        print(__doc__.strip().split('Usage:')[-1].strip())
+        sys.exit(1)
+
+    broken_path, reference_path = sys.argv[1], sys.argv[2]
+    output_path = sys.argv[3] if len(sys.argv) > 3 else str(Path(broken_path).with_name(
+        f"{Path(broken_path).stem}_repaired.mp4"))
+
+    for path in (broken_path, reference_path):
+        if not os.path.exists(path):
+            print(f"❌ Error: Video file not found: {path}")
+            sys.exit(1)
+
+    if has_moov(broken_path):
+        print("✅ Video appears to be valid (moov atom present)")
+        return
+
+    print(f"🔧 Rebuilding moov atom: {broken_path}")
+    print(f"   Reference: {reference_path}")
+    try:
+        summary = repair_mp4(broken_path, reference_path, output_path)
+    except (RepairError, OSError, struct.error) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(f"   Recovered {summary['samples']} frames ({summary['keyframes']} keyframes), "
+          f"{summary['duration']:.2f}s")
+    if summary['discardedBytes']:
+        print(f"   Discarded {summary['discardedBytes']} trailing bytes of incomplete data")
+    print(f"✅ Repaired video saved: {output_path}")
+
+
+if __name__ == '__main__':
+    main()
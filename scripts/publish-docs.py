@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Publish Markdown documents: HTML, DOCX and timeline diagram, copied to the
+Google Drive folder and optionally uploaded as Google Docs.
+
+Replaces chaining md-to-both.sh, md-to-google-doc.sh, md-to-html.sh and an
+upload script. The steps of each document form a task graph (task_graph.py):
+
+    parse ─┬─ html ─┬─ drive html
+           │        └─ upload (--upload)
+           ├─ docx ─── drive docx
+           └─ diagram
+
+Everything runs in one process, independent tasks in parallel, and a task
+runs only if what it uses changed: editing a paragraph re-renders the HTML
+and DOCX but not the diagram (drawn from the headings), and unchanged outputs
+are not copied to Drive or uploaded again. Outputs of earlier versions are
+cached, so reverting a change restores them without rendering.
+
+Usage:
+    python scripts/publish-docs.py [doc.md ...] [--upload] [--dry-run] [--force] [--jobs N]
+
+Example:
+    python scripts/publish-docs.py docs/learning/blog-posts/*.md --dry-run
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+import google_docs_store
+from file_sync import copy_if_changed
+from task_graph import DEFAULT_JOBS, Task, run_tasks
+from timeline_diagram import derive_events, diagram_path, generate_timeline_diagram
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_DOCUMENT = 'docs/learning/blog-posts/A_WEEK_WITH_AI_CODING.md'
+DEFAULT_OUT_DIR = 'build/publish'
+DRIVE_FOLDER = os.environ.get('CLOUDFILES', str(Path.home() / 'CloudFiles'))  # As in md-to-*.sh
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')  # As in md-to-html.py
+
+_scripts = {}
+_scripts_lock = threading.Lock()
+
+
+def load_script(name):
+    """A hyphen-named script in scripts/ as a module, loaded once (its main() does not run)."""
+    with _scripts_lock:
+        if name not in _scripts:
+            path = SCRIPT_DIR / name
+            spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+            module = importlib.util.module_from_spec(spec)
+            try:
+                spec.loader.exec_module(module)
+            except SystemExit:
+                raise RuntimeError(f"{name} could not be loaded (missing dependency?)") from None
+            _scripts[name] = module
+        return _scripts[name]
+
+
+def parse_document(md_path):
+    """
+    Title, short name, timeline events and images of a Markdown document.
+
+    The title is the first `# ` heading; the short name (used for the files
+    in the Drive folder) is its first five words before any colon, as
+    md-to-google-doc.sh named them.
+    """
+    text = md_path.read_text(encoding='utf-8')
+    match = re.search(r'^# (.+)$', text, re.MULTILINE)
+    title = match.group(1).strip() if match else md_path.stem.replace('_', ' ')
+    short_name = re.sub(r'-+', '-', '-'.join(title.split(':', 1)[0].lower().split()[:5]))
+
+    images = set()
+    for line in text.splitlines():
+        image = IMAGE_PATTERN.match(line.strip())
+        if not image:
+            continue
+        path = image.group(2)
+        # md-to-html.py embeds every local image except the (hidden) timeline diagram
+        if '://' not in path and not any(word in path.lower() for word in ('diagram', 'timeline')):
+            images.add(str((md_path.parent / path).resolve()))
+
+    return {
+        'title': title,
+        'short_name': short_name or md_path.stem,
+        'events': derive_events(text),
+        'images': sorted(images),
+    }
+
+
+def copy_to_drive(source, destination):
+    """Copy a rendered file into the Drive folder unless it already has the same contents."""
+    copy_if_changed(source, destination)
+
+
+def upload_document(html_path, title):
+    """Upload (or update in place) through google-docs-workflow.py, recording it there too."""
+    workflow = load_script('google-docs-workflow.py')
+    store = google_docs_store.open_store()  # This runs in a worker thread: its own connection
+    item = workflow.pending_upload(google_docs_store.items(store, 'workflow'), title, html_path)
+    if item and not workflow.upload_documents(store, [item], jobs=1):
+        raise RuntimeError("upload failed")
+    return {'url': google_docs_store.get(store, 'workflow', title)['url']}
+
+
+def document_tasks(md_path, out_dir, drive_folder=None, upload=False):
+    """The task graph publishing one document."""
+    name = str(md_path)
+    parse = f'{name}:parse'
+    html_file = out_dir / f'{md_path.stem}.html'
+    docx_file = out_dir / f'{md_path.stem}.docx'
+    diagram_file = diagram_path(md_path)
+
+    def task(step, action, **kwargs):
+        return Task(f'{name}:{step}', action, label=f'{md_path.name}: {step}', **kwargs)
+
+    def title(results):
+        return results[parse]['title']
+
+    def drive_file(suffix):
+        return lambda results: [Path(drive_folder) / f"{results[parse]['short_name']}{suffix}"]
+
+    tasks = [
+        task('parse', lambda results: parse_document(md_path), files=[md_path], preview=True),
+        task('diagram',
+             lambda results: generate_timeline_diagram(md_path, diagram_file),
+             deps=[parse],
+             files=[SCRIPT_DIR / 'timeline_diagram.py'],
+             params=lambda results: results[parse]['events'],
+             outputs=lambda results: [diagram_file] if results[parse]['events'] else []),
+        task('html',
+             lambda results: load_script('md-to-html.py').markdown_to_html(str(md_path), str(html_file),
+                                                                          title(results)),
+             deps=[parse],
+             files=lambda results: [md_path, SCRIPT_DIR / 'md-to-html.py', SCRIPT_DIR / 'timeline_diagram.py',
+                                    *results[parse]['images']],
+             params=title,
+             outputs=[html_file]),
+        task('docx',
+             lambda results: load_script('convert-to-docx.py').markdown_to_docx(
+                 md_path.read_text(encoding='utf-8'), docx_file),
+             deps=[parse],
+             files=[md_path, SCRIPT_DIR / 'convert-to-docx.py'],
+             outputs=[docx_file]),
+    ]
+
+    if drive_folder:
+        for kind, source in (('html', html_file), ('docx', docx_file)):
+            outputs = drive_file(f'.{kind}')
+            tasks.append(task(f'drive {kind}',
+                              lambda results, source=source, outputs=outputs: copy_to_drive(source, outputs(results)[0]),
+                              deps=[parse, f'{name}:{kind}'],
+                              files=[source],
+                              outputs=outputs))
+
+    if upload:
+        tasks.append(task('upload',
+                          lambda results: upload_document(html_file, title(results)),
+                          deps=[parse, f'{name}:html'],
+                          files=[html_file],
+                          params=title))
+    return tasks
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Render Markdown to HTML, DOCX and diagrams and publish to Drive, '
+                                                 'redoing only what changed')
+    parser.add_argument('documents', nargs='*', default=[DEFAULT_DOCUMENT],
+                        help=f'Markdown documents (default: {DEFAULT_DOCUMENT})')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR,
+                        help=f'Directory for the rendered HTML and DOCX (default: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--drive-folder', default=DRIVE_FOLDER,
+                        help=f'Google Drive folder to copy them to (default: $CLOUDFILES or ~/CloudFiles: {DRIVE_FOLDER})')
+    parser.add_argument('--no-drive', action='store_true', help='Do not copy to the Google Drive folder')
+    parser.add_argument('--upload', action='store_true',
+                        help='Also upload the HTML as a Google Doc (google-docs-workflow.py upload)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Tasks run at once (default: {DEFAULT_JOBS})')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would run without running it')
+    parser.add_argument('--force', action='store_true', help='Run every task even if its inputs are unchanged')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    documents = []
+    for document in args.documents:
+        md_path = Path(document)
+        if not md_path.exists():
+            print(f"❌ Error: Document not found: {document}")
+            sys.exit(1)
+        documents.append(md_path.resolve())
+
+    drive_folder = None
+    if not args.no_drive:
+        if Path(args.drive_folder).is_dir():
+            drive_folder = Path(args.drive_folder)
+        else:
+            print(f"⚠️  Warning: Google Drive folder not found: {args.drive_folder} (not copying; see --drive-folder)")
+
+    out_dir = Path(args.out_dir).resolve()
+    tasks = [t for md_path in documents for t in document_tasks(md_path, out_dir, drive_folder, args.upload)]
+
+    action = 'Checking' if args.dry_run else 'Publishing'
+    print(f"{action} {len(documents)} document(s) ({len(tasks)} tasks, {args.jobs} at a time)...\n")
+    ok = run_tasks(tasks, google_docs_store.open_store(), args.jobs, args.dry_run, args.force)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,38 @@
 # Repair MP4 video files with missing moov atom
 # This happens when ADB screenrecord is interrupted before finalization
 #
-# Usage: ./scripts/repair-video-moov-atom.sh <input_video> [output_video]
+# With a reference video (a healthy recording from the same device and settings)
+# the moov atom is rebuilt from the raw H.264 samples without re-encoding
+# (scripts/mp4_moov_repair.py). Otherwise, or if that fails, falls back to ffmpeg.
+#
+# Usage: ./scripts/repair-video-moov-atom.sh <input_video> [output_video] [reference_video]
 
 set -e
 
 INPUT_VIDEO="$1"
 OUTPUT_VIDEO="${2:-${INPUT_VIDEO%.*}_repaired.mp4}"
+REFERENCE_VIDEO="$3"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 if [ ! -f "$INPUT_VIDEO" ]; then
     echo "❌ Video file not found: $INPUT_VIDEO"
     exit 1
 fi
 
+if [ -n "$REFERENCE_VIDEO" ] && [ ! -f "$REFERENCE_VIDEO" ]; then
+    echo "❌ Reference video not found: $REFERENCE_VIDEO"
+    exit 1
+fi
+
+# Lossless path: rebuild the moov atom from the samples (no ffmpeg needed)
+if [ -n "$REFERENCE_VIDEO" ] && command -v python3 > /dev/null 2>&1; then
+    if python3 "$SCRIPT_DIR/mp4_moov_repair.py" "$INPUT_VIDEO" "$REFERENCE_VIDEO" "$OUTPUT_VIDEO"; then
+        exit 0
+    fi
+    echo "   Rebuilding from reference failed, falling back to ffmpeg..."
+    echo ""
+fi
+
 if ! command -v ffmpeg > /dev/null 2>&1; then
     echo "❌ ffmpeg not found. Install with: brew install ffmpeg"
     exit 1
@@ -0,0 +1,291 @@
+"""
+Run a graph of build tasks, redoing only those whose inputs changed.
+
+Each task has a key: a hash of its name, its parameters and the contents of
+its input files. Parameters and inputs may be computed from the results of
+the tasks it depends on, so a task reruns only if what it actually uses
+changed: a diagram drawn from a document's headings is not redrawn when only
+the document's text changes.
+
+A task is skipped when its key matches the last run and its output files are
+still as that run left them (checked by size and modification time first, by
+hash only if those moved). Otherwise, if an earlier run with the same key left
+its outputs in the cache (content-addressed files in CACHE_DIR), they are
+copied back instead of running the task: going back to a previous version of
+a document costs a copy. Tasks whose dependencies are done run in parallel.
+
+Runs are recorded in the metadata store (google_docs_store), namespaces
+`build` (last run of each task, by task name) and `build_cache` (outputs of
+each key). CACHE_DIR can be deleted at any time; tasks then just run again.
+
+Example:
+    tasks = [
+        Task('parse', parse, files=['doc.md']),
+        Task('html', render, deps=['parse'], files=['doc.md'],
+             params=lambda results: {'title': results['parse']['title']}, outputs=['doc.html']),
+    ]
+    ok = run_tasks(tasks, open_store(), jobs=4)
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import google_docs_store
+from file_sync import atomic_copy, content_hash, copy_if_changed, file_stat
+
+CACHE_DIR = Path.home() / '.cache' / 'google-docs-scripts' / 'build'
+DEFAULT_JOBS = 4
+
+
+class Task:
+    """
+    One step of a build.
+
+    Args:
+        name: Unique name, also the key of its record in the store
+        action: Function called with the results of the dependencies (a dict by
+            task name); writes the outputs and returns a JSON-serializable result
+        deps: Names of the tasks whose results it uses
+        files: Input files whose contents are part of the key
+        params: JSON-serializable values that are part of the key
+        outputs: Files the action writes
+        label: Name to print (default: name)
+        preview: The action is cheap and has no effect beyond its result (parsing,
+            say): dry runs run it too, so the tasks after it are reported exactly
+
+    files, params and outputs may also be functions of the dependencies' results.
+    A task without outputs (an upload, say) is never restored from the cache:
+    its effect is elsewhere, so it runs whenever its key differs from its last run.
+    """
+
+    def __init__(self, name, action, deps=(), files=(), params=None, outputs=(), label=None, preview=False):
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.files = files
+        self.params = params
+        self.outputs = outputs
+        self.label = label or name
+        self.preview = preview
+
+    def resolve(self, results):
+        """(key, output paths) for the given dependency results."""
+        def value(field):
+            return field(results) if callable(field) else field
+
+        files = [str(Path(f).resolve()) for f in value(self.files) or ()]
+        outputs = [str(Path(f).resolve()) for f in value(self.outputs) or ()]
+        key_data = {
+            'name': self.name,
+            'params': value(self.params),
+            'files': {f: content_hash(f) for f in files},
+            'outputs': outputs,
+        }
+        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+        return key, outputs
+
+
+def _outputs_intact(recorded):
+    """Whether every output is still as recorded: {path: [hash, stat]}."""
+    for path, (digest, stat) in recorded.items():
+        current = file_stat(path)
+        if current is None:
+            return False
+        if current != stat and content_hash(path) != digest:
+            return False
+    return True
+
+
+def _blob(digest):
+    return CACHE_DIR / digest[:2] / digest
+
+
+def _restore(cached):
+    """Copy cached outputs ({path: hash}) back into place; False if any is no longer cached."""
+    if not all(_blob(digest).exists() for digest in cached.values()):
+        return False
+    for path, digest in cached.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        copy_if_changed(_blob(digest), path)
+    return True
+
+
+def _save_outputs(outputs):
+    """Hash the outputs and add them to the cache. Returns {path: [hash, stat]}."""
+    recorded = {}
+    for path in outputs:
+        digest = content_hash(path)
+        if digest is None:
+            raise RuntimeError(f"did not write {path}")
+        blob = _blob(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            atomic_copy(path, blob)
+        recorded[path] = [digest, file_stat(path)]
+    return recorded
+
+
+def _check(store, task, key, outputs, force):
+    """
+    What a task needs: ('up to date' | 'restored', result) or ('run', None).
+
+    Restoring copies the cached outputs back, so it is only done when not dry-running
+    (see run_tasks).
+    """
+    if force:
+        return 'run', None
+    last = google_docs_store.get(store, 'build', task.name)
+    if last and last['key'] == key and _outputs_intact(last['outputs']):
+        return 'up to date', last['result']
+    if outputs:
+        cached = google_docs_store.get(store, 'build_cache', key)
+        if cached and all(_blob(digest).exists() for digest in cached['outputs'].values()):
+            return 'restored', cached['result']
+    return 'run', None
+
+
+def _record(store, task, key, result, recorded):
+    """Store a task's run as its last one and, if it has outputs, in the cache."""
+    with google_docs_store.transaction(store):
+        google_docs_store.put(store, 'build', task.name, {'key': key, 'result': result, 'outputs': recorded})
+        if recorded:
+            google_docs_store.put(store, 'build_cache', key, {
+                'task': task.name,
+                'result': result,
+                'outputs': {path: digest for path, (digest, _) in recorded.items()},
+            })
+
+
+def _run(task, results, outputs):
+    """Run one task (in a worker thread). Returns (result, recorded outputs, seconds)."""
+    start = time.perf_counter()
+    for path in outputs:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    result = task.action(results)
+    return result, _save_outputs(outputs), time.perf_counter() - start
+
+
+def run_tasks(tasks, store, jobs=DEFAULT_JOBS, dry_run=False, force=False):
+    """
+    Run (or with dry_run, only report) the tasks that are not up to date.
+
+    Store access stays in the calling thread; only the actions run in the
+    worker threads. A task whose dependency failed is skipped; tasks in a
+    dependency cycle fail.
+
+    Returns:
+        True if no task failed
+    """
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        unknown = [dep for dep in task.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"{task.name} depends on unknown task(s): {', '.join(unknown)}")
+
+    results = {}  # Finished tasks' results
+    state = {}  # name -> 'running' | 'done' | 'pending' (dry run) | 'failed'
+    counts = {'ran': 0, 'up to date': 0, 'restored': 0, 'failed': 0, 'skipped': 0}
+    running = {}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            progressed = False
+            for task in tasks:
+                if task.name in state:
+                    continue
+                dep_states = [state.get(dep) for dep in task.deps]
+                if any(s in ('failed', 'skipped') for s in dep_states):
+                    state[task.name] = 'skipped'
+                    counts['skipped'] += 1
+                    print(f"  ⚠️  {task.label}: skipped (a dependency failed)")
+                    progressed = True
+                elif dry_run and 'pending' in dep_states:
+                    state[task.name] = 'pending'
+                    print(f"  → {task.label}: would run")
+                    progressed = True
+                elif all(s == 'done' for s in dep_states):
+                    deps = {dep: results[dep] for dep in task.deps}
+                    try:
+                        key, outputs = task.resolve(deps)
+                    except Exception as e:
+                        state[task.name] = 'failed'
+                        counts['failed'] += 1
+                        print(f"  ❌ {task.label}: {e}")
+                        progressed = True
+                        continue
+                    status, result = _check(store, task, key, outputs, force)
+                    if status == 'restored' and not dry_run:
+                        cached = google_docs_store.get(store, 'build_cache', key)
+                        if not _restore(cached['outputs']):
+                            status = 'run'
+                        else:
+                            _record(store, task, key, result, {
+                                path: [digest, file_stat(path)] for path, digest in cached['outputs'].items()
+                            })
+                    if status == 'run':
+                        if dry_run and task.preview and not outputs:
+                            try:
+                                results[task.name] = task.action(deps)
+                            except Exception as e:
+                                state[task.name] = 'failed'
+                                counts['failed'] += 1
+                                print(f"  ❌ {task.label}: failed: {e}")
+                                progressed = True
+                                continue
+                            state[task.name] = 'done'
+                            counts['ran'] += 1  # Would run
+                            print(f"  → {task.label}: would run")
+                        elif dry_run:
+                            state[task.name] = 'pending'
+                            print(f"  → {task.label}: would run")
+                        else:
+                            state[task.name] = 'running'
+                            running[pool.submit(_run, task, deps, outputs)] = (task, key)
+                    else:
+                        state[task.name] = 'done'
+                        results[task.name] = result
+                        counts[status] += 1
+                        verb = 'would be restored from the cache' if dry_run and status == 'restored' else (
+                            'restored from the cache' if status == 'restored' else 'up to date')
+                        print(f"  ✓ {task.label}: {verb}")
+                    progressed = True
+
+            if progressed:
+                continue
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task, key = running.pop(future)
+                try:
+                    result, recorded, seconds = future.result()
+                except Exception as e:
+                    state[task.name] = 'failed'
+                    counts['failed'] += 1
+                    print(f"  ❌ {task.label}: failed: {e}")
+                    continue
+                _record(store, task, key, result, recorded)
+                state[task.name] = 'done'
+                results[task.name] = result
+                counts['ran'] += 1
+                print(f"  ✓ {task.label}: ran in {seconds:.2f}s")
+
+    # Tasks in a dependency cycle (or depending on one) can never be scheduled
+    for task in tasks:
+        if task.name not in state:
+            state[task.name] = 'failed'
+            counts['failed'] += 1
+            print(f"  ❌ {task.label}: never ran (dependency cycle)")
+
+    if dry_run:
+        pending = counts['ran'] + sum(1 for s in state.values() if s == 'pending')
+        print(f"\n{pending} of {len(tasks)} task(s) would run")
+    else:
+        summary = ', '.join(f"{n} {what}" for what, n in counts.items() if n)
+        print(f"\n{len(tasks)} task(s) in {time.perf_counter() - start:.2f}s: {summary}")
+    return counts['failed'] == 0
@@ -0,0 +1,79 @@
+"""Tests for the streaming action log reader (scripts/action_log.py)."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+import action_log  # noqa: E402
+
+
+def write_log(tmp_path, content, name='action_log.json'):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def entries(count, **fields):
+    return [{'timestampMs': 100 * i, 'action': f'tap {i}', **fields} for i in range(count)]
+
+
+def test_truncated_array_is_an_error(tmp_path):
+    content = json.dumps(entries(5))
+    path = write_log(tmp_path, content[:content.rindex('{') + 10])
+    with pytest.raises(json.JSONDecodeError):
+        list(action_log.iter_actions(path))
+
+
+def test_unterminated_array_is_an_error(tmp_path):
+    path = write_log(tmp_path, json.dumps(entries(3))[:-1])
+    with pytest.raises(json.JSONDecodeError):
+        list(action_log.iter_actions(path))
+
+
+def test_array_split_across_read_boundaries(tmp_path, monkeypatch):
+    expected = entries(50, details='x' * 37)
+    path = write_log(tmp_path, json.dumps(expected, indent=2))
+    monkeypatch.setattr(action_log, 'READ_CHUNK_SIZE', 7)  # Smaller than any entry
+
+    assert list(action_log.iter_raw_entries(path)) == expected
+    assert [a['action'] for a in action_log.iter_actions(path)] == [e['action'] for e in expected]
+
+
+def test_ndjson(tmp_path):
+    expected = entries(4)
+    metadata = {'deviceWidth': 1344, 'deviceHeight': 2992}
+    path = write_log(tmp_path, '\n'.join(json.dumps(e) for e in [metadata, *expected]) + '\n\n',
+                     name='action_log.ndjson')
+
+    actions = list(action_log.iter_actions(path))
+    assert [a['action'] for a in actions] == [e['action'] for e in expected]
+    assert [a['_index'] for a in actions] == [1, 2, 3, 4]
+    assert action_log.read_device_size(path) == (1344, 2992)
+
+
+def test_out_of_order_timestamps_within_the_window_are_sorted(tmp_path):
+    path = write_log(tmp_path, json.dumps([
+        {'timestampMs': 300, 'action': 'c'},
+        {'timestampMs': 100, 'action': 'a'},
+        {'timestampMs': 200, 'action': 'b'},
+        {'timestampMs': 400, 'action': 'd'},
+    ]))
+
+    actions = list(action_log.iter_actions(path, reorder_window=2))
+    assert [a['action'] for a in actions] == ['a', 'b', 'c', 'd']
+    assert [a['_index'] for a in actions] == [2, 3, 1, 4]  # Positions in the log are kept
+
+
+def test_reorder_window_bounds_the_buffer(tmp_path):
+    # An entry that arrives later than the window allows is yielded late rather than buffered forever
+    path = write_log(tmp_path, json.dumps([
+        {'timestampMs': 200, 'action': 'b'},
+        {'timestampMs': 300, 'action': 'c'},
+        {'timestampMs': 100, 'action': 'a'},
+    ]))
+
+    assert [a['action'] for a in action_log.iter_actions(path, reorder_window=1)] == ['b', 'a', 'c']
@@ -0,0 +1,99 @@
+#!/usr/bin/env bats
+
+# Import-time budget for the local commands of google-docs.py
+
+load 'test_helpers.bash'
+
+# Import time a local command may add to a bare interpreter, in microseconds
+# as reported by `python3 -X importtime` (the Google client stack alone is
+# several hundred milliseconds)
+IMPORT_BUDGET_US=100000
+
+GOOGLE_MODULES='\| +(googleapiclient|google\.auth|google\.oauth2|google_auth_oauthlib|httplib2|requests)(\.|$)'
+
+setup() {
+    setup_test_env
+    SCRIPT_DIR="$(get_script_dir)"
+    CLI="$SCRIPT_DIR/google-docs.py"
+    export HOME="$TEST_TMP_DIR"
+
+    # Measure warm starts: bytecode cached as after any first run
+    python3 -m compileall -q "$SCRIPT_DIR"/*.py >/dev/null 2>&1 || true
+
+    # An index that has been built once, so list answers offline
+    python3 - "$SCRIPT_DIR" <<'EOF'
+import sys
+sys.path.insert(0, sys.argv[1])
+import google_docs_index
+conn = google_docs_index.open_index()
+conn.execute("INSERT OR REPLACE INTO index_state (key, value) VALUES ('page_token', '1')")
+EOF
+}
+
+teardown() {
+    cleanup_test_env
+}
+
+# Total import time (sum of top-level cumulative times) of a python3 command line
+import_time_us() {
+    python3 -X importtime "$@" 2>&1 >/dev/null \
+        | awk -F'|' '/^import time:/ && $3 ~ /^ [^ ]/ && $2 !~ /cumulative/ { total += $2 } END { print total + 0 }'
+}
+
+assert_within_budget() {
+    local baseline elapsed
+    baseline=$(import_time_us -c pass)
+    elapsed=$(import_time_us "$CLI" "$@")
+    echo "google-docs.py $*: ${elapsed}us of imports (bare interpreter: ${baseline}us, budget: +${IMPORT_BUDGET_US}us)"
+    [ $((elapsed - baseline)) -le "$IMPORT_BUDGET_US" ]
+}
+
+@test "google-docs.py exists and is executable" {
+    [ -x "$CLI" ]
+}
+
+@test "help lists the commands" {
+    run python3 "$CLI" --help
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"status"* ]]
+    [[ "$output" == *"upload"* ]]
+}
+
+@test "unknown command fails" {
+    run python3 "$CLI" no-such-command
+    [ "$status" -eq 2 ]
+}
+
+@test "options of the script's top-level parser are accepted after the command" {
+    run python3 "$CLI" list --timings
+    [ "$status" -eq 0 ]
+    [[ "$output" != *"unrecognized arguments"* ]]
+}
+
+@test "status does not import the Google client libraries" {
+    run bash -c "python3 -X importtime '$CLI' status 2>&1 >/dev/null"
+    [ "$status" -eq 0 ]
+    local imports="$output"
+    run grep -Eq "$GOOGLE_MODULES" <<< "$imports"
+    [ "$status" -eq 1 ]
+}
+
+@test "list from the index does not import the Google client libraries" {
+    run bash -c "python3 -X importtime '$CLI' list 2>&1 >/dev/null"
+    [ "$status" -eq 0 ]
+    local imports="$output"
+    run grep -Eq "$GOOGLE_MODULES" <<< "$imports"
+    [ "$status" -eq 1 ]
+}
+
+@test "help stays within the import-time budget" {
+    assert_within_budget --help
+}
+
+@test "status stays within the import-time budget" {
+    assert_within_budget status
+}
+
+@test "list stays within the import-time budget" {
+    assert_within_budget list
+}
@@ -0,0 +1,80 @@
+"""Tests for the in-place Google Docs update (scripts/google_docs_update.py), run against fake_google_api.py."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+from fake_google_api import DOCUMENT_MIME_TYPE, ApiError, FakeGoogleAPI  # noqa: E402
+from google_docs_update import diff_requests, document_paragraphs, html_to_paragraphs  # noqa: E402
+
+
+def create_document(api, html):
+    return api.create_file({'name': 'Test', 'mimeType': DOCUMENT_MIME_TYPE}, html.encode('utf-8'))['id']
+
+
+def update(api, doc_id, html):
+    """Apply the update the way update_document() does; returns the requests sent."""
+    document = api.get_document(doc_id)
+    requests = diff_requests(document_paragraphs(document), html_to_paragraphs(html))
+    if requests:
+        api.batch_update(doc_id, {'requests': requests,
+                                  'writeControl': {'requiredRevisionId': document['revisionId']}})
+    return requests
+
+
+def paragraphs(api, doc_id):
+    return [p['key'] for p in document_paragraphs(api.get_document(doc_id))]
+
+
+def test_indices_after_emoji_count_utf16_code_units():
+    api = FakeGoogleAPI()
+    doc_id = create_document(api, '<p>🎉 Party</p><p>Old text</p>')
+
+    requests = update(api, doc_id, '<p>🎉 Party</p><h1>New heading</h1>')
+
+    # '🎉 Party\n' is 9 UTF-16 code units (the emoji is a surrogate pair), starting at index 1
+    styled = [r['updateParagraphStyle']['range'] for r in requests if 'updateParagraphStyle' in r]
+    assert styled == [{'startIndex': 10, 'endIndex': 22}]
+    assert paragraphs(api, doc_id) == [
+        ('NORMAL_TEXT', False, '🎉 Party'),
+        ('HEADING_1', False, 'New heading'),
+    ]
+
+
+def test_fake_rejects_ranges_splitting_a_surrogate_pair():
+    api = FakeGoogleAPI()
+    doc_id = create_document(api, '<p>🎉 Party</p>')
+    with pytest.raises(ApiError):
+        api.batch_update(doc_id, {'requests': [
+            {'deleteContentRange': {'range': {'startIndex': 2, 'endIndex': 4}}},
+        ]})
+
+
+def test_tables_are_left_alone_on_both_sides():
+    html = '<p>Before</p><table><tr><td>Cell</td></tr></table><p>After</p>'
+    assert html_to_paragraphs(html) == [('NORMAL_TEXT', False, 'Before'), ('NORMAL_TEXT', False, 'After')]
+
+    document = {'body': {'content': [
+        {'endIndex': 1, 'sectionBreak': {}},
+        {'startIndex': 1, 'endIndex': 8, 'paragraph': {'elements': [{'textRun': {'content': 'Before\n'}}]}},
+        {'startIndex': 8, 'endIndex': 20, 'table': {}},
+        {'startIndex': 20, 'endIndex': 26, 'paragraph': {'elements': [{'textRun': {'content': 'After\n'}}]}},
+    ]}}
+    assert diff_requests(document_paragraphs(document), html_to_paragraphs(html)) == []
+
+
+def test_unchanged_pre_block_sends_no_requests():
+    # As md-to-html.py emits code blocks: indentation must survive, and still match
+    html = ('<p>Code:</p>\n<pre><code class="language-python">\n'
+            'def main():\n    if True:\n        print("hi")\n</pre></code>\n')
+    api = FakeGoogleAPI()
+    doc_id = create_document(api, html)
+
+    assert update(api, doc_id, html) == []
+
+    requests = update(api, doc_id, html.replace('"hi"', '"bye"'))
+    assert [r['insertText']['text'] for r in requests if 'insertText' in r] == ['        print("bye")']
+    assert api.documents[doc_id]['paragraphs'][-1][2] == '        print("bye")'
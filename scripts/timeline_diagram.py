@@ -0,0 +1,247 @@
+"""
+Vertical progress-bar timeline diagrams derived from a document's sections.
+
+Each `## ` heading of a Markdown document becomes an event, placed along the bar
+by where the section starts in the document (the first section at the top, the
+last at the bottom). Diagrams are written as compact SVG or as PNG with the app
+colour scheme, and are only re-rendered when the event set changes: a hash of
+the events is stored in the output file itself and compared before drawing.
+
+md-to-html.py uses the same events for its section-to-position mapping, so the
+HTML and the diagram always agree.
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# Electric Sheep app color scheme (from Color.kt)
+PRIMARY = '#4A7C7E'  # Deep teal-blue
+ON_PRIMARY = '#FFFFFF'  # White text on primary
+
+DEFAULT_HEIGHT = 1200
+BAR_MARGIN = 80  # Space above and below the bar
+BAR_X = 40
+BAR_WIDTH = 8
+MARKER_SIZE = 14
+LABEL_GAP = 8
+LABEL_PADDING_X, LABEL_PADDING_Y = 6, 4
+FONT_SIZE = 14
+MAX_LABEL_CHARS = 28
+HASH_KEY = 'timeline-events'
+# Diagrams named before the <doc>-timeline.<format> convention (the documents link to them)
+LEGACY_DIAGRAMS = {'A_WEEK_WITH_AI_CODING.md': 'timeline-diagram.png'}
+
+FONT_CANDIDATES = (
+    '/System/Library/Fonts/Helvetica.ttc',
+    'Helvetica.ttc',
+    'Arial.ttf',
+    'DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    'C:\\Windows\\Fonts\\arial.ttf',
+)
+
+
+def section_id(heading):
+    """HTML id for a section heading (as used by md-to-html.py)."""
+    return heading.lower().replace(' ', '-').replace(':', '').replace('?', '')
+
+
+def diagram_path(markdown_path, fmt='png'):
+    """Default diagram file of a document: <doc>-timeline.<format> next to it."""
+    markdown_path = Path(markdown_path)
+    legacy = LEGACY_DIAGRAMS.get(markdown_path.name)
+    if legacy and legacy.endswith(f'.{fmt}'):
+        return markdown_path.with_name(legacy)
+    return markdown_path.with_name(f"{markdown_path.stem}-timeline.{fmt}")
+
+
+def derive_events(markdown):
+    """
+    Build timeline events from the `## ` headings of a Markdown document.
+
+    Positions are the sections' relative offsets in the text, rescaled so the
+    first heading is at 0.0 and the last at 1.0. Headings inside fenced code
+    blocks are ignored.
+
+    Returns:
+        List of {'label', 'sectionId', 'position'} dicts in document order
+    """
+    headings = []
+    offset = 0
+    in_code_block = False
+    for line in markdown.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_code_block = not in_code_block
+        elif not in_code_block and stripped.startswith('## '):
+            headings.append((offset, stripped[3:].strip()))
+        offset += len(line)
+
+    if not headings:
+        return []
+    first, last = headings[0][0], headings[-1][0]
+    span = last - first
+    events = []
+    for heading_offset, heading in headings:
+        label = re.sub(r'[*_`]', '', heading)
+        if len(label) > MAX_LABEL_CHARS:
+            label = label[:MAX_LABEL_CHARS - 1].rstrip() + '…'
+        events.append({
+            'label': label,
+            'sectionId': section_id(heading),
+            'position': round((heading_offset - first) / span, 4) if span else 0.0,
+        })
+    return events
+
+
+def events_hash(events, fmt, height=DEFAULT_HEIGHT):
+    """Stable hash of everything that affects the rendered diagram."""
+    payload = json.dumps({'events': events, 'format': fmt, 'height': height}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _layout(events, height):
+    bar_start, bar_end = BAR_MARGIN, height - BAR_MARGIN
+    return [(event, bar_start + event['position'] * (bar_end - bar_start)) for event in events]
+
+
+def render_svg(events, height=DEFAULT_HEIGHT, digest=''):
+    """Render the timeline as an SVG document string."""
+    # Without a font to measure with, approximate label width from the character count
+    label_width = max((len(e['label']) for e in events), default=0) * FONT_SIZE * 0.6
+    width = int(BAR_X + MARKER_SIZE + LABEL_GAP + label_width + 2 * LABEL_PADDING_X + 16)
+    label_x = BAR_X + MARKER_SIZE + LABEL_GAP
+
+    parts = [
+        f'<!-- {HASH_KEY}: {digest} -->',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif" font-size="{FONT_SIZE}">',
+        f'<rect x="{BAR_X - BAR_WIDTH // 2}" y="{BAR_MARGIN}" width="{BAR_WIDTH}" '
+        f'height="{height - 2 * BAR_MARGIN}" rx="{BAR_WIDTH // 2}" fill="{PRIMARY}"/>',
+    ]
+    for event, y in _layout(events, height):
+        box_width = len(event['label']) * FONT_SIZE * 0.6 + 2 * LABEL_PADDING_X
+        box_height = FONT_SIZE + 2 * LABEL_PADDING_Y
+        parts += [
+            f'<circle cx="{BAR_X + 1}" cy="{y + 1:.1f}" r="{MARKER_SIZE}" fill="#000" fill-opacity="0.12"/>',
+            f'<circle cx="{BAR_X}" cy="{y:.1f}" r="{MARKER_SIZE - 1.5}" fill="{ON_PRIMARY}" '
+            f'stroke="{PRIMARY}" stroke-width="3"/>',
+            f'<circle cx="{BAR_X}" cy="{y:.1f}" r="{MARKER_SIZE - 6}" fill="{PRIMARY}"/>',
+            f'<rect x="{label_x}" y="{y - box_height / 2:.1f}" width="{box_width:.0f}" height="{box_height}" '
+            f'rx="4" fill="#fff" fill-opacity="0.94" stroke="{PRIMARY}"/>',
+            f'<text x="{label_x + LABEL_PADDING_X}" y="{y:.1f}" dominant-baseline="central" '
+            f'fill="{PRIMARY}">{escape(event["label"])}</text>',
+        ]
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+
+@lru_cache(maxsize=8)
+def load_font(fontsize):
+    """Load a sans-serif font, falling back to Pillow's default font."""
+    from PIL import ImageFont
+
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, fontsize)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def render_png(events, output_path, height=DEFAULT_HEIGHT, digest=''):
+    """Render the timeline as a transparent PNG (requires Pillow)."""
+    from PIL import Image, ImageDraw
+    from PIL.PngImagePlugin import PngInfo
+
+    font = load_font(FONT_SIZE)
+    measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    label_x = BAR_X + MARKER_SIZE + LABEL_GAP
+    label_width = max((measure.textlength(e['label'], font=font) for e in events), default=0)
+    width = int(label_x + label_width + 2 * LABEL_PADDING_X + 16)
+
+    primary = _hex_to_rgb(PRIMARY) + (255,)
+    image = Image.new('RGBA', (width, height), color=(255, 255, 255, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle(
+        [BAR_X - BAR_WIDTH // 2, BAR_MARGIN, BAR_X + BAR_WIDTH // 2, height - BAR_MARGIN],
+        radius=BAR_WIDTH // 2, fill=primary
+    )
+
+    for event, y in _layout(events, height):
+        draw.ellipse([BAR_X - MARKER_SIZE + 1, y - MARKER_SIZE + 1, BAR_X + MARKER_SIZE + 1, y + MARKER_SIZE + 1],
+                     fill=(0, 0, 0, 30))
+        draw.ellipse([BAR_X - MARKER_SIZE, y - MARKER_SIZE, BAR_X + MARKER_SIZE, y + MARKER_SIZE],
+                     fill=_hex_to_rgb(ON_PRIMARY) + (255,), outline=primary, width=3)
+        inner = MARKER_SIZE - 6
+        draw.ellipse([BAR_X - inner, y - inner, BAR_X + inner, y + inner], fill=primary)
+
+        bbox = draw.textbbox((0, 0), event['label'], font=font)
+        text_width, text_height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        draw.rounded_rectangle(
+            [label_x, y - text_height // 2 - LABEL_PADDING_Y,
+             label_x + text_width + LABEL_PADDING_X * 2, y + text_height // 2 + LABEL_PADDING_Y],
+            radius=4, fill=(255, 255, 255, 240), outline=primary, width=1
+        )
+        draw.text((label_x + LABEL_PADDING_X, y - text_height // 2 - bbox[1]), event['label'], fill=primary, font=font)
+
+    info = PngInfo()
+    info.add_text(HASH_KEY, digest)
+    image.save(output_path, pnginfo=info, optimize=True)
+
+
+def stored_hash(output_path):
+    """Events hash recorded in a previously rendered diagram, or None."""
+    path = Path(output_path)
+    if not path.exists():
+        return None
+    if path.suffix.lower() == '.svg':
+        with open(path, encoding='utf-8') as f:
+            match = re.match(rf'<!-- {HASH_KEY}: (\w*) -->', f.readline())
+        return match.group(1) if match else None
+
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            return image.text.get(HASH_KEY)
+    except (OSError, AttributeError):
+        return None
+
+
+def generate_timeline_diagram(markdown_path, output_path, height=DEFAULT_HEIGHT, force=False):
+    """
+    Render the timeline diagram for a Markdown document.
+
+    The format follows the output extension (.svg or .png).
+
+    Returns:
+        True if the diagram was (re)rendered, False if it was already up to date,
+        None if the document has no sections
+    """
+    with open(markdown_path, encoding='utf-8') as f:
+        events = derive_events(f.read())
+    if not events:
+        return None
+
+    output_path = Path(output_path)
+    fmt = 'svg' if output_path.suffix.lower() == '.svg' else 'png'
+    digest = events_hash(events, fmt, height)
+    if not force and stored_hash(output_path) == digest:
+        return False
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'svg':
+        output_path.write_text(render_svg(events, height, digest), encoding='utf-8')
+    else:
+        render_png(events, output_path, height, digest)
+    return True
@@ -0,0 +1,143 @@
+"""
+Animated tap and swipe markers for annotated test videos.
+
+All marker imagery is precomputed once per video resolution and frame rate as
+numpy alpha masks:
+
+- a ripple animation (one mask per frame of the marker duration) for taps
+- a set of pre-weighted dot masks forming a fading trail for swipes
+
+Drawing a marker is then just slicing the right mask and blending it into the
+frame in place through a preallocated scratch buffer, so no arrays are
+allocated per action or per frame.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+import numpy as np
+
+MARKER_DURATION = 0.5
+MARKER_COLOR = (255, 235, 59)  # Material yellow, visible on light and dark UIs
+TRAIL_LENGTH = 0.35            # Fraction of the swipe path covered by the trail
+TRAIL_DOTS = 12
+SWIPE_DISTANCE = 0.3           # Default swipe length as a fraction of the device size
+
+_SWIPE_DIRECTION = re.compile(r'swip\w*\s+(up|down|left|right)', re.IGNORECASE)
+_DIRECTION_VECTORS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
+
+def _ring(size, radius, thickness):
+    """Anti-aliased ring alpha mask centred in a size x size square."""
+    half = size // 2
+    coords = np.arange(-half, half + 1, dtype=np.float32)
+    distance = np.sqrt(coords[None, :] ** 2 + coords[:, None] ** 2)
+    return np.clip(thickness / 2 + 0.5 - np.abs(distance - radius), 0.0, 1.0)
+
+
+def _disc(size, radius):
+    """Anti-aliased filled disc alpha mask centred in a size x size square."""
+    half = size // 2
+    coords = np.arange(-half, half + 1, dtype=np.float32)
+    distance = np.sqrt(coords[None, :] ** 2 + coords[:, None] ** 2)
+    return np.clip(radius + 0.5 - distance, 0.0, 1.0)
+
+
+class MarkerEngine:
+    """Precomputed marker masks for one video resolution and frame rate."""
+
+    def __init__(self, video_w, video_h, fps, duration=MARKER_DURATION, color=MARKER_COLOR):
+        self.video_w = video_w
+        self.video_h = video_h
+        self.fps = fps
+        self.duration = duration
+        self.color = np.array(color, dtype=np.float32)
+
+        # Size markers relative to the video so they look the same on any emulator profile
+        base = min(video_w, video_h)
+        self.ripple_radius = max(12, int(base * 0.05))
+        self.dot_radius = max(4, int(base * 0.015))
+        ring_thickness = max(2.0, base * 0.006)
+
+        # Ripple: expanding, fading ring around a shrinking centre dot
+        self.ripple_frames = max(1, int(math.ceil(duration * fps)))
+        size = 2 * self.ripple_radius + 1
+        ripple = np.empty((self.ripple_frames, size, size), dtype=np.float32)
+        for k in range(self.ripple_frames):
+            progress = k / max(1, self.ripple_frames - 1)
+            ring = _ring(size, self.dot_radius + progress * (self.ripple_radius - self.dot_radius - 1), ring_thickness)
+            dot = _disc(size, self.dot_radius * (1.0 - 0.5 * progress))
+            ripple[k] = np.maximum(ring * (1.0 - progress), dot * (1.0 - progress) * 0.9)
+        self.ripple = ripple
+
+        # Swipe trail: one dot mask per trail position, pre-weighted so older dots are fainter
+        dot_size = 2 * self.dot_radius + 1
+        dot = _disc(dot_size, self.dot_radius)
+        weights = np.linspace(0.15, 0.9, TRAIL_DOTS, dtype=np.float32)
+        self.trail = (weights[:, None, None] * dot[None, :, :]).astype(np.float32)
+
+        # Scratch buffer large enough for the biggest mask, reused by every stamp
+        self._scratch = np.empty((size, size, 3), dtype=np.float32)
+
+    def _frame_index(self, elapsed):
+        return min(self.ripple_frames - 1, max(0, int(elapsed * self.fps)))
+
+    def stamp(self, frame, mask, cx, cy):
+        """Blend the marker colour through mask, centred at (cx, cy), into frame in place."""
+        size = mask.shape[0]
+        half = size // 2
+        x, y = cx - half, cy - half
+        frame_h, frame_w = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + size, frame_w), min(y + size, frame_h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        region = frame[y0:y1, x0:x1]
+        alpha = mask[y0 - y:y1 - y, x0 - x:x1 - x, None]
+        buf = self._scratch[:y1 - y0, :x1 - x0]
+        np.subtract(self.color, region, out=buf)
+        np.multiply(buf, alpha, out=buf)
+        np.add(region, buf, out=region, casting='unsafe')
+
+    def draw_tap(self, frame, x, y, elapsed):
+        """Draw the ripple for a tap at video pixel (x, y), elapsed seconds after the tap."""
+        self.stamp(frame, self.ripple[self._frame_index(elapsed)], x, y)
+
+    def draw_swipe(self, frame, x0, y0, x1, y1, elapsed):
+        """Draw the swipe head and trail moving from (x0, y0) to (x1, y1)."""
+        progress = min(1.0, elapsed / self.duration)
+        head = 1.0 - (1.0 - progress) ** 2  # Ease out, like a finger lifting off
+        tail = max(0.0, head - TRAIL_LENGTH)
+        for i in range(TRAIL_DOTS):
+            p = tail + (head - tail) * i / (TRAIL_DOTS - 1)
+            self.stamp(frame, self.trail[i], int(x0 + (x1 - x0) * p), int(y0 + (y1 - y0) * p))
+        self.stamp(frame, self.ripple[0], int(x0 + (x1 - x0) * head), int(y0 + (y1 - y0) * head))
+
+
+@lru_cache(maxsize=4)
+def get_marker_engine(video_w, video_h, fps):
+    """Return the (cached) marker engine for a video resolution and frame rate."""
+    return MarkerEngine(video_w, video_h, fps)
+
+
+def swipe_end(action, x, y, device_w, device_h):
+    """
+    Work out where a swipe ends, in device coordinates.
+
+    Uses [x1, y1, x2, y2] coordinates when the log provides them, otherwise the
+    direction in the description ("Swiping up") with a default swipe length.
+
+    Returns:
+        (x2, y2), or None if the action is not a recognisable swipe
+    """
+    coords = action.get('coordinates') or []
+    if len(coords) >= 4:
+        return coords[2], coords[3]
+
+    match = _SWIPE_DIRECTION.search(action.get('description', ''))
+    if not match:
+        return None
+    dx, dy = _DIRECTION_VECTORS[match.group(1).lower()]
+    return x + dx * device_w * SWIPE_DISTANCE, y + dy * device_h * SWIPE_DISTANCE
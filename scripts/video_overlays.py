@@ -0,0 +1,230 @@
+"""
+Frame-level overlays for test automation video annotation.
+
+Instead of building one MoviePy clip per action and compositing them all,
+overlays are drawn directly onto each frame as it is produced. Only the actions
+whose overlay is visible at the current frame time are held in memory; the rest
+of the action log stays on disk and is consumed lazily as the video advances.
+"""
+
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from video_markers import get_marker_engine, swipe_end
+
+TEXT_DURATION = 2.0
+TEXT_FONTSIZE = 42
+TEXT_MARGIN = 60
+TEXT_SIDE_MARGIN = 40
+TEXT_PADDING = 16
+
+FONT_CANDIDATES = (
+    'Arial Bold.ttf',
+    'Arial-Bold.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Bold.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+    'DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+)
+
+
+@lru_cache(maxsize=8)
+def load_font(fontsize):
+    """Load a bold system font, falling back to Pillow's default font."""
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, fontsize)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _wrap_text(draw, text, font, max_width):
+    """Greedy word wrap so each line fits within max_width pixels."""
+    lines = []
+    current = ''
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if current and draw.textlength(candidate, font=font) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines or ['']
+
+
+@lru_cache(maxsize=64)
+def render_text_patch(text, max_width, fontsize=TEXT_FONTSIZE):
+    """
+    Render caption text as an RGB patch plus alpha mask.
+
+    Matches the previous TextClip styling: white bold text, centred, on a
+    90% opaque black background.
+
+    Returns:
+        (rgb, alpha) where rgb is uint8 HxWx3 and alpha is float32 HxW in [0, 1]
+    """
+    font = load_font(fontsize)
+    measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    lines = _wrap_text(measure, text, font, max_width - 2 * TEXT_PADDING)
+
+    line_height = int(fontsize * 1.25)
+    text_width = max(int(measure.textlength(line, font=font)) for line in lines)
+    width = min(max_width, text_width + 2 * TEXT_PADDING)
+    height = line_height * len(lines) + 2 * TEXT_PADDING
+
+    image = Image.new('RGBA', (width, height), (0, 0, 0, 230))
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        line_width = draw.textlength(line, font=font)
+        draw.text(
+            ((width - line_width) / 2, TEXT_PADDING + i * line_height),
+            line,
+            font=font,
+            fill=(255, 255, 255, 255)
+        )
+
+    pixels = np.asarray(image)
+    rgb = np.ascontiguousarray(pixels[..., :3])
+    alpha = pixels[..., 3].astype(np.float32) / 255.0
+    return rgb, alpha
+
+
+def blend(frame, x, y, color, alpha, scratch):
+    """
+    Alpha-blend an overlay into frame in place, clipped to the frame bounds.
+
+    Args:
+        frame: uint8 HxWx3 frame (modified in place)
+        x, y: Top-left position of the overlay in frame pixels
+        color: uint8 HxWx3 overlay pixels matching alpha
+        alpha: float32 HxW mask in [0, 1]
+        scratch: float32 buffer at least HxWx3, reused so blending allocates nothing
+    """
+    height, width = alpha.shape
+    frame_h, frame_w = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, frame_w), min(y + height, frame_h)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    mask = alpha[y0 - y:y1 - y, x0 - x:x1 - x, None]
+    color = color[y0 - y:y1 - y, x0 - x:x1 - x]
+    region = frame[y0:y1, x0:x1]
+    buf = scratch[:y1 - y0, :x1 - x0]
+    np.subtract(color, region, out=buf, dtype=np.float32)
+    np.multiply(buf, mask, out=buf)
+    np.add(region, buf, out=region, casting='unsafe')
+
+
+class OverlayScheduler:
+    """
+    Draws action overlays onto frames, materializing only the active ones.
+
+    Frames are expected in increasing time order (as MoviePy and ffmpeg pipelines
+    produce them). If time goes backwards the action stream is restarted.
+    """
+
+    def __init__(self, actions_factory, video_w, video_h, video_duration, fps,
+                 device_size=None, text_duration=TEXT_DURATION):
+        """
+        Args:
+            actions_factory: Callable returning a fresh time-ordered iterator of actions
+            video_w: Video width in pixels
+            video_h: Video height in pixels
+            video_duration: Video duration in seconds (actions beyond it are skipped)
+            fps: Video frame rate, used to pick marker animation frames
+            device_size: (width, height) the action coordinates refer to. Defaults to
+                the video size, since screenrecord captures at the device's resolution.
+            text_duration: How long each description is shown
+        """
+        self.actions_factory = actions_factory
+        self.video_w = video_w
+        self.video_h = video_h
+        self.video_duration = video_duration
+        self.text_duration = text_duration
+        self.device_w, self.device_h = device_size or (video_w, video_h)
+        self.scale_x = video_w / self.device_w if self.device_w > 0 else 1.0
+        self.scale_y = video_h / self.device_h if self.device_h > 0 else 1.0
+        self.markers = get_marker_engine(video_w, video_h, fps)
+        self._scratch = np.empty((0, video_w, 3), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Restart from the beginning of the action stream."""
+        self._actions = iter(self.actions_factory())
+        self._pending = next(self._actions, None)
+        self._texts = deque()    # (end_time, rgb, alpha, x, y), ordered by end time
+        self._markers = deque()  # (end_time, start, x, y, swipe_end), ordered by end time
+        self._last_t = None
+        self.shown = 0
+        self.skipped = 0
+
+    def _activate(self, action, start):
+        description = action.get('description', 'Unknown action')
+        rgb, alpha = render_text_patch(description, self.video_w - 2 * TEXT_SIDE_MARGIN)
+        x = (self.video_w - alpha.shape[1]) // 2
+        y = self.video_h - alpha.shape[0] - TEXT_MARGIN
+        self._texts.append((start + self.text_duration, rgb, alpha, x, y))
+        if alpha.shape[0] > self._scratch.shape[0] or alpha.shape[1] > self._scratch.shape[1]:
+            # Grown rarely (only for a taller caption than any seen so far), then reused
+            self._scratch = np.empty(
+                (max(alpha.shape[0], self._scratch.shape[0]), max(alpha.shape[1], self.video_w), 3),
+                dtype=np.float32
+            )
+
+        coords = action.get('coordinates')
+        if isinstance(coords, list) and len(coords) >= 2:
+            end = swipe_end(action, coords[0], coords[1], self.device_w, self.device_h)
+            if end is not None:
+                end = (int(end[0] * self.scale_x), int(end[1] * self.scale_y))
+            marker_x = int(coords[0] * self.scale_x)
+            marker_y = int(coords[1] * self.scale_y)
+            self._markers.append((start + self.markers.duration, start, marker_x, marker_y, end))
+        self.shown += 1
+
+    def _advance(self, t):
+        while self._pending is not None:
+            start = self._pending.get('timestampMs', 0) / 1000.0
+            if start > t:
+                break
+            if start < 0 or start > self.video_duration:
+                self.skipped += 1
+            else:
+                self._activate(self._pending, start)
+            self._pending = next(self._actions, None)
+
+        while self._texts and self._texts[0][0] <= t:
+            self._texts.popleft()
+        while self._markers and self._markers[0][0] <= t:
+            self._markers.popleft()
+
+    def apply(self, frame, t):
+        """Draw the overlays visible at time t (seconds) onto frame and return it."""
+        if self._last_t is not None and t < self._last_t:
+            self.reset()
+        self._last_t = t
+        self._advance(t)
+
+        if not self._texts and not self._markers:
+            return frame
+        if not frame.flags.writeable:
+            frame = frame.copy()
+
+        for _, rgb, alpha, x, y in self._texts:
+            blend(frame, x, y, rgb, alpha, self._scratch)
+        for _, start, marker_x, marker_y, end in self._markers:
+            if end is None:
+                self.markers.draw_tap(frame, marker_x, marker_y, t - start)
+            else:
+                self.markers.draw_swipe(frame, marker_x, marker_y, end[0], end[1], t - start)
+        return frame
+
+    def moviepy_filter(self, get_frame, t):
+        """Adapter for VideoClip.fl(): annotate the frame MoviePy produced for time t."""
+        return self.apply(get_frame(t), t)
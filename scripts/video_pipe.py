@@ -0,0 +1,195 @@
+"""
+Low-level ffmpeg pipe pipeline for annotating videos frame by frame.
+
+Frames flow through three threads that overlap decode, overlay and encode:
+
+    ffmpeg decode --readinto--> [ring of preallocated frame buffers] --memoryview--> ffmpeg encode
+                                          |
+                                   overlay in place
+
+The ring is allocated once up front. Buffers are passed between threads by
+index, filled with readinto() directly from the decoder's stdout, modified in
+place by the overlay step, and written to the encoder's stdin through a
+memoryview, so steady-state processing allocates no per-frame arrays.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+from fractions import Fraction
+
+import numpy as np
+
+RING_SIZE = 8
+MAX_FPS = 60.0
+
+
+def probe_video(path):
+    """
+    Read video stream metadata with ffprobe.
+
+    Returns:
+        Dict with 'width', 'height', 'fps', 'duration' and 'has_audio'
+    """
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_streams', '-show_format', str(path)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    info = json.loads(result.stdout)
+    video = next(s for s in info['streams'] if s.get('codec_type') == 'video')
+
+    # screenrecord produces variable frame rate video; avg_frame_rate is the useful figure
+    fps = 0.0
+    for key in ('avg_frame_rate', 'r_frame_rate'):
+        try:
+            fps = float(Fraction(video.get(key, '0/1')))
+        except (ValueError, ZeroDivisionError):
+            continue
+        if fps > 0:
+            break
+    fps = min(fps or 30.0, MAX_FPS)
+
+    duration = float(video.get('duration') or info.get('format', {}).get('duration') or 0.0)
+    return {
+        'width': int(video['width']),
+        'height': int(video['height']),
+        'fps': round(fps, 3),
+        'duration': duration,
+        'has_audio': any(s.get('codec_type') == 'audio' for s in info['streams']),
+    }
+
+
+class FramePipeline:
+    """Decode → overlay → encode over ffmpeg pipes using a ring of reusable frame buffers."""
+
+    def __init__(self, width, height, fps, ring_size=RING_SIZE):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_bytes = width * height * 3
+        self.frames = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(ring_size)]
+        self.views = [memoryview(frame.reshape(-1)) for frame in self.frames]
+        self.frames_processed = 0
+        self._errors = []
+        self._queues = ()
+
+    def decode_command(self, input_args):
+        """ffmpeg command producing constant-rate raw RGB frames on stdout."""
+        return [
+            'ffmpeg', '-loglevel', 'error', '-nostdin',
+            *input_args,
+            '-an', '-vf', f'fps={self.fps}',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'
+        ]
+
+    def encode_command(self, output_path, output_args, audio_input_args=None):
+        """ffmpeg command reading raw RGB frames from stdin (plus optional audio source)."""
+        command = [
+            'ffmpeg', '-loglevel', 'error', '-nostdin', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{self.width}x{self.height}', '-r', str(self.fps),
+            '-i', '-',
+        ]
+        if audio_input_args:
+            command += [*audio_input_args, '-map', '0:v', '-map', '1:a?', '-c:a', 'aac', '-shortest']
+        return command + [*output_args, str(output_path)]
+
+    def _guard(self, target, *args):
+        try:
+            target(*args)
+        except Exception as e:  # Surfaced by run() once all threads have stopped
+            self._errors.append(e)
+            # Unblock the other stages so the pipeline drains instead of deadlocking
+            for stage in self._queues:
+                stage.put(None)
+
+    def _decode(self, stream, free, filled):
+        while True:
+            index = free.get()
+            if index is None:
+                break
+            # BufferedReader.readinto keeps reading until the buffer is full or EOF
+            if stream.readinto(self.views[index]) < self.frame_bytes:
+                break
+            filled.put(index)
+        filled.put(None)
+
+    def _overlay(self, process_frame, time_offset, filled, encoded):
+        frame_number = 0
+        while True:
+            index = filled.get()
+            if index is None:
+                break
+            process_frame(self.frames[index], time_offset + frame_number / self.fps)
+            frame_number += 1
+            encoded.put(index)
+        self.frames_processed = frame_number
+        encoded.put(None)
+
+    def _encode(self, stream, encoded, free):
+        while True:
+            index = encoded.get()
+            if index is None:
+                break
+            stream.write(self.views[index])
+            free.put(index)
+        stream.close()
+
+    def run(self, input_args, output_path, process_frame, output_args,
+            time_offset=0.0, audio_input_args=None):
+        """
+        Run the pipeline to completion.
+
+        Args:
+            input_args: ffmpeg input arguments, e.g. ['-ss', '12.5', '-t', '4', '-i', 'in.mp4']
+            output_path: Encoded output file
+            process_frame: Callable(frame, t) that modifies the uint8 HxWx3 frame in place
+            output_args: ffmpeg output/codec arguments
+            time_offset: Time (seconds) of the first decoded frame, passed through to process_frame
+            audio_input_args: Optional ffmpeg input arguments for an audio source
+
+        Returns:
+            Number of frames processed
+        """
+        decoder = subprocess.Popen(self.decode_command(input_args), stdout=subprocess.PIPE)
+        encoder = subprocess.Popen(
+            self.encode_command(output_path, output_args, audio_input_args),
+            stdin=subprocess.PIPE
+        )
+
+        free, filled, encoded = queue.Queue(), queue.Queue(), queue.Queue()
+        self._queues = (free, filled, encoded)
+        for index in range(len(self.frames)):
+            free.put(index)
+
+        threads = [
+            threading.Thread(target=self._guard, args=(self._decode, decoder.stdout, free, filled)),
+            threading.Thread(target=self._guard, args=(self._overlay, process_frame, time_offset, filled, encoded)),
+            threading.Thread(target=self._guard, args=(self._encode, encoder.stdin, encoded, free)),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            threads[1].join()
+            threads[2].join()
+        finally:
+            decoder_status = decoder.poll()
+            free.put(None)  # Release the decoder if the encoder stopped early
+            decoder.kill()
+            threads[0].join()
+            decoder.stdout.close()
+            decoder.wait()
+            encoder.wait()
+
+        # A failed encoder surfaces as BrokenPipeError in the writer; report the root cause
+        if encoder.returncode != 0:
+            raise RuntimeError(f"ffmpeg encoder exited with code {encoder.returncode}")
+        if self._errors:
+            raise self._errors[0]
+        if decoder_status not in (None, 0) or (self.frames_processed == 0 and decoder.returncode != 0):
+            raise RuntimeError(f"ffmpeg decoder exited with code {decoder.returncode}")
+        return self.frames_processed
@@ -0,0 +1,95 @@
+"""
+Global timeline across screenrecord chunks.
+
+screenrecord stops after --time-limit (at most 300 seconds), so long test runs
+are recorded as several consecutive MP4 chunks while the action log keeps a
+single clock. TimelineIndex maps that clock onto the chunks and feeds them to
+ffmpeg through the concat demuxer, which joins them without re-encoding.
+"""
+
+import os
+import subprocess
+import tempfile
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import accumulate
+
+from video_pipe import probe_video
+
+
+class TimelineIndex:
+    """Maps log timestamps to (chunk, local offset) for an ordered list of video chunks."""
+
+    def __init__(self, chunks):
+        """
+        Args:
+            chunks: Video files in recording order. Chunks are assumed to follow
+                each other without gaps, which holds for back-to-back screenrecord runs.
+        """
+        self.chunks = [os.path.abspath(chunk) for chunk in chunks]
+        self.info = [probe_video(chunk) for chunk in self.chunks]
+
+        sizes = {(info['width'], info['height']) for info in self.info}
+        if len(sizes) > 1:
+            raise ValueError(f"chunks have different resolutions: {sorted(sizes)}")
+
+        self.durations = [info['duration'] for info in self.info]
+        self.starts = [0.0, *accumulate(self.durations)][:-1]
+        self.duration = sum(self.durations)
+
+    def locate(self, t):
+        """
+        Find the chunk containing global time t (seconds).
+
+        Returns:
+            (chunk_index, local_seconds); times past the end map into the last chunk
+        """
+        index = max(0, min(len(self.chunks) - 1, bisect_right(self.starts, t) - 1))
+        return index, t - self.starts[index]
+
+    def probe(self):
+        """probe_video()-style metadata for the joined video."""
+        first = self.info[0]
+        return {
+            'width': first['width'],
+            'height': first['height'],
+            'fps': first['fps'],
+            'duration': self.duration,
+            'has_audio': all(info['has_audio'] for info in self.info),
+        }
+
+    def write_concat_list(self, f):
+        """Write an ffmpeg concat demuxer list of the chunks to an open text file."""
+        for chunk, duration in zip(self.chunks, self.durations):
+            escaped = chunk.replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+            f.write(f"duration {duration:.6f}\n")
+
+    @contextmanager
+    def input_args(self, seek_args=()):
+        """
+        ffmpeg input arguments reading the chunks as one continuous video.
+
+        Args:
+            seek_args: Input options such as ['-ss', '120', '-t', '6'] placed before -i
+        """
+        if len(self.chunks) == 1:
+            yield [*seek_args, '-i', self.chunks[0]]
+            return
+
+        fd, list_path = tempfile.mkstemp(prefix='chunks-', suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                self.write_concat_list(f)
+            yield [*seek_args, '-f', 'concat', '-safe', '0', '-i', list_path]
+        finally:
+            os.unlink(list_path)
+
+    def concat(self, output_path):
+        """Join the chunks into one file with stream copy (no re-encoding)."""
+        with self.input_args() as input_args:
+            subprocess.run(
+                ['ffmpeg', '-loglevel', 'error', '-nostdin', '-y', *input_args,
+                 '-c', 'copy', '-movflags', '+faststart', str(output_path)],
+                check=True
+            )